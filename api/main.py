@@ -2,8 +2,7 @@ from datetime import datetime
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from infrastructure.database import init_db, get_connection, USE_POSTGRES
-from infrastructure.repositories import JobRepository, ApplicationRepository
+from infrastructure.database import connection, init_db, pool_stats
 from api.routes import jobs, applications, analytics, profiles
 
 app = FastAPI(title="ApplyFlow API", version="1.0.0")
@@ -30,14 +29,14 @@ def startup():
 def health():
     """Health check — used by ECS and dashboard status bar."""
     db_status = "connected"
+    total_jobs = total_applications = 0
     try:
-        conn = get_connection()
-        if USE_POSTGRES:
+        with connection() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT 1")
-            conn.close()
-        else:
-            conn.execute("SELECT 1")
+            cur.execute(
+                "SELECT (SELECT COUNT(*) FROM jobs), (SELECT COUNT(*) FROM applications)"
+            )
+            total_jobs, total_applications = cur.fetchone()
     except Exception as e:
         db_status = f"error: {e}"
 
@@ -45,6 +44,7 @@ def health():
         "status": "ok" if db_status == "connected" else "degraded",
         "db": db_status,
         "timestamp": datetime.utcnow().isoformat(),
-        "total_jobs": JobRepository().count(),
-        "total_applications": len(ApplicationRepository().get_all()),
-    }
\ No newline at end of file
+        "total_jobs": total_jobs,
+        "total_applications": total_applications,
+        "db_pool": pool_stats(),
+    }
@@ -1,21 +1,18 @@
-import json
-from collections import Counter
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from domain.application import ApplicationStatus
-from infrastructure.repositories import ApplicationRepository
+from infrastructure.repositories import ApplicationRepository, JobRepository
 
 router = APIRouter()
 
 
 @router.get("/conversion")
-def conversion_stats():
+def conversion_stats(user_id: str = Query(None)):
     """Interview and offer conversion rates."""
-    apps = ApplicationRepository().get_all()
-    total = len(apps)
+    counts = ApplicationRepository().status_counts(user_id=user_id)
+    total = sum(counts.values())
     if total == 0:
         return {"total": 0}
 
-    counts = Counter(a["status"] for a in apps)
     applied = counts.get(ApplicationStatus.APPLIED.value, 0)
     interviewed = sum(counts.get(s.value, 0) for s in [
         ApplicationStatus.PHONE_SCREEN,
@@ -31,23 +28,31 @@ def conversion_stats():
         "offers": offers,
         "interview_rate": round(interviewed / applied * 100, 1) if applied else 0,
         "offer_rate": round(offers / applied * 100, 1) if applied else 0,
-        "by_status": dict(counts),
+        "by_status": counts,
     }
 
 
 @router.get("/skills-gap")
-def skills_gap():
+def skills_gap(user_id: str = Query(None)):
     """Most frequently missing skills across all jobs."""
-    apps = ApplicationRepository().get_all()
-    all_missing = []
-    for a in apps:
-        missing = json.loads(a.get("missing_skills") or "[]")
-        all_missing.extend(missing)
-
-    counts = Counter(all_missing)
     return {
         "top_missing_skills": [
             {"skill": skill, "count": count}
-            for skill, count in counts.most_common(10)
+            for skill, count in ApplicationRepository().missing_skill_counts(10, user_id=user_id)
         ]
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/skills-demand")
+def skills_demand(
+    limit: int = Query(20, ge=1, le=200),
+    exclude: str = Query(None, description="Comma-separated skills to leave out"),
+):
+    """Most requested skills across stored jobs, from the job_skills table."""
+    excluded = [s.strip() for s in exclude.split(",") if s.strip()] if exclude else None
+    return {
+        "skills": [
+            {"skill": skill, "jobs": count}
+            for skill, count in JobRepository().skill_frequency(limit, exclude=excluded)
+        ]
+    }
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from domain.application import ApplicationStatus
+from domain.application import DEFAULT_USER_ID, ApplicationStatus
 from infrastructure.repositories import ApplicationRepository
 
 router = APIRouter()
@@ -12,16 +12,16 @@ class StatusUpdate(BaseModel):
 
 
 @router.get("")
-def list_applications():
-    return {"applications": ApplicationRepository().get_all()}
+def list_applications(user_id: str = Query(None)):
+    return {"applications": ApplicationRepository().get_all(user_id=user_id)}
 
 
 @router.patch("/{job_id}")
-def update_status(job_id: str, body: StatusUpdate):
+def update_status(job_id: str, body: StatusUpdate, user_id: str = Query(DEFAULT_USER_ID)):
     try:
         status = ApplicationStatus(body.status)
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid status: {body.status}")
 
-    ApplicationRepository().update_status(job_id, status)
+    ApplicationRepository().update_status(job_id, status, user_id=user_id)
     return {"job_id": job_id, "status": body.status, "updated": True}
\ No newline at end of file
@@ -1,8 +1,9 @@
-import subprocess
-import sys
-import requests as http_requests
-from fastapi import APIRouter, Query
-from infrastructure.repositories import ApplicationRepository
+import base64
+import json
+from fastapi import APIRouter, HTTPException, Query, Response
+from infrastructure.repositories import ApplicationRepository, DedupRepository
+from services.scheduler import RefreshScheduler
+from workers.ingest_runner import IngestBusy, get_run, start_ingest
 
 router = APIRouter()
 
@@ -10,6 +11,7 @@ router = APIRouter()
 @router.get("/check-company")
 def check_company(name: str = Query(...)):
     """Check if a company has a Greenhouse job board."""
+    import requests as http_requests
     try:
         url = f"https://boards-api.greenhouse.io/v1/boards/{name.lower()}/jobs"
         r = http_requests.get(url, timeout=5)
@@ -21,34 +23,102 @@ def check_company(name: str = Query(...)):
         return {"found": False, "company": name.lower(), "job_count": 0}
 
 
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["match_score"], row["job_id"], row["user_id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        # Cursors issued before per-user scoring carry only (score, job_id)
+        score, job_id, *rest = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(rest) > 1:
+            raise ValueError(cursor)
+        return (float(score), str(job_id), *(str(u) for u in rest))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/companies")
+def list_companies(user_id: str = Query(None)):
+    """Companies with at least one scored job — for filter dropdowns."""
+    return {"companies": ApplicationRepository().companies(user_id=user_id)}
+
+
 @router.get("")
 def list_jobs(
+    response: Response,
     company: str = Query(None),
     status: str = Query(None),
     min_score: float = Query(0.0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str = Query(None),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    skills: str = Query(None, description="Comma-separated; jobs must require all"),
+    user_id: str = Query(None, description="Only this profile's scores"),
+    duplicates: bool = Query(False, description="Include cross-source near-duplicates"),
+    q: str = Query(None, description="Comma-separated; title or company contains any"),
 ):
-    """List all jobs with scores, filterable."""
-    apps = ApplicationRepository().get_all()
+    """
+    List scored jobs, best match first, filtered in SQL.
+
+    Pages are keyed on (match_score, job_id, user_id): pass back
+    `next_cursor` as `cursor` to get the next page. `view=summary` leaves out the skill
+    lists; `skills=terraform,aws` keeps jobs requiring all of them;
+    `q=kubernetes,platform` keeps jobs whose title or company mentions
+    any of them. One
+    canonical job is listed per near-duplicate cluster unless
+    `duplicates=true`. The filtered total is also sent as X-Total-Count.
+    """
+    rows, total = ApplicationRepository().search(
+        company=company,
+        status=status,
+        min_score=min_score,
+        limit=limit,
+        after=_decode_cursor(cursor) if cursor else None,
+        summary=view == "summary",
+        skills=[s.strip() for s in skills.split(",") if s.strip()] if skills else None,
+        user_id=user_id,
+        include_duplicates=duplicates,
+        terms=[t.strip() for t in q.split(",") if t.strip()] if q else None,
+    )
+    response.headers["X-Total-Count"] = str(total)
+    next_cursor = _encode_cursor(rows[-1]) if len(rows) == limit else None
+    return {"jobs": rows, "total": total, "next_cursor": next_cursor}
 
-    if company:
-        apps = [a for a in apps if a["company"] == company]
-    if status:
-        apps = [a for a in apps if a["status"] == status]
-    apps = [a for a in apps if a["match_score"] >= min_score]
 
-    return {"jobs": apps, "total": len(apps)}
+@router.get("/{job_id}/duplicates")
+def job_duplicates(job_id: str):
+    """The near-duplicate cluster a job belongs to, canonical job first."""
+    members = DedupRepository().cluster_members(job_id)
+    if not members:
+        raise HTTPException(status_code=404, detail="Job not indexed")
+    return {"cluster_id": members[0]["cluster_id"], "jobs": members}
 
 
-@router.post("/ingest")
+@router.post("/ingest", status_code=202)
 def trigger_ingest():
-    """Manually trigger the ingestion pipeline."""
-    result = subprocess.run(
-        [sys.executable, "main.py"],
-        capture_output=True,
-        text=True,
-    )
-    return {
-        "success": result.returncode == 0,
-        "stdout": result.stdout[-2000:],  # last 2000 chars
-        "stderr": result.stderr[-500:] if result.stderr else "",
-    }
\ No newline at end of file
+    """
+    Start an ingestion cycle in the background and return its run ID;
+    poll GET /jobs/ingest/{id}. 409 while another cycle is running.
+    """
+    try:
+        run = start_ingest(trigger="api")
+    except IngestBusy as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "id": e.run_id})
+    return {"id": run.id, "state": "running"}
+
+
+@router.get("/ingest/{run_id}")
+def ingest_status(run_id: str):
+    """State, per-stage progress, per-company checkpoints and (once finished) the summary of a run."""
+    run = get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Ingestion run not found")
+    return run
+
+
+@router.get("/schedule")
+def refresh_schedule(source: str = Query(None, description="e.g. greenhouse, lever")):
+    """When each tracked company (or feed) is next polled, soonest first."""
+    return {"schedule": RefreshScheduler().schedule(source)}
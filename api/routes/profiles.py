@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from domain.profile import SearchProfile, ExperienceLevel, LocationPref
 from infrastructure.repositories import ProfileRepository
+from workers.rescore_worker import latest_progress, start_rescore
 
 router = APIRouter()
 
@@ -36,36 +37,30 @@ def create_profile(body: ProfileCreate):
             skills=body.skills,
             experience_years=body.experience_years,
             certifications=body.certifications,
+            companies=body.companies,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    ProfileRepository().save(profile)
-    return {"user_id": body.user_id, "created": True}
-
+    repo = ProfileRepository()
+    previous = repo.get(body.user_id)
+    repo.save(profile)
+    # Existing scores are refreshed in the background for what changed
+    rescore = start_rescore(profile, previous) if profile.active else None
+    return {
+        "user_id": body.user_id,
+        "created": True,
+        "rescore_id": rescore.id if rescore else None,
+    }
 
-@router.post("")
-def create_profile(body: ProfileCreate):
-    try:
-        profile = SearchProfile(
-            user_id=body.user_id,
-            name=body.name,
-            role_keywords=body.role_keywords,
-            required_stack=body.required_stack,
-            preferred_stack=body.preferred_stack,
-            experience_level=ExperienceLevel(body.experience_level),
-            location_pref=LocationPref(body.location_pref),
-            min_match_score=body.min_match_score,
-            skills=body.skills,
-            experience_years=body.experience_years,
-            certifications=body.certifications,
-            companies=body.companies,
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
 
-    ProfileRepository().save(profile)
-    return {"user_id": body.user_id, "created": True}
+@router.get("/{user_id}/rescore")
+def get_rescore_progress(user_id: str):
+    """Progress of the latest background rescore for this profile."""
+    progress = latest_progress(user_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="No rescore for this profile")
+    return progress.to_dict()
 
 
 @router.get("/{user_id}")
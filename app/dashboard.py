@@ -78,12 +78,20 @@ page = st.sidebar.radio(
 st.sidebar.divider()
 
 if st.sidebar.button("▶ Run Pipeline Now", use_container_width=True):
-    with st.spinner("Fetching and scoring jobs..."):
-        result = api_post("/jobs/ingest")
-    if result and result.get("success"):
-        st.sidebar.success("Pipeline complete!")
-    else:
-        st.sidebar.error("Pipeline failed")
+    result = api_post("/jobs/ingest")
+    if result:
+        st.session_state.ingest_id = result["id"]
+
+if st.session_state.get("ingest_id"):
+    run = api_get(f"/jobs/ingest/{st.session_state.ingest_id}")
+    if run and run["state"] == "running":
+        persist = (run.get("progress") or {}).get("persist", {})
+        st.sidebar.info(f"Pipeline running — {persist.get('saved', 0)} new jobs so far")
+        st.sidebar.button("↻ Refresh status", use_container_width=True)
+    elif run and run["state"] == "done":
+        st.sidebar.success(f"Pipeline complete! {run['summary']['saved']} new jobs")
+    elif run:
+        st.sidebar.error(f"Pipeline {run['state']}: {run.get('error') or ''}")
 
 health = api_get("/health")
 if health:
@@ -257,12 +265,10 @@ elif page == "🔍 Job Feed":
     st.title("👾 ApplyFlow")
 
     # Metrics
-    analytics = api_get("/analytics/conversion") or {}
-    jobs_data = api_get("/jobs") or {"jobs": []}
-    all_jobs = jobs_data.get("jobs", [])
+    analytics = api_get("/analytics/conversion", params={"user_id": USER_ID}) or {}
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Total Jobs", analytics.get("total", len(all_jobs)))
+    c1.metric("Total Jobs", analytics.get("total", 0))
     c2.metric("Applied", analytics.get("applied", 0))
     c3.metric("Interviews", analytics.get("interviewed", 0))
     c4.metric("Offers", analytics.get("offers", 0))
@@ -270,7 +276,7 @@ elif page == "🔍 Job Feed":
     st.divider()
 
     # Skills gap
-    skills_data = api_get("/analytics/skills-gap") or {}
+    skills_data = api_get("/analytics/skills-gap", params={"user_id": USER_ID}) or {}
     top_missing = skills_data.get("top_missing_skills", [])
     if top_missing:
         with st.expander("📊 Top missing skills across all jobs"):
@@ -282,37 +288,49 @@ elif page == "🔍 Job Feed":
 
     # Filters
     st.sidebar.subheader("Filters")
-    companies = ["All"] + sorted({a["company"] for a in all_jobs})
+    companies = ["All"] + (api_get("/jobs/companies", params={"user_id": USER_ID}) or {}).get("companies", [])
     selected_company = st.sidebar.selectbox("Company", companies)
     statuses = ["All", "new", "applied", "phone_screen", "technical",
                 "final_round", "rejected", "offer"]
     selected_status = st.sidebar.selectbox("Status", statuses)
     min_score = st.sidebar.slider("Min match score", 0, 100, 0)
-
-    # Apply filters
-    filtered = all_jobs
-    if selected_company != "All":
-        filtered = [a for a in filtered if a["company"] == selected_company]
-    if selected_status != "All":
-        filtered = [a for a in filtered if a["status"] == selected_status]
-    filtered = [a for a in filtered if a["match_score"] >= min_score]
+    page_size = st.sidebar.selectbox("Jobs per page", [50, 100, 250, 500], index=1)
 
     # Keyword search
     search = st.text_input(
         "🔍 Search jobs",
         placeholder="e.g. kubernetes, platform, senior..."
     )
-    if search:
-        terms = [t.strip().lower() for t in search.split(",")]
-        filtered = [
-            a for a in filtered
-            if any(
-                t in a["title"].lower() or t in a["company"].lower()
-                for t in terms
-            )
-        ]
 
-    st.subheader(f"Jobs ({len(filtered)} shown)")
+    # Filters run server-side; the cursor stack lets us page back and forth
+    filters = {
+        "q": search.strip() or None,
+        "company": None if selected_company == "All" else selected_company,
+        "status": None if selected_status == "All" else selected_status,
+        "min_score": min_score,
+        "limit": page_size,
+        "user_id": USER_ID,
+    }
+    if st.session_state.get("job_filters") != filters:
+        st.session_state.job_filters = filters
+        st.session_state.job_cursors = [None]
+    cursors = st.session_state.job_cursors
+    params = {k: v for k, v in filters.items() if v is not None}
+    if cursors[-1]:
+        params["cursor"] = cursors[-1]
+    jobs_data = api_get("/jobs", params=params) or {"jobs": [], "total": 0}
+    filtered = jobs_data.get("jobs", [])
+    total_matching = jobs_data.get("total", len(filtered))
+
+    prev_col, next_col = st.sidebar.columns(2)
+    if prev_col.button("◀ Prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if next_col.button("Next ▶", disabled=not jobs_data.get("next_cursor")):
+        cursors.append(jobs_data["next_cursor"])
+        st.rerun()
+
+    st.subheader(f"Jobs ({len(filtered)} shown of {total_matching})")
 
     if not filtered:
         st.info("No jobs match your filters.")
@@ -348,7 +366,7 @@ elif page == "🔍 Job Feed":
                     )
                     if new_status != a["status"]:
                         api_patch(
-                            f"/applications/{a['job_id']}",
+                            f"/applications/{a['job_id']}?user_id={USER_ID}",
                             {"status": new_status}
                         )
                         st.rerun()
\ No newline at end of file
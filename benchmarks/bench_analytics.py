@@ -0,0 +1,82 @@
+"""
+/analytics: Python-side aggregation over get_all() vs SQL aggregates.
+
+    python -m benchmarks.bench_analytics [--sizes 10000,100000,1000000]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from infrastructure import database
+from infrastructure.database import connection
+from infrastructure.repositories import ApplicationRepository
+from services.parser import KNOWN_SKILLS
+
+STATUSES = ["new", "applied", "phone_screen", "technical", "rejected", "offer"]
+
+
+def seed(n: int) -> None:
+    rng = random.Random(3)
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, title, company) VALUES (?, ?, ?)",
+            ((f"job-{i}", f"SRE {i}", f"company-{i % 500}") for i in range(n)),
+        )
+        conn.executemany(
+            "INSERT INTO applications (job_id, status, match_score, missing_skills) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (f"job-{i}", rng.choice(STATUSES), rng.uniform(0, 100),
+                 json.dumps(rng.sample(KNOWN_SKILLS, rng.randint(0, 6))))
+                for i in range(n)
+            ),
+        )
+
+
+def old_path():
+    apps = ApplicationRepository().get_all()
+    statuses = Counter(a["status"] for a in apps)
+    missing = Counter()
+    for a in apps:
+        missing.update(json.loads(a.get("missing_skills") or "[]"))
+    return statuses, missing.most_common(10)
+
+
+def new_path():
+    repo = ApplicationRepository()
+    return repo.status_counts(), repo.missing_skill_counts(10)
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    args = ap.parse_args()
+
+    print(f"  {'rows':>9s} {'old ms':>10s} {'old MB':>8s} {'new ms':>10s} {'new MB':>8s}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            database.SQLITE_PATH = Path(tmp) / "bench.db"
+            database.init_db()
+            seed(n)
+            old_ms, old_mb = measure(old_path)
+            new_ms, new_mb = measure(new_path)
+        print(f"  {n:9d} {old_ms:10.1f} {old_mb:8.1f} {new_ms:10.1f} {new_mb:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
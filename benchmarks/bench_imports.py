@@ -0,0 +1,108 @@
+"""
+Startup cost of the API and worker entry points, from `python -X importtime`.
+
+    python -m benchmarks.bench_imports [--runs 3] [--top 15] [--check] [module ...]
+
+Each import runs in a fresh interpreter; the best of --runs is reported
+along with the most expensive modules it pulled in. --check exits non-zero
+when an entry point exceeds BUDGETS_MS (scaled by IMPORT_BUDGET_SCALE on
+slow machines) or loads one of LAZY_PACKAGES; tests/unit/test_import_budget.py
+checks only the latter, which does not depend on the machine.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed per entry point
+BUDGETS_MS = {
+    "api.main": 1500,
+    "workers.ingestion_worker": 400,
+}
+
+# Slow runners can loosen the time budget for --check, e.g. IMPORT_BUDGET_SCALE=2
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+# Heavy packages that must only load when a code path needs them
+LAZY_PACKAGES = (
+    "boto3", "botocore", "psycopg2", "pypdf", "sentence_transformers", "torch",
+    "numpy", "requests", "urllib3", "httpx", "multiprocessing",
+)
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_ms: float                      # cumulative time of `import module`
+    modules: dict[str, tuple[int, int]]  # name → (self µs, cumulative µs)
+
+    @property
+    def packages(self) -> set[str]:
+        return {name.split(".")[0] for name in self.modules}
+
+    def heaviest(self, n: int) -> list[tuple[str, int]]:
+        return sorted(
+            ((name, self_us) for name, (self_us, _) in self.modules.items()),
+            key=lambda item: item[1], reverse=True,
+        )[:n]
+
+
+def _parse(module: str, stderr: str) -> ImportProfile:
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return ImportProfile(module, modules[module][1] / 1000, modules)
+
+
+def measure(module: str, runs: int = 1) -> ImportProfile:
+    """Import `module` in `runs` fresh interpreters; return the fastest."""
+    profiles = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        profiles.append(_parse(module, proc.stderr))
+    return min(profiles, key=lambda p: p.total_ms)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("modules", nargs="*", default=list(BUDGETS_MS))
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--check", action="store_true", help="exit 1 if over budget")
+    args = ap.parse_args()
+
+    over = []
+    for module in args.modules:
+        profile = measure(module, runs=args.runs)
+        budget = BUDGETS_MS.get(module)
+        eager = sorted(profile.packages & set(LAZY_PACKAGES))
+        print(
+            f"{module}: {profile.total_ms:.0f} ms"
+            + (f" (budget {budget} ms)" if budget else "")
+            + f", {len(profile.modules)} modules"
+        )
+        if eager:
+            print(f"  eagerly imported: {', '.join(eager)}")
+        for name, self_us in profile.heaviest(args.top):
+            print(f"  {self_us / 1000:8.1f} ms  {name}")
+        if eager or (budget and profile.total_ms > budget * BUDGET_SCALE):
+            over.append(module)
+
+    if args.check and over:
+        sys.exit(f"over import budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
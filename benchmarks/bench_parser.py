@@ -0,0 +1,69 @@
+"""
+Per-job vs batch JD parsing throughput.
+
+    python -m benchmarks.bench_parser [--jobs 10000] [--workers 4]
+"""
+import argparse
+import os
+import random
+import time
+
+from services.parser import KNOWN_SKILLS, extract_batch, extract_skills, extract_years
+
+FILLER = (
+    "we are looking for an engineer to build and operate reliable systems "
+    "across our platform you will own services end to end partner with product "
+    "teams improve developer experience and participate in design reviews"
+).split()
+
+
+def synthetic_corpus(n: int, words: int = 400, seed: int = 42) -> list[str]:
+    """Build n job descriptions with a sprinkling of skills and a YOE line."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        body = [
+            rng.choice(KNOWN_SKILLS) if rng.random() < 0.04 else rng.choice(FILLER)
+            for _ in range(words)
+        ]
+        body.append(f"{rng.randint(1, 8)}+ years of experience")
+        corpus.append(" ".join(body))
+    return corpus
+
+
+def _time(label: str, fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:22s} {elapsed:7.2f}s  {n / elapsed:9.0f} jobs/s")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=10_000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    corpus = synthetic_corpus(args.jobs)
+    print(f"Parsing {args.jobs} synthetic job descriptions")
+
+    def per_job():
+        for text in corpus:
+            extract_skills(text)
+            extract_years(text)
+
+    base = _time("per-job", per_job, args.jobs)
+    batch = _time("batch", lambda: extract_batch(corpus), args.jobs)
+    print(f"  batch speedup          {base / batch:7.2f}x")
+    if args.workers > 1:
+        pooled = _time(
+            f"batch ({args.workers} procs)",
+            lambda: extract_batch(corpus, workers=args.workers),
+            args.jobs,
+        )
+        print(f"  pooled speedup         {base / pooled:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
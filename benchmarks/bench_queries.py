@@ -0,0 +1,95 @@
+"""
+Hot-query latency before and after the index migration, on SQLite.
+
+    python -m benchmarks.bench_queries [--jobs 100000]
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from infrastructure import database
+from infrastructure.database import connection
+
+STATUSES = ["new", "applied", "phone_screen", "technical", "rejected", "offer"]
+
+QUERIES = {
+    "application by job_id": (
+        "SELECT id FROM applications WHERE job_id = ?", lambda rng, n: (f"job-{rng.randrange(n)}",)
+    ),
+    "top 50 by match_score": (
+        "SELECT a.*, j.title FROM applications a JOIN jobs j ON a.job_id = j.id "
+        "ORDER BY a.match_score DESC LIMIT 50", lambda rng, n: (),
+    ),
+    "count by status": (
+        "SELECT COUNT(*) FROM applications WHERE status = ?", lambda rng, n: (rng.choice(STATUSES),)
+    ),
+    "jobs for company": (
+        "SELECT id FROM jobs WHERE company = ?", lambda rng, n: (f"company-{rng.randrange(500)}",)
+    ),
+    "latest 50 jobs": (
+        "SELECT id FROM jobs ORDER BY created_at DESC LIMIT 50", lambda rng, n: ()
+    ),
+}
+
+
+def seed(n: int) -> None:
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1)
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, title, company, created_at) VALUES (?, ?, ?, ?)",
+            (
+                (f"job-{i}", f"SRE {i}", f"company-{rng.randrange(500)}",
+                 (start + timedelta(minutes=rng.randrange(500_000))).isoformat())
+                for i in range(n)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO applications (job_id, status, match_score) VALUES (?, ?, ?)",
+            ((f"job-{i}", rng.choice(STATUSES), rng.uniform(0, 100)) for i in range(n)),
+        )
+
+
+def run_queries(n: int, repeat: int) -> dict[str, float]:
+    rng = random.Random(1)
+    timings = {}
+    with connection() as conn:
+        for label, (sql, params) in QUERIES.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(sql, params(rng, n)).fetchall()
+            timings[label] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.SQLITE_PATH = Path(tmp) / "bench.db"
+        migrations, database.MIGRATIONS = database.MIGRATIONS, []
+        database.init_db()
+        seed(args.jobs)
+        before = run_queries(args.jobs, args.repeat)
+
+        database.MIGRATIONS = migrations
+        database.migrate()
+        after = run_queries(args.jobs, args.repeat)
+
+    print(f"{args.jobs} jobs / applications, mean of {args.repeat} runs")
+    print(f"  {'query':24s} {'no index':>10s} {'indexed':>10s} {'speedup':>9s}")
+    for label in QUERIES:
+        print(
+            f"  {label:24s} {before[label]:8.2f}ms {after[label]:8.2f}ms "
+            f"{before[label] / max(after[label], 1e-6):8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
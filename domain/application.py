@@ -2,6 +2,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+# Owner of applications scored without a stored SearchProfile
+DEFAULT_USER_ID = "default"
+
 
 class ApplicationStatus(Enum):
     NEW = "new"
@@ -20,4 +23,5 @@ class Application:
     match_score: float = 0.0
     notes: str = ""
     applied_at: datetime | None = None
-    updated_at: datetime = field(default_factory=datetime.utcnow)
\ No newline at end of file
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    user_id: str = DEFAULT_USER_ID   # SearchProfile.user_id the score belongs to
\ No newline at end of file
@@ -14,4 +14,5 @@ class Job:
     source: str                      # "greenhouse", "lever", "rss"
     source_url: str
     remote: bool = False
-    created_at: datetime = field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    source_updated_at: str | None = None  # board's own last-updated stamp, if any
\ No newline at end of file
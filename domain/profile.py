@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum
 
+from domain.resume import ResumeProfile
+
 
 class ExperienceLevel(Enum):
     INTERN = "intern"       # 0 YOE
@@ -31,4 +33,14 @@ class SearchProfile:
     skills: list[str] = field(default_factory=list)
     experience_years: int = 0
     certifications: list[str] = field(default_factory=list)
-    companies: list[str] = field(default_factory=list)  # companies to track
\ No newline at end of file
+    companies: list[str] = field(default_factory=list)  # companies to track
+
+    def to_resume(self) -> ResumeProfile:
+        """The resume this profile's jobs are scored against."""
+        return ResumeProfile(
+            name=self.name,
+            skills=self.skills,
+            experience_years=self.experience_years,
+            domains=["SRE", "DevOps", "Cloud"],
+            certifications=self.certifications,
+        )
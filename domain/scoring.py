@@ -1,7 +1,13 @@
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from domain.job import Job
 from domain.resume import ResumeProfile
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 @dataclass
 class ScoreResult:
@@ -11,12 +17,119 @@ class ScoreResult:
     matched_skills: list[str]        # skills in both job and resume
     experience_gap: int              # years short of requirement (0 = met)
     hard_mismatch: bool              # true if YOE gap > 3 years
+    semantic_score: float | None = None  # 0.0 – 100.0 embedding similarity, if used
+
+
+class SkillVocabulary:
+    """Dense integer IDs for lowercased skill names, shared across batches."""
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+        for s in skills:
+            self.id(s)
+
+    def id(self, skill: str) -> int:
+        key = skill.lower()
+        found = self.ids.get(key)
+        if found is None:
+            found = self.ids[key] = len(self.names)
+            self.names.append(key)
+        return found
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+# Set bits per byte value, for popcounts over packed bitsets
+_POPCOUNT = None
+
+
+def _popcount_table():
+    global _POPCOUNT
+    if _POPCOUNT is None:
+        import numpy as np
+        _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return _POPCOUNT
+
+
+def _pack(rows, cols, n_rows: int, n_bytes: int):
+    """Build an (n_rows, n_bytes) big-endian bitset with bit (row, col) set."""
+    import numpy as np
+    bits = np.zeros((n_rows, n_bytes), dtype=np.uint8)
+    np.bitwise_or.at(bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+    return bits
+
+
+@dataclass
+class JobMatrix:
+    """Jobs encoded once against a vocabulary, reusable across resumes."""
+    job_ids: list[str]
+    skill_bits: "np.ndarray"         # (n_jobs, n_bytes) uint8 packed bitset
+    skill_counts: "np.ndarray"       # distinct required skills per job
+    required_years: "np.ndarray"
+    vocab: SkillVocabulary
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+
+@dataclass
+class ScoreBatch:
+    """
+    Columnar scores for one resume against many jobs. Row i belongs to
+    job_ids[i]; ScoreResult objects are only built by result()/results().
+    """
+    job_ids: list[str]
+    final_score: "np.ndarray"        # 0.0 – 100.0, rounded to 0.1
+    keyword_coverage: "np.ndarray"   # 0.0 – 100.0, rounded to 0.1
+    experience_gap: "np.ndarray"
+    hard_mismatch: "np.ndarray"
+    matched_bits: "np.ndarray"       # packed bitset of matched skill IDs
+    missing_bits: "np.ndarray"       # packed bitset of missing skill IDs
+    vocab: SkillVocabulary
+    _raw_final: "np.ndarray"
+    _raw_coverage: "np.ndarray"
+    semantic_score: "np.ndarray | None" = None  # 0.0 – 100.0, rounded to 0.1
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def _names(self, packed) -> list[str]:
+        import numpy as np
+        ids = np.flatnonzero(np.unpackbits(packed))
+        return sorted(self.vocab.names[i] for i in ids)
+
+    def result(self, i: int) -> ScoreResult:
+        return ScoreResult(
+            final_score=round(float(self._raw_final[i]), 1),
+            keyword_coverage=round(float(self._raw_coverage[i]) * 100, 1),
+            missing_skills=self._names(self.missing_bits[i]),
+            matched_skills=self._names(self.matched_bits[i]),
+            experience_gap=int(self.experience_gap[i]),
+            hard_mismatch=bool(self.hard_mismatch[i]),
+            semantic_score=(
+                None if self.semantic_score is None else float(self.semantic_score[i])
+            ),
+        )
+
+    def results(self) -> Iterator[ScoreResult]:
+        for i in range(len(self)):
+            yield self.result(i)
 
 
 class ScoringEngine:
-    def __init__(self, yoe_weight: float = 0.25, skill_weight: float = 0.75):
+    def __init__(
+        self,
+        yoe_weight: float = 0.25,
+        skill_weight: float = 0.75,
+        semantic_weight: float = 0.0,
+    ):
         self.yoe_weight = yoe_weight
         self.skill_weight = skill_weight
+        # Share of final_score taken by embedding similarity; only applied
+        # by score_matrix() when it is given vectors
+        self.semantic_weight = semantic_weight
 
     def score(self, job: Job, resume: ResumeProfile) -> ScoreResult:
         resume_skills = {s.lower() for s in resume.skills}
@@ -45,4 +158,119 @@ class ScoringEngine:
             matched_skills=sorted(matched),
             experience_gap=gap,
             hard_mismatch=hard_mismatch,
-        )
\ No newline at end of file
+        )
+
+    def encode_jobs(
+        self, jobs: list[Job], vocab: SkillVocabulary | None = None
+    ) -> JobMatrix:
+        """Encode jobs' required skills as bitsets over a shared vocabulary."""
+        import numpy as np
+        vocab = vocab if vocab is not None else SkillVocabulary()
+        id_sets = [{vocab.id(s) for s in job.required_skills} for job in jobs]
+        counts = np.array([len(ids) for ids in id_sets], dtype=np.int64)
+        rows = np.repeat(np.arange(len(jobs)), counts)
+        cols = np.fromiter(
+            (i for ids in id_sets for i in ids), dtype=np.int64, count=int(counts.sum())
+        )
+        return JobMatrix(
+            job_ids=[job.id for job in jobs],
+            skill_bits=_pack(rows, cols, len(jobs), (len(vocab) + 7) // 8 or 1),
+            skill_counts=counts,
+            required_years=np.array([job.required_years for job in jobs], dtype=np.int64),
+            vocab=vocab,
+        )
+
+    def score_many(
+        self,
+        jobs: "list[Job] | JobMatrix",
+        resume: ResumeProfile,
+        vocab: SkillVocabulary | None = None,
+    ) -> ScoreBatch:
+        """
+        Score one resume against many jobs with array operations.
+
+        Produces the same numbers as score() for every job. Pass a
+        JobMatrix from encode_jobs() to reuse the job encoding across
+        several resumes.
+        """
+        return self.score_matrix(jobs, [resume], vocab)[0]
+
+    def score_matrix(
+        self,
+        jobs: "list[Job] | JobMatrix",
+        resumes: list[ResumeProfile],
+        vocab: SkillVocabulary | None = None,
+        job_vectors: "np.ndarray | None" = None,
+        resume_vectors: "np.ndarray | None" = None,
+    ) -> list[ScoreBatch]:
+        """
+        Score every resume against every job in one jobs × resumes pass.
+
+        With semantic_weight set and unit-length embeddings for the jobs
+        (jobs × dim) and resumes (resumes × dim), cosine similarity from
+        one matrix product is blended into final_score.
+
+        Returns one ScoreBatch per resume, in the order given.
+        """
+        import numpy as np
+        matrix = jobs if isinstance(jobs, JobMatrix) else self.encode_jobs(jobs, vocab)
+        n_bytes = matrix.skill_bits.shape[1]
+        if not resumes:
+            return []
+
+        # Resume skills the jobs never mention can't match; drop them. That
+        # includes ids the shared vocabulary gained after this matrix was
+        # encoded, which lie past its bit width.
+        width = n_bytes * 8
+        id_sets = [
+            sorted({i for i in (matrix.vocab.ids.get(s.lower()) for s in resume.skills)
+                    if i is not None and i < width})
+            for resume in resumes
+        ]
+        counts = np.array([len(ids) for ids in id_sets], dtype=np.int64)
+        resume_bits = _pack(
+            np.repeat(np.arange(len(resumes)), counts),
+            np.fromiter((i for ids in id_sets for i in ids), dtype=np.int64,
+                        count=int(counts.sum())),
+            len(resumes), n_bytes,
+        )
+
+        # (resumes, jobs, bytes)
+        job_bits = matrix.skill_bits[np.newaxis, :, :]
+        matched_bits = job_bits & resume_bits[:, np.newaxis, :]
+        missing_bits = job_bits & ~resume_bits[:, np.newaxis, :]
+        matched = _popcount_table()[matched_bits].sum(axis=2, dtype=np.int64)
+        total = np.broadcast_to(matrix.skill_counts, matched.shape)
+
+        coverage = np.divide(
+            matched, total, out=np.ones(matched.shape, dtype=np.float64), where=total > 0
+        )
+        experience = np.array([r.experience_years for r in resumes], dtype=np.int64)
+        gap = np.maximum(0, matrix.required_years[np.newaxis, :] - experience[:, np.newaxis])
+        yoe_score = np.maximum(0.0, 1.0 - (gap / 5))
+        final = (coverage * self.skill_weight + yoe_score * self.yoe_weight) * 100
+
+        semantic = None
+        if self.semantic_weight and job_vectors is not None and resume_vectors is not None:
+            similarity = np.asarray(resume_vectors, dtype=np.float32) @ np.asarray(
+                job_vectors, dtype=np.float32
+            ).T
+            semantic = np.clip(similarity, 0.0, 1.0).astype(np.float64) * 100
+            final = final * (1 - self.semantic_weight) + semantic * self.semantic_weight
+
+        return [
+            ScoreBatch(
+                job_ids=matrix.job_ids,
+                final_score=np.round(final[p], 1),
+                keyword_coverage=np.round(coverage[p] * 100, 1),
+                experience_gap=gap[p],
+                hard_mismatch=gap[p] > 3,
+                matched_bits=matched_bits[p],
+                missing_bits=missing_bits[p],
+                vocab=matrix.vocab,
+                _raw_final=final[p],
+                _raw_coverage=coverage[p],
+                semantic_score=None if semantic is None else np.round(semantic[p], 1),
+            )
+            for p in range(len(resumes))
+        ]
@@ -0,0 +1,27 @@
+"""
+Fill the normalized job_skills table from the legacy JSON column.
+
+    python -m infrastructure.backfill_skills [--batch-size 1000]
+"""
+import argparse
+import logging
+
+from infrastructure.database import init_db
+from infrastructure.repositories import JobRepository
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch-size", type=int, default=1000)
+    args = ap.parse_args()
+
+    init_db()
+    filled = JobRepository().backfill_skills(batch_size=args.batch_size)
+    logger.info(f"[backfill] job_skills populated for {filled} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
 # Set DATABASE_URL env var to use Postgres
@@ -9,6 +13,12 @@ USE_POSTGRES = DATABASE_URL.startswith("postgresql")
 
 SQLITE_PATH = Path("data/applyflow.db")
 
+# Postgres connection pool sizing; DB_POOL_TIMEOUT is how long a caller
+# waits for a free connection before giving up.
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
 CREATE_PROFILES_TABLE = """
     CREATE TABLE IF NOT EXISTS search_profiles (
         user_id             TEXT PRIMARY KEY,
@@ -59,8 +69,18 @@ CREATE_APPLICATIONS_TABLE = """
     );
 """
 
+CREATE_PARSE_CACHE_TABLE = """
+    CREATE TABLE IF NOT EXISTS parse_cache (
+        content_hash    TEXT PRIMARY KEY,
+        skills          TEXT,
+        years           INTEGER DEFAULT 0,
+        created_at      TEXT
+    );
+"""
+
 
 def get_connection():
+    """Open a new, unpooled connection. Prefer connection() for repository work."""
     if USE_POSTGRES:
         import psycopg2
         import psycopg2.extras
@@ -73,24 +93,352 @@ def get_connection():
         return conn
 
 
-def init_db() -> None:
+class _PoolStats:
+    """Checkout counters shared by both backends; read via pool_stats()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.checkout_seconds = 0.0
+
+    def record(self, waited: float, checkout: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self.checkout_seconds += checkout
+
+    def release(self) -> None:
+        with self.lock:
+            self.in_use -= 1
+
+
+_stats = _PoolStats()
+_pg_pool = None
+_pg_slots: threading.BoundedSemaphore | None = None
+_pg_lock = threading.Lock()
+_sqlite_local = threading.local()
+
+
+def _get_pg_pool():
+    global _pg_pool, _pg_slots
+    if _pg_pool is None:
+        with _pg_lock:
+            if _pg_pool is None:
+                from psycopg2.pool import ThreadedConnectionPool
+                # ThreadedConnectionPool raises when exhausted; the semaphore
+                # makes callers queue for a slot instead.
+                _pg_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+                _pg_pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, DATABASE_URL)
+    return _pg_pool
+
+
+def _sqlite_connection() -> sqlite3.Connection:
+    """One long-lived WAL-mode connection per thread and database file."""
+    cached = getattr(_sqlite_local, "conn", None)
+    if cached is not None and cached[0] == SQLITE_PATH:
+        return cached[1]
+    SQLITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(SQLITE_PATH, timeout=DB_POOL_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _sqlite_local.conn = (SQLITE_PATH, conn)
+    return conn
+
+
+@contextmanager
+def connection():
+    """
+    Borrow a connection for one unit of work.
+
+    Commits when the block exits cleanly and rolls back on error. Postgres
+    connections come from a shared ThreadedConnectionPool; SQLite reuses a
+    per-thread connection.
+    """
+    start = time.perf_counter()
     if USE_POSTGRES:
-        import psycopg2
-        conn = get_connection()
-        with conn.cursor() as cur:
-            # Postgres uses SERIAL not AUTOINCREMENT
-            jobs_ddl = CREATE_JOBS_TABLE
-            apps_ddl = CREATE_APPLICATIONS_TABLE
-            cur.execute(CREATE_PROFILES_TABLE)
-            cur.execute(jobs_ddl)
-            cur.execute(apps_ddl)
-        conn.commit()
-        conn.close()
+        pool = _get_pg_pool()
+        if not _pg_slots.acquire(timeout=DB_POOL_TIMEOUT):
+            raise TimeoutError(f"no database connection free after {DB_POOL_TIMEOUT}s")
+        waited = time.perf_counter() - start
+        try:
+            conn = pool.getconn()
+        except Exception:
+            _pg_slots.release()
+            raise
     else:
-        with get_connection() as conn:
+        waited = 0.0
+        conn = _sqlite_connection()
+    _stats.record(waited, time.perf_counter() - start)
+
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            broken = True
+        raise
+    finally:
+        _stats.release()
+        if USE_POSTGRES:
+            _pg_pool.putconn(conn, close=broken or bool(conn.closed))
+            _pg_slots.release()
+
+
+def pool_stats() -> dict:
+    """Snapshot of pool size and checkout timings since process start."""
+    with _stats.lock:
+        checkouts = _stats.checkouts or 1
+        return {
+            "backend": "postgres" if USE_POSTGRES else "sqlite",
+            "max_size": DB_POOL_MAX if USE_POSTGRES else None,
+            "in_use": _stats.in_use,
+            "checkouts": _stats.checkouts,
+            "avg_wait_ms": round(_stats.wait_seconds / checkouts * 1000, 3),
+            "max_wait_ms": round(_stats.max_wait_seconds * 1000, 3),
+            "avg_checkout_ms": round(_stats.checkout_seconds / checkouts * 1000, 3),
+        }
+
+
+# ── Migrations ────────────────────────────────────────────────────────────────
+# Append-only list of (version, name, statements). init_db() applies every
+# version not yet recorded in schema_migrations, in order, one transaction
+# each. Never edit a shipped migration; add a new one. Statements are
+# written for Postgres; SERIAL keys are rewritten for SQLite.
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version         INTEGER PRIMARY KEY,
+        name            TEXT NOT NULL,
+        applied_at      TEXT
+    );
+"""
+
+MIGRATION_LOCK_ID = 0x41505046  # arbitrary, shared by every migrator
+
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (1, "hot query indexes", [
+        # Older databases may hold several rows per job; keep the newest
+        # so the unique index can be built.
+        """
+        DELETE FROM applications WHERE id NOT IN (
+            SELECT MAX(id) FROM applications GROUP BY job_id
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_applications_job_id ON applications (job_id)",
+        "CREATE INDEX IF NOT EXISTS ix_applications_match_score ON applications (match_score DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_applications_status ON applications (status)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_company ON jobs (company)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_created_at ON jobs (created_at)",
+    ]),
+    (2, "keyset index for job listing", [
+        "CREATE INDEX IF NOT EXISTS ix_applications_score_job "
+        "ON applications (match_score DESC, job_id)",
+    ]),
+    (3, "normalized skills", [
+        """
+        CREATE TABLE IF NOT EXISTS skills (
+            id              SERIAL PRIMARY KEY,
+            name            TEXT NOT NULL UNIQUE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS job_skills (
+            job_id          TEXT NOT NULL,
+            skill_id        INTEGER NOT NULL,
+            PRIMARY KEY (job_id, skill_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id),
+            FOREIGN KEY (skill_id) REFERENCES skills(id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_job_skills_skill ON job_skills (skill_id, job_id)",
+    ]),
+    (4, "per-user applications", [
+        "ALTER TABLE applications ADD COLUMN user_id TEXT NOT NULL DEFAULT 'default'",
+        # Scores so far were computed for the first active profile; when that
+        # is unambiguous, hand the existing rows to it.
+        """
+        UPDATE applications
+        SET user_id = (SELECT MIN(user_id) FROM search_profiles WHERE active = 1)
+        WHERE (SELECT COUNT(*) FROM search_profiles WHERE active = 1) = 1
+        """,
+        "DROP INDEX IF EXISTS ux_applications_job_id",
+        "DROP INDEX IF EXISTS ix_applications_score_job",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_applications_user_job "
+        "ON applications (user_id, job_id)",
+        "CREATE INDEX IF NOT EXISTS ix_applications_job_id ON applications (job_id)",
+        "CREATE INDEX IF NOT EXISTS ix_applications_user_score_job "
+        "ON applications (user_id, match_score DESC, job_id)",
+        "CREATE INDEX IF NOT EXISTS ix_applications_score_job_user "
+        "ON applications (match_score DESC, job_id, user_id)",
+    ]),
+    (5, "job embeddings", [
+        # float32 vectors keyed by hash(model, description)
+        """
+        CREATE TABLE IF NOT EXISTS job_embeddings (
+            content_hash    TEXT PRIMARY KEY,
+            model           TEXT NOT NULL,
+            dim             INTEGER NOT NULL,
+            vector          BYTEA NOT NULL,
+            created_at      TEXT
+        )
+        """,
+    ]),
+    (6, "job source versions", [
+        # Lets collectors tell a re-posted/edited listing from a known one
+        "ALTER TABLE jobs ADD COLUMN source_updated_at TEXT",
+    ]),
+    (7, "near-duplicate clusters", [
+        # MinHash signature of each job's normalized title + description
+        """
+        CREATE TABLE IF NOT EXISTS job_signatures (
+            job_id          TEXT PRIMARY KEY,
+            source          TEXT,
+            signature       BYTEA NOT NULL,
+            created_at      TEXT
+        )
+        """,
+        # LSH band buckets ("band:hash") → jobs, for candidate lookup
+        """
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            bucket          TEXT NOT NULL,
+            job_id          TEXT NOT NULL,
+            PRIMARY KEY (bucket, job_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_lsh_buckets_job ON lsh_buckets (job_id)",
+        # Every indexed job's cluster; cluster_id is the canonical job's id
+        """
+        CREATE TABLE IF NOT EXISTS job_clusters (
+            job_id          TEXT PRIMARY KEY,
+            cluster_id      TEXT NOT NULL,
+            similarity      REAL,
+            created_at      TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_job_clusters_cluster ON job_clusters (cluster_id)",
+    ]),
+    (8, "ingest runs", [
+        # One row per ingestion cycle; progress and summary are JSON
+        """
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            id              TEXT PRIMARY KEY,
+            state           TEXT NOT NULL,
+            trigger         TEXT,
+            started_at      TEXT,
+            heartbeat_at    TEXT,
+            finished_at     TEXT,
+            progress        TEXT,
+            summary         TEXT,
+            error           TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_ingest_runs_started ON ingest_runs (started_at)",
+        # At most one holder per name until expires_at (epoch seconds)
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+            name            TEXT PRIMARY KEY,
+            holder          TEXT NOT NULL,
+            expires_at      REAL NOT NULL
+        )
+        """,
+    ]),
+    (9, "fetch checkpoints", [
+        # Last fetch of each company/feed, per collector; key is the
+        # company slug or feed name
+        """
+        CREATE TABLE IF NOT EXISTS fetch_checkpoints (
+            source          TEXT NOT NULL,
+            key             TEXT NOT NULL,
+            run_id          TEXT,
+            status          TEXT NOT NULL,
+            fetched         INTEGER DEFAULT 0,
+            cursor          TEXT,
+            error           TEXT,
+            attempted_at    TEXT,
+            succeeded_at    TEXT,
+            PRIMARY KEY (source, key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_fetch_checkpoints_run ON fetch_checkpoints (run_id)",
+    ]),
+    (10, "refresh schedule", [
+        # Adaptive polling: seconds between fetches, when the company is
+        # next due, and when its board last changed
+        "ALTER TABLE fetch_checkpoints ADD COLUMN refresh_interval REAL",
+        "ALTER TABLE fetch_checkpoints ADD COLUMN next_due_at TEXT",
+        "ALTER TABLE fetch_checkpoints ADD COLUMN changed_at TEXT",
+        "CREATE INDEX IF NOT EXISTS ix_fetch_checkpoints_due "
+        "ON fetch_checkpoints (source, next_due_at)",
+    ]),
+]
+
+
+def applied_migrations() -> set[int]:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(CREATE_MIGRATIONS_TABLE)
+        cur.execute("SELECT version FROM schema_migrations")
+        return {r[0] for r in cur.fetchall()}
+
+
+def migrate() -> list[int]:
+    """Apply pending migrations. Returns the versions applied by this call."""
+    ph = "%s" if USE_POSTGRES else "?"
+    done = applied_migrations()
+    applied = []
+    for version, name, statements in MIGRATIONS:
+        if version in done:
+            continue
+        with connection() as conn:
+            cur = conn.cursor()
+            if USE_POSTGRES:
+                # Serialise concurrent migrators (API and worker starting together)
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            cur.execute(
+                f"SELECT 1 FROM schema_migrations WHERE version = {ph}", (version,)
+            )
+            if cur.fetchone():
+                continue
+            for sql in statements:
+                if not USE_POSTGRES:
+                    sql = sql.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
+                    sql = sql.replace("BYTEA", "BLOB")
+                cur.execute(sql)
+            cur.execute(
+                f"INSERT INTO schema_migrations (version, name, applied_at) "
+                f"VALUES ({ph}, {ph}, {ph})",
+                (version, name, datetime.utcnow().isoformat()),
+            )
+        applied.append(version)
+    return applied
+
+
+def init_db() -> None:
+    with connection() as conn:
+        if USE_POSTGRES:
+            with conn.cursor() as cur:
+                # Postgres uses SERIAL not AUTOINCREMENT
+                cur.execute(CREATE_PROFILES_TABLE)
+                cur.execute(CREATE_JOBS_TABLE)
+                cur.execute(CREATE_APPLICATIONS_TABLE)
+                cur.execute(CREATE_PARSE_CACHE_TABLE)
+        else:
             # SQLite uses AUTOINCREMENT
             apps_ddl = CREATE_APPLICATIONS_TABLE.replace(
                 "SERIAL PRIMARY KEY",
                 "INTEGER PRIMARY KEY AUTOINCREMENT"
             )
-            conn.executescript(CREATE_JOBS_TABLE + apps_ddl)
\ No newline at end of file
+            conn.executescript(
+                CREATE_PROFILES_TABLE + CREATE_JOBS_TABLE + apps_ddl
+                + CREATE_PARSE_CACHE_TABLE
+            )
+    migrate()
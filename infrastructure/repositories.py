@@ -1,11 +1,13 @@
 import json
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
-from domain.application import Application, ApplicationStatus
+from domain.application import DEFAULT_USER_ID, Application, ApplicationStatus
 from domain.job import Job
 from domain.profile import SearchProfile, ExperienceLevel, LocationPref
 from domain.scoring import ScoreResult
-from infrastructure.database import USE_POSTGRES, get_connection
+from infrastructure.database import USE_POSTGRES, connection
 
 
 def _ph() -> str:
@@ -13,6 +15,61 @@ def _ph() -> str:
     return "%s" if USE_POSTGRES else "?"
 
 
+# Max bound parameters per IN (...) list; stays well under SQLite's limit
+_IN_CHUNK = 500
+
+
+def _chunks(items: list, size: int = _IN_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+@contextmanager
+def _borrow(conn=None):
+    """The caller's open connection (joining its transaction), or a new one."""
+    if conn is not None:
+        yield conn
+        return
+    with connection() as conn:
+        yield conn
+
+
+def _skill_ids(cur, names: set[str]) -> dict[str, int]:
+    """Look up skill IDs by name, creating any that don't exist yet."""
+    ph = _ph()
+    names = sorted(names)
+    if not names:
+        return {}
+    cur.executemany(
+        f"INSERT INTO skills (name) VALUES ({ph}) ON CONFLICT (name) DO NOTHING",
+        [(n,) for n in names],
+    )
+    ids = {}
+    for chunk in _chunks(names):
+        cur.execute(
+            f"SELECT name, id FROM skills WHERE name IN ({','.join([ph] * len(chunk))})",
+            chunk,
+        )
+        ids.update((name, skill_id) for name, skill_id in cur.fetchall())
+    return ids
+
+
+def _write_job_skills(cur, jobs: list[Job]) -> int:
+    """Insert job_skills rows for the jobs' required skills. Returns rows written."""
+    ph = _ph()
+    ids = _skill_ids(cur, {s.lower() for job in jobs for s in job.required_skills})
+    rows = list(dict.fromkeys(
+        (job.id, ids[s.lower()]) for job in jobs for s in job.required_skills
+    ))
+    if rows:
+        cur.executemany(
+            f"INSERT INTO job_skills (job_id, skill_id) VALUES ({ph}, {ph}) "
+            "ON CONFLICT DO NOTHING",
+            rows,
+        )
+    return len(rows)
+
+
 def _cursor(conn):
     """Return a dict-row cursor for Postgres; plain conn for SQLite."""
     if USE_POSTGRES:
@@ -23,47 +80,79 @@ def _cursor(conn):
 
 class JobRepository:
     def save(self, job: Job) -> bool:
-        ph = _ph()
-        conn = get_connection()
-        try:
-            cur = conn.cursor() if USE_POSTGRES else conn
-            if USE_POSTGRES:
-                cur.execute(f"SELECT id FROM jobs WHERE id = {ph}", (job.id,))
-                exists = cur.fetchone()
-            else:
-                exists = conn.execute(
-                    f"SELECT id FROM jobs WHERE id = {ph}", (job.id,)
-                ).fetchone()
+        return bool(self.save_many([job]))
 
-            if exists:
-                return False
-
-            params = (
+    def save_many(self, jobs: list[Job], conn=None) -> list[str]:
+        """
+        Insert a batch of jobs in one transaction (the caller's, given
+        `conn`). Jobs already stored are left alone unless their
+        source_updated_at changed, in which case they are updated in place.
+        Returns the IDs that were new or updated, in input order.
+        """
+        if not jobs:
+            return []
+        ph = _ph()
+        rows = [
+            (
                 job.id, job.title, job.company, job.location,
                 job.description, json.dumps(job.required_skills),
                 job.required_years, job.source, job.source_url,
-                int(job.remote), job.created_at.isoformat(),
+                int(job.remote), job.created_at.isoformat(), job.source_updated_at,
             )
-            sql = f"""
-                INSERT INTO jobs
-                    (id, title, company, location, description,
-                     required_skills, required_years, source, source_url,
-                     remote, created_at)
-                VALUES ({','.join([ph]*11)})
-            """
+            for job in jobs
+        ]
+        columns = """
+            (id, title, company, location, description,
+             required_skills, required_years, source, source_url,
+             remote, created_at, source_updated_at)
+        """
+        # Only a changed, known source version replaces a stored job
+        changed = "IS DISTINCT FROM" if USE_POSTGRES else "IS NOT"
+        conflict = f"""
+            ON CONFLICT (id) DO UPDATE SET
+                title=EXCLUDED.title,
+                location=EXCLUDED.location,
+                description=EXCLUDED.description,
+                required_skills=EXCLUDED.required_skills,
+                required_years=EXCLUDED.required_years,
+                source_url=EXCLUDED.source_url,
+                remote=EXCLUDED.remote,
+                source_updated_at=EXCLUDED.source_updated_at
+            WHERE EXCLUDED.source_updated_at IS NOT NULL
+              AND jobs.source_updated_at {changed} EXCLUDED.source_updated_at
+        """
+        # A row may only be upserted once per statement; last one wins
+        rows = list({row[0]: row for row in rows}.values())
+        with _borrow(conn) as conn:
+            cur = conn.cursor()
             if USE_POSTGRES:
-                cur.execute(sql, params)
-                conn.commit()
+                from psycopg2.extras import execute_values
+                inserted = execute_values(
+                    cur,
+                    f"INSERT INTO jobs {columns} VALUES %s {conflict} RETURNING id",
+                    rows,
+                    fetch=True,
+                )
+                new_ids = {r[0] for r in inserted}
             else:
-                conn.execute(sql, params)
-            return True
-        finally:
-            if USE_POSTGRES:
-                conn.close()
+                sql = f"INSERT INTO jobs {columns} VALUES ({','.join([ph]*12)}) {conflict}"
+                new_ids = set()
+                for row in rows:
+                    if conn.execute(sql, row).rowcount:
+                        new_ids.add(row[0])
+            # Dual-write: JSON column above, normalized job_skills here.
+            # Updated jobs get their skill rows replaced.
+            for chunk in _chunks(sorted(new_ids)):
+                cur.execute(
+                    f"DELETE FROM job_skills WHERE job_id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+            latest = {j.id: j for j in jobs if j.id in new_ids}
+            _write_job_skills(cur, list(latest.values()))
+            return [job.id for job in jobs if job.id in new_ids]
 
     def get_all(self) -> list[Job]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             sql = "SELECT * FROM jobs ORDER BY created_at DESC"
             if USE_POSTGRES:
                 import psycopg2.extras
@@ -73,22 +162,133 @@ class JobRepository:
             else:
                 rows = conn.execute(sql).fetchall()
             return [self._row_to_job(r) for r in rows]
-        finally:
-            if USE_POSTGRES:
-                conn.close()
+
+    def get_many(self, ids: list[str]) -> list[Job]:
+        """Jobs with the given IDs, in input order; unknown IDs are skipped."""
+        ph = _ph()
+        found = {}
+        with connection() as conn:
+            cur = _cursor(conn) if USE_POSTGRES else conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(ids))):
+                cur.execute(
+                    f"SELECT * FROM jobs WHERE id IN ({','.join([ph] * len(chunk))})", chunk
+                )
+                found.update((r["id"], self._row_to_job(r)) for r in cur.fetchall())
+        return [found[i] for i in ids if i in found]
+
+    def changed(self, jobs: list[Job]) -> list[Job]:
+        """The jobs save_many() would insert or update, by the same rule."""
+        stored = self.source_versions([job.id for job in jobs])
+        return [
+            job for job in jobs
+            if job.id not in stored
+            or (job.source_updated_at is not None and stored[job.id] != job.source_updated_at)
+        ]
+
+    def source_versions(self, ids: list[str]) -> dict[str, str | None]:
+        """source_updated_at of the given jobs that are already stored."""
+        ph = _ph()
+        found = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(ids))):
+                cur.execute(
+                    f"SELECT id, source_updated_at FROM jobs "
+                    f"WHERE id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                found.update((job_id, version) for job_id, version in cur.fetchall())
+        return found
+
+    def job_ids(self, more_years_than: int | None = None) -> list[str]:
+        """IDs of all jobs, or only those requiring more than `more_years_than` years."""
+        ph = _ph()
+        where, params = "", []
+        if more_years_than is not None:
+            where, params = f"WHERE required_years > {ph}", [more_years_than]
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT id FROM jobs {where} ORDER BY id", params)
+            return [r[0] for r in cur.fetchall()]
 
     def count(self) -> int:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             if USE_POSTGRES:
                 cur = conn.cursor()
                 cur.execute("SELECT COUNT(*) FROM jobs")
                 return cur.fetchone()[0]
             else:
                 return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-        finally:
-            if USE_POSTGRES:
-                conn.close()
+
+    def jobs_requiring(self, skills: list[str], match_all: bool = True) -> list[str]:
+        """IDs of jobs that require all (or, with match_all=False, any) of the skills."""
+        names = sorted({s.lower() for s in skills})
+        if not names:
+            return []
+        ph = _ph()
+        having = f"HAVING COUNT(DISTINCT js.skill_id) = {len(names)}" if match_all else ""
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT js.job_id FROM job_skills js
+                JOIN skills s ON s.id = js.skill_id
+                WHERE s.name IN ({','.join([ph] * len(names))})
+                GROUP BY js.job_id {having}
+                ORDER BY js.job_id
+            """, names)
+            return [r[0] for r in cur.fetchall()]
+
+    def skill_frequency(
+        self, limit: int = 20, exclude: list[str] | None = None
+    ) -> list[tuple[str, int]]:
+        """
+        How many stored jobs require each skill, most common first.
+        Skills in `exclude` (e.g. a resume's skills) are left out, which
+        turns this into a missing-skills ranking.
+        """
+        ph = _ph()
+        exclude = sorted({s.lower() for s in exclude or []})
+        where = f"WHERE s.name NOT IN ({','.join([ph] * len(exclude))})" if exclude else ""
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT s.name, COUNT(*) AS n FROM job_skills js
+                JOIN skills s ON s.id = js.skill_id
+                {where}
+                GROUP BY s.name
+                ORDER BY n DESC, s.name
+                LIMIT {int(limit)}
+            """, exclude)
+            return [(name, n) for name, n in cur.fetchall()]
+
+    def backfill_skills(self, batch_size: int = 1000) -> int:
+        """
+        Populate job_skills from the JSON required_skills column for jobs
+        that have no job_skills rows yet. Safe to re-run. Returns jobs filled.
+        """
+        filled = 0
+        while True:
+            with connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"""
+                    SELECT id, required_skills FROM jobs j
+                    WHERE required_skills IS NOT NULL AND required_skills NOT IN ('', '[]')
+                      AND NOT EXISTS (SELECT 1 FROM job_skills js WHERE js.job_id = j.id)
+                    ORDER BY id
+                    LIMIT {int(batch_size)}
+                """)
+                batch = [
+                    Job(
+                        id=job_id, title="", company="", location="", description="",
+                        required_skills=json.loads(skills), required_years=0,
+                        source="", source_url="",
+                    )
+                    for job_id, skills in cur.fetchall()
+                ]
+                if not batch:
+                    return filled
+                _write_job_skills(cur, batch)
+            filled += len(batch)
 
     def _row_to_job(self, row) -> Job:
         return Job(
@@ -102,111 +302,318 @@ class JobRepository:
             source=row["source"] or "",
             source_url=row["source_url"] or "",
             remote=bool(row["remote"]),
+            source_updated_at=row["source_updated_at"],
         )
 
 
 class ApplicationRepository:
+    # ux_applications_user_job (migration 4) makes (user_id, job_id) a
+    # conflict target: one row per job per profile
+    _UPSERT = """
+        INSERT INTO applications
+            (user_id, job_id, status, match_score, missing_skills,
+             matched_skills, experience_gap, notes, updated_at)
+        VALUES {values}
+        ON CONFLICT (user_id, job_id) DO UPDATE SET
+            status=EXCLUDED.status,
+            match_score=EXCLUDED.match_score,
+            missing_skills=EXCLUDED.missing_skills,
+            matched_skills=EXCLUDED.matched_skills,
+            experience_gap=EXCLUDED.experience_gap,
+            updated_at=EXCLUDED.updated_at
+    """
+
+    @staticmethod
+    def _upsert_params(app: Application, result: ScoreResult, now: str) -> tuple:
+        return (
+            app.user_id, app.job_id, app.status.value, result.final_score,
+            json.dumps(result.missing_skills),
+            json.dumps(result.matched_skills),
+            result.experience_gap, app.notes, now,
+        )
+
     def save(self, app: Application, result: ScoreResult) -> None:
         ph = _ph()
-        conn = get_connection()
-        try:
-            if USE_POSTGRES:
-                cur = conn.cursor()
-                cur.execute(
-                    f"SELECT id FROM applications WHERE job_id = {ph}",
-                    (app.job_id,)
-                )
-                exists = cur.fetchone()
-            else:
-                exists = conn.execute(
-                    f"SELECT id FROM applications WHERE job_id = {ph}",
-                    (app.job_id,)
-                ).fetchone()
+        now = datetime.utcnow().isoformat()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                self._UPSERT.format(values=f"({','.join([ph]*9)})"),
+                self._upsert_params(app, result, now),
+            )
 
-            now = datetime.utcnow().isoformat()
-
-            if exists:
-                sql = f"""
-                    UPDATE applications
-                    SET status={ph}, match_score={ph}, missing_skills={ph},
-                        matched_skills={ph}, experience_gap={ph}, updated_at={ph}
-                    WHERE job_id={ph}
-                """
-                params = (
-                    app.status.value, result.final_score,
-                    json.dumps(result.missing_skills),
-                    json.dumps(result.matched_skills),
-                    result.experience_gap, now, app.job_id,
-                )
+    def upsert_many(self, items: list[tuple[Application, ScoreResult]]) -> None:
+        """Insert or update the scores for a batch of jobs in one statement."""
+        if not items:
+            return
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        # A row may only be upserted once per statement; last one wins
+        latest = {(app.user_id, app.job_id): (app, result) for app, result in items}
+        rows = [self._upsert_params(app, result, now) for app, result in latest.values()]
+        with connection() as conn:
+            cur = conn.cursor()
+            if USE_POSTGRES:
+                from psycopg2.extras import execute_values
+                execute_values(cur, self._UPSERT.format(values="%s"), rows)
             else:
-                sql = f"""
-                    INSERT INTO applications
-                        (job_id, status, match_score, missing_skills,
-                         matched_skills, experience_gap, notes, updated_at)
-                    VALUES ({','.join([ph]*8)})
-                """
-                params = (
-                    app.job_id, app.status.value, result.final_score,
-                    json.dumps(result.missing_skills),
-                    json.dumps(result.matched_skills),
-                    result.experience_gap, app.notes, now,
+                cur.executemany(
+                    self._UPSERT.format(values=f"({','.join([ph]*9)})"), rows
                 )
 
+    @staticmethod
+    def _user_filter(user_id: str | None, column: str = "a.user_id") -> tuple[str, list]:
+        """WHERE fragment scoping a query to one profile; empty for all users."""
+        if user_id is None:
+            return "", []
+        return f"{column} = {_ph()}", [user_id]
+
+    # Rescoring: refresh the score columns, keep status and notes
+    _SCORE_UPSERT = """
+        INSERT INTO applications
+            (user_id, job_id, status, match_score, missing_skills,
+             matched_skills, experience_gap, notes, updated_at)
+        VALUES {values}
+        ON CONFLICT (user_id, job_id) DO UPDATE SET
+            match_score=EXCLUDED.match_score,
+            missing_skills=EXCLUDED.missing_skills,
+            matched_skills=EXCLUDED.matched_skills,
+            experience_gap=EXCLUDED.experience_gap,
+            updated_at=EXCLUDED.updated_at
+    """
+
+    def upsert_scores(self, items: list[tuple[Application, ScoreResult]], conn=None) -> None:
+        """
+        Write new scores for a batch of jobs without touching the status or
+        notes of applications that already exist. Given `conn`, the write
+        joins the caller's transaction.
+        """
+        if not items:
+            return
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        latest = {(app.user_id, app.job_id): (app, result) for app, result in items}
+        rows = [self._upsert_params(app, result, now) for app, result in latest.values()]
+        with _borrow(conn) as conn:
+            cur = conn.cursor()
             if USE_POSTGRES:
-                cur.execute(sql, params)
-                conn.commit()
+                from psycopg2.extras import execute_values
+                execute_values(cur, self._SCORE_UPSERT.format(values="%s"), rows)
             else:
-                conn.execute(sql, params)
-        finally:
-            if USE_POSTGRES:
-                conn.close()
+                cur.executemany(
+                    self._SCORE_UPSERT.format(values=f"({','.join([ph]*9)})"), rows
+                )
 
-    def get_all(self) -> list[dict]:
-        conn = get_connection()
-        try:
-            sql = """
+    def count(self, user_id: str | None = None) -> int:
+        cond, params = self._user_filter(user_id, "user_id")
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT COUNT(*) FROM applications" + (f" WHERE {cond}" if cond else ""),
+                params,
+            )
+            return cur.fetchone()[0]
+
+    def get_all(self, user_id: str | None = None) -> list[dict]:
+        cond, params = self._user_filter(user_id)
+        with connection() as conn:
+            sql = f"""
                 SELECT a.*, j.title, j.company, j.location, j.source_url
                 FROM applications a
                 JOIN jobs j ON a.job_id = j.id
+                {"WHERE " + cond if cond else ""}
                 ORDER BY a.match_score DESC
             """
             if USE_POSTGRES:
                 import psycopg2.extras
                 cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-                cur.execute(sql)
+                cur.execute(sql, params)
                 return [dict(r) for r in cur.fetchall()]
             else:
-                rows = conn.execute(sql).fetchall()
+                rows = conn.execute(sql, params).fetchall()
                 return [dict(r) for r in rows]
-        finally:
+
+    # Columns for list views: everything except the JSON skill blobs
+    SUMMARY_COLUMNS = (
+        "a.user_id, a.job_id, a.status, a.match_score, a.experience_gap, a.applied_at, "
+        "a.updated_at, j.title, j.company, j.location, j.source_url"
+    )
+    FULL_COLUMNS = "a.*, j.title, j.company, j.location, j.source_url"
+
+    def search(
+        self,
+        company: str | None = None,
+        status: str | None = None,
+        min_score: float = 0.0,
+        limit: int = 100,
+        after: tuple[float, str] | None = None,
+        summary: bool = False,
+        skills: list[str] | None = None,
+        user_id: str | None = None,
+        include_duplicates: bool = False,
+        terms: list[str] | None = None,
+    ) -> tuple[list[dict], int]:
+        """
+        One page of applications ordered by (match_score DESC, job_id,
+        user_id), plus the total number matching the filters. `skills` keeps
+        only jobs that require all of the given skills; `terms` keeps jobs
+        whose title or company contains any of them; `user_id` restricts
+        the page to one profile's scores. Near-duplicates of another job
+        (job_clusters) are left out unless `include_duplicates`.
+
+        `after` is the (match_score, job_id[, user_id]) of the last row of the
+        previous page; rows strictly after it are returned (keyset pagination).
+        """
+        ph = _ph()
+        where, params = ["a.match_score >= " + ph], [min_score]
+        cond, user_params = self._user_filter(user_id)
+        if cond:
+            where.append(cond)
+            params.extend(user_params)
+        if company:
+            where.append(f"j.company = {ph}")
+            params.append(company)
+        if status:
+            where.append(f"a.status = {ph}")
+            params.append(status)
+        names = sorted({sk.lower() for sk in skills or []})
+        if names:
+            # Jobs requiring every listed skill, resolved through job_skills
+            where.append(f"""a.job_id IN (
+                SELECT js.job_id FROM job_skills js JOIN skills s ON s.id = js.skill_id
+                WHERE s.name IN ({','.join([ph] * len(names))})
+                GROUP BY js.job_id HAVING COUNT(DISTINCT js.skill_id) = {len(names)}
+            )""")
+            params.extend(names)
+        words = sorted({t.lower() for t in terms or [] if t})
+        if words:
+            where.append("(" + " OR ".join(
+                [f"LOWER(j.title) LIKE {ph} OR LOWER(j.company) LIKE {ph}"] * len(words)
+            ) + ")")
+            for word in words:
+                params.extend([f"%{word}%"] * 2)
+        if not include_duplicates:
+            where.append(
+                "NOT EXISTS (SELECT 1 FROM job_clusters c "
+                "WHERE c.job_id = a.job_id AND c.cluster_id <> c.job_id)"
+            )
+        base = f"FROM applications a JOIN jobs j ON a.job_id = j.id WHERE {' AND '.join(where)}"
+
+        page_where, page_params = "", list(params)
+        if after is not None:
+            score, job_id = after[0], after[1]
+            after_user = after[2] if len(after) > 2 else None
+            # match_score is REAL (float4 on Postgres): compare at that precision,
+            # or the cursor's 73.3 never equals the stored 73.30000305
+            cursor_score = f"CAST({ph} AS REAL)"
+            if after_user is None:
+                page_where = (
+                    f" AND (a.match_score < {cursor_score} OR (a.match_score = {cursor_score}"
+                    f" AND a.job_id > {ph}))"
+                )
+                page_params += [score, score, job_id]
+            else:
+                page_where = (
+                    f" AND (a.match_score < {cursor_score} OR (a.match_score = {cursor_score} AND"
+                    f" (a.job_id > {ph} OR (a.job_id = {ph} AND a.user_id > {ph}))))"
+                )
+                page_params += [score, score, job_id, job_id, after_user]
+        columns = self.SUMMARY_COLUMNS if summary else self.FULL_COLUMNS
+        page_sql = f"""
+            SELECT {columns} {base}{page_where}
+            ORDER BY a.match_score DESC, a.job_id, a.user_id
+            LIMIT {int(limit)}
+        """
+
+        with connection() as conn:
+            cur = _cursor(conn)
             if USE_POSTGRES:
-                conn.close()
+                cur.execute(page_sql, page_params)
+                rows = [dict(r) for r in cur.fetchall()]
+                cur.execute(f"SELECT COUNT(*) AS n {base}", params)
+                total = cur.fetchone()["n"]
+            else:
+                rows = [dict(r) for r in conn.execute(page_sql, page_params).fetchall()]
+                total = conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+        return rows, total
 
-    def update_status(self, job_id: str, status: ApplicationStatus) -> None:
+    def companies(self, user_id: str | None = None) -> list[str]:
+        """Distinct companies that have at least one scored job."""
+        cond, params = self._user_filter(user_id)
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT DISTINCT j.company FROM applications a
+                JOIN jobs j ON a.job_id = j.id
+                {"WHERE " + cond if cond else ""}
+                ORDER BY j.company
+            """, params)
+            return [r[0] for r in cur.fetchall()]
+
+    def status_counts(self, user_id: str | None = None) -> dict[str, int]:
+        """Number of applications per status."""
+        cond, params = self._user_filter(user_id, "user_id")
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT status, COUNT(*) FROM applications"
+                + (f" WHERE {cond}" if cond else "")
+                + " GROUP BY status",
+                params,
+            )
+            return {status: n for status, n in cur.fetchall()}
+
+    def missing_skill_counts(
+        self, limit: int = 10, user_id: str | None = None
+    ) -> list[tuple[str, int]]:
+        """Most frequently missing skills, unpacked from the JSON lists in SQL."""
+        ph = _ph()
+        if USE_POSTGRES:
+            source = (
+                "applications a, jsonb_array_elements_text("
+                "COALESCE(NULLIF(a.missing_skills, ''), '[]')::jsonb) AS s(skill)"
+            )
+            skill = "s.skill"
+        else:
+            source = (
+                "applications a, json_each(COALESCE(NULLIF(a.missing_skills, ''), '[]')) AS s"
+            )
+            skill = "s.value"
+        cond, params = self._user_filter(user_id)
+        sql = f"""
+            SELECT {skill} AS skill, COUNT(*) AS n FROM {source}
+            {"WHERE " + cond if cond else ""}
+            GROUP BY {skill}
+            ORDER BY n DESC, skill
+            LIMIT {ph}
+        """
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (*params, limit))
+            return [(skill, n) for skill, n in cur.fetchall()]
+
+    def update_status(
+        self, job_id: str, status: ApplicationStatus, user_id: str = DEFAULT_USER_ID
+    ) -> None:
+        """Set the status of one profile's application for a job."""
         ph = _ph()
-        conn = get_connection()
-        try:
+        with connection() as conn:
             sql = f"""
                 UPDATE applications SET status={ph}, updated_at={ph}
-                WHERE job_id={ph}
+                WHERE job_id={ph} AND user_id={ph}
             """
-            params = (status.value, datetime.utcnow().isoformat(), job_id)
+            params = (status.value, datetime.utcnow().isoformat(), job_id, user_id)
             if USE_POSTGRES:
                 cur = conn.cursor()
                 cur.execute(sql, params)
-                conn.commit()
             else:
                 conn.execute(sql, params)
-        finally:
-            if USE_POSTGRES:
-                conn.close()
 
 
 class ProfileRepository:
     def save(self, profile: SearchProfile) -> None:
         ph = _ph()
-        conn = get_connection()
-        try:
+        with connection() as conn:
             sql = f"""
                 INSERT INTO search_profiles
                     (user_id, name, role_keywords, required_stack, preferred_stack,
@@ -250,17 +657,12 @@ class ProfileRepository:
             if USE_POSTGRES:
                 cur = conn.cursor()
                 cur.execute(sql, params)
-                conn.commit()
             else:
                 conn.execute(sql, params)
-        finally:
-            if USE_POSTGRES:
-                conn.close()
 
     def get(self, user_id: str) -> SearchProfile | None:
         ph = _ph()
-        conn = get_connection()
-        try:
+        with connection() as conn:
             if USE_POSTGRES:
                 import psycopg2.extras
                 cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -273,13 +675,9 @@ class ProfileRepository:
                     f"SELECT * FROM search_profiles WHERE user_id = {ph}", (user_id,)
                 ).fetchone()
             return self._row_to_profile(dict(row)) if row else None
-        finally:
-            if USE_POSTGRES:
-                conn.close()
 
     def get_all_active(self) -> list[SearchProfile]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             sql = "SELECT * FROM search_profiles WHERE active = 1"
             if USE_POSTGRES:
                 import psycopg2.extras
@@ -289,9 +687,6 @@ class ProfileRepository:
             else:
                 rows = conn.execute(sql).fetchall()
             return [self._row_to_profile(dict(r)) for r in rows]
-        finally:
-            if USE_POSTGRES:
-                conn.close()
 
     def _row_to_profile(self, row: dict) -> SearchProfile:
         return SearchProfile(
@@ -308,4 +703,483 @@ class ProfileRepository:
             experience_years=row["experience_years"],
             certifications=json.loads(row["certifications"] or "[]"),
             companies=json.loads(row.get("companies") or "[]"),
-        )
\ No newline at end of file
+        )
+
+
+class ParseCacheRepository:
+    """Persistent tier of the JD parse cache, keyed by description hash."""
+
+    def get_many(self, hashes: list[str]) -> dict[str, tuple[list[str], int]]:
+        ph = _ph()
+        found = {}
+        if not hashes:
+            return found
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(hashes):
+                cur.execute(
+                    f"SELECT content_hash, skills, years FROM parse_cache "
+                    f"WHERE content_hash IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                for h, skills, years in cur.fetchall():
+                    found[h] = (json.loads(skills or "[]"), years or 0)
+            return found
+
+    def save_many(self, entries: dict[str, tuple[list[str], int]]) -> None:
+        if not entries:
+            return
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        sql = f"""
+            INSERT INTO parse_cache (content_hash, skills, years, created_at)
+            VALUES ({ph}, {ph}, {ph}, {ph})
+            ON CONFLICT (content_hash) DO NOTHING
+        """
+        params = [
+            (h, json.dumps(skills), years, now)
+            for h, (skills, years) in entries.items()
+        ]
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.executemany(sql, params)
+
+
+class EmbeddingRepository:
+    """Stored job description embeddings, keyed by hash(model, description)."""
+
+    def get_many(self, hashes: list[str]) -> dict[str, bytes]:
+        """Raw float32 vector bytes for the hashes that are stored."""
+        ph = _ph()
+        found = {}
+        if not hashes:
+            return found
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(hashes):
+                cur.execute(
+                    f"SELECT content_hash, vector FROM job_embeddings "
+                    f"WHERE content_hash IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                for h, vector in cur.fetchall():
+                    found[h] = bytes(vector)
+            return found
+
+    def save_many(self, model: str, dim: int, entries: dict[str, bytes]) -> None:
+        if not entries:
+            return
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        sql = f"""
+            INSERT INTO job_embeddings (content_hash, model, dim, vector, created_at)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
+            ON CONFLICT (content_hash) DO NOTHING
+        """
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.executemany(sql, [(h, model, dim, v, now) for h, v in entries.items()])
+
+
+class DedupRepository:
+    """MinHash signatures, LSH buckets and near-duplicate clusters of jobs."""
+
+    def signatures(self, job_ids: list[str]) -> dict[str, tuple[str, bytes]]:
+        """(source, signature bytes) of the given jobs that are indexed."""
+        ph = _ph()
+        found = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(job_ids))):
+                cur.execute(
+                    f"SELECT job_id, source, signature FROM job_signatures "
+                    f"WHERE job_id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                for job_id, source, signature in cur.fetchall():
+                    found[job_id] = (source, bytes(signature))
+        return found
+
+    def candidates(self, buckets: list[str]) -> dict[str, set[str]]:
+        """Bucket → IDs of the jobs stored in it, for the buckets that are non-empty."""
+        ph = _ph()
+        found: dict[str, set[str]] = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(buckets))):
+                cur.execute(
+                    f"SELECT bucket, job_id FROM lsh_buckets "
+                    f"WHERE bucket IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                for bucket, job_id in cur.fetchall():
+                    found.setdefault(bucket, set()).add(job_id)
+        return found
+
+    def clusters(self, job_ids: list[str]) -> dict[str, str]:
+        """cluster_id of the given jobs that are indexed."""
+        ph = _ph()
+        found = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(job_ids))):
+                cur.execute(
+                    f"SELECT job_id, cluster_id FROM job_clusters "
+                    f"WHERE job_id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                found.update((job_id, cluster_id) for job_id, cluster_id in cur.fetchall())
+        return found
+
+    def cluster_sources(self, cluster_ids: list[str]) -> dict[str, dict[str, str]]:
+        """Members of each of the given clusters: cluster_id → {job_id: source}."""
+        ph = _ph()
+        found: dict[str, dict[str, str]] = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(cluster_ids))):
+                cur.execute(
+                    f"SELECT c.cluster_id, c.job_id, s.source FROM job_clusters c "
+                    f"JOIN job_signatures s ON s.job_id = c.job_id "
+                    f"WHERE c.cluster_id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+                for cluster_id, job_id, source in cur.fetchall():
+                    found.setdefault(cluster_id, {})[job_id] = source
+        return found
+
+    def leading(self, job_ids: list[str]) -> set[str]:
+        """The given jobs that are the canonical job of a cluster with other members."""
+        ph = _ph()
+        found = set()
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(list(dict.fromkeys(job_ids))):
+                cur.execute(
+                    f"SELECT DISTINCT cluster_id FROM job_clusters "
+                    f"WHERE cluster_id IN ({','.join([ph] * len(chunk))}) "
+                    f"AND job_id <> cluster_id",
+                    chunk,
+                )
+                found.update(r[0] for r in cur.fetchall())
+        return found
+
+    def cluster_members(self, job_id: str) -> list[dict]:
+        """Every job in `job_id`'s cluster, canonical first."""
+        ph = _ph()
+        with connection() as conn:
+            cur = _cursor(conn)
+            sql = f"""
+                SELECT c.job_id, c.cluster_id, c.similarity, j.title, j.company,
+                       j.source, j.source_url
+                FROM job_clusters c JOIN jobs j ON j.id = c.job_id
+                WHERE c.cluster_id = (SELECT cluster_id FROM job_clusters WHERE job_id = {ph})
+                ORDER BY c.job_id <> c.cluster_id, c.job_id
+            """
+            if USE_POSTGRES:
+                cur.execute(sql, (job_id,))
+                rows = cur.fetchall()
+            else:
+                rows = conn.execute(sql, (job_id,)).fetchall()
+            return [dict(r) for r in rows]
+
+    def unindexed_job_ids(self, limit: int = 1000) -> list[str]:
+        """Stored jobs that have no signature yet (e.g. saved before dedup existed)."""
+        ph = _ph()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT j.id FROM jobs j
+                LEFT JOIN job_signatures s ON s.job_id = j.id
+                WHERE s.job_id IS NULL
+                ORDER BY j.id
+                LIMIT {ph}
+            """, (limit,))
+            return [r[0] for r in cur.fetchall()]
+
+    def save_many(self, entries: list[tuple[str, str, bytes, list[str], str, float]]) -> None:
+        """
+        Index jobs: (job_id, source, signature, buckets, cluster_id, similarity).
+        A job indexed before is re-bucketed under its new signature.
+        """
+        if not entries:
+            return
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        ids = [job_id for job_id, *_ in entries]
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(ids):
+                cur.execute(
+                    f"DELETE FROM lsh_buckets WHERE job_id IN ({','.join([ph] * len(chunk))})",
+                    chunk,
+                )
+            cur.executemany(
+                f"""
+                INSERT INTO job_signatures (job_id, source, signature, created_at)
+                VALUES ({ph}, {ph}, {ph}, {ph})
+                ON CONFLICT (job_id) DO UPDATE SET
+                    source=EXCLUDED.source,
+                    signature=EXCLUDED.signature,
+                    created_at=EXCLUDED.created_at
+                """,
+                [(job_id, source, sig, now) for job_id, source, sig, *_ in entries],
+            )
+            cur.executemany(
+                f"INSERT INTO lsh_buckets (bucket, job_id) VALUES ({ph}, {ph}) "
+                "ON CONFLICT DO NOTHING",
+                [(b, job_id) for job_id, _, _, buckets, *_ in entries for b in buckets],
+            )
+            cur.executemany(
+                f"""
+                INSERT INTO job_clusters (job_id, cluster_id, similarity, created_at)
+                VALUES ({ph}, {ph}, {ph}, {ph})
+                ON CONFLICT (job_id) DO UPDATE SET
+                    cluster_id=EXCLUDED.cluster_id,
+                    similarity=EXCLUDED.similarity,
+                    created_at=EXCLUDED.created_at
+                """,
+                [(job_id, cluster, sim, now) for job_id, _, _, _, cluster, sim in entries],
+            )
+
+
+class LeaseRepository:
+    """
+    Named leases in the database: one holder at a time across processes,
+    until the lease expires without being renewed.
+    """
+
+    def acquire(self, name: str, holder: str, ttl: float) -> bool:
+        ph = _ph()
+        now = time.time()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                INSERT INTO leases (name, holder, expires_at) VALUES ({ph}, {ph}, {ph})
+                ON CONFLICT (name) DO UPDATE SET
+                    holder=EXCLUDED.holder,
+                    expires_at=EXCLUDED.expires_at
+                WHERE leases.expires_at < {ph} OR leases.holder = EXCLUDED.holder
+            """, (name, holder, now + ttl, now))
+            cur.execute(f"SELECT holder FROM leases WHERE name = {ph}", (name,))
+            row = cur.fetchone()
+        return row is not None and row[0] == holder
+
+    def renew(self, name: str, holder: str, ttl: float) -> bool:
+        """Extend a lease still held by `holder`; False if it was lost."""
+        ph = _ph()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"UPDATE leases SET expires_at = {ph} WHERE name = {ph} AND holder = {ph}",
+                (time.time() + ttl, name, holder),
+            )
+            return cur.rowcount == 1
+
+    def release(self, name: str, holder: str) -> None:
+        ph = _ph()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"DELETE FROM leases WHERE name = {ph} AND holder = {ph}", (name, holder))
+
+    def holder(self, name: str) -> str | None:
+        """Current holder, if the lease is live."""
+        ph = _ph()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT holder FROM leases WHERE name = {ph} AND expires_at >= {ph}",
+                (name, time.time()),
+            )
+            row = cur.fetchone()
+        return row[0] if row else None
+
+
+class IngestRunRepository:
+    """The ingest_runs ledger: one row per ingestion cycle."""
+
+    _JSON_COLUMNS = ("progress", "summary")
+
+    def create(self, run_id: str, trigger: str) -> None:
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"INSERT INTO ingest_runs (id, state, trigger, started_at, heartbeat_at, progress) "
+                f"VALUES ({ph}, 'running', {ph}, {ph}, {ph}, '{{}}')",
+                (run_id, trigger, now, now),
+            )
+
+    def update(self, run_id: str, **fields) -> None:
+        """Set columns of a run; progress/summary are stored as JSON."""
+        if not fields:
+            return
+        ph = _ph()
+        params = [
+            json.dumps(v) if k in self._JSON_COLUMNS and v is not None else v
+            for k, v in fields.items()
+        ]
+        assignments = ", ".join(f"{k} = {ph}" for k in fields)
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"UPDATE ingest_runs SET {assignments} WHERE id = {ph}", (*params, run_id))
+
+    def get(self, run_id: str) -> dict | None:
+        ph = _ph()
+        with connection() as conn:
+            cur = _cursor(conn)
+            sql = f"SELECT * FROM ingest_runs WHERE id = {ph}"
+            if USE_POSTGRES:
+                cur.execute(sql, (run_id,))
+                row = cur.fetchone()
+            else:
+                row = conn.execute(sql, (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        for column in self._JSON_COLUMNS:
+            run[column] = json.loads(run[column]) if run[column] else None
+        return run
+
+    def abandon_stale(self, older_than: str) -> int:
+        """Mark runs whose heartbeat stopped before `older_than` as abandoned."""
+        ph = _ph()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"UPDATE ingest_runs SET state = 'abandoned' "
+                f"WHERE state = 'running' AND heartbeat_at < {ph}",
+                (older_than,),
+            )
+            return cur.rowcount
+
+
+class CheckpointRepository:
+    """Per-company (or per-feed) fetch checkpoints and refresh schedule of each collector."""
+
+    def due(self, source: str, keys: list[str], now: str | None = None) -> list[str]:
+        """
+        The keys whose next_due_at has passed or was never set: never
+        fetched first (in input order), then the longest overdue.
+        """
+        ph = _ph()
+        keys = list(dict.fromkeys(keys))
+        next_due: dict[str, str | None] = {}
+        with connection() as conn:
+            cur = conn.cursor()
+            for chunk in _chunks(keys):
+                cur.execute(
+                    f"SELECT key, next_due_at FROM fetch_checkpoints "
+                    f"WHERE source = {ph} AND key IN ({','.join([ph] * len(chunk))})",
+                    (source, *chunk),
+                )
+                next_due.update((key, at) for key, at in cur.fetchall())
+        now = now or datetime.utcnow().isoformat()
+        due = [k for k in keys if (next_due.get(k) or "") <= now]
+        return sorted(due, key=lambda k: (k in next_due, next_due.get(k) or ""))
+
+    def record(
+        self,
+        source: str,
+        key: str,
+        run_id: str | None,
+        fetched: int = 0,
+        cursor: str | None = None,
+        error: str | None = None,
+        refresh_interval: float | None = None,
+        next_due_at: str | None = None,
+        changed: bool = False,
+    ) -> None:
+        """
+        Record a fetch attempt. A success also stores the schedule; a
+        failure keeps the last success, cursor and schedule, so the
+        company stays due.
+        """
+        ph = _ph()
+        now = datetime.utcnow().isoformat()
+        if error is None:
+            params = (
+                source, key, run_id, "done", fetched, cursor, None, now, now,
+                refresh_interval, next_due_at, now if changed else None,
+            )
+            # An unchanged (304) board has no new cursor: keep the old one
+            keep = """
+                    cursor=COALESCE(EXCLUDED.cursor, fetch_checkpoints.cursor),
+                    succeeded_at=EXCLUDED.succeeded_at,
+                    refresh_interval=EXCLUDED.refresh_interval,
+                    next_due_at=EXCLUDED.next_due_at,
+                    changed_at=COALESCE(EXCLUDED.changed_at, fetch_checkpoints.changed_at),"""
+        else:
+            params = (
+                source, key, run_id, "failed", fetched, None, error, now, None,
+                None, None, None,
+            )
+            keep = ""
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                INSERT INTO fetch_checkpoints
+                    (source, key, run_id, status, fetched, cursor, error,
+                     attempted_at, succeeded_at, refresh_interval, next_due_at,
+                     changed_at)
+                VALUES ({','.join([ph] * 12)})
+                ON CONFLICT (source, key) DO UPDATE SET
+                    run_id=EXCLUDED.run_id,
+                    status=EXCLUDED.status,
+                    fetched=EXCLUDED.fetched,
+                    error=EXCLUDED.error,{keep}
+                    attempted_at=EXCLUDED.attempted_at
+            """, params)
+
+    def get(self, source: str, key: str) -> dict | None:
+        ph = _ph()
+        with connection() as conn:
+            cur = _cursor(conn)
+            sql = f"SELECT * FROM fetch_checkpoints WHERE source = {ph} AND key = {ph}"
+            if USE_POSTGRES:
+                cur.execute(sql, (source, key))
+                row = cur.fetchone()
+            else:
+                row = conn.execute(sql, (source, key)).fetchone()
+        return dict(row) if row else None
+
+    def for_run(self, run_id: str) -> list[dict]:
+        """Checkpoints last written by a run, in the order they were attempted."""
+        ph = _ph()
+        with connection() as conn:
+            cur = _cursor(conn)
+            sql = (
+                f"SELECT source, key, status, fetched, cursor, error, attempted_at, "
+                f"succeeded_at FROM fetch_checkpoints WHERE run_id = {ph} "
+                f"ORDER BY attempted_at, source, key"
+            )
+            if USE_POSTGRES:
+                cur.execute(sql, (run_id,))
+                rows = cur.fetchall()
+            else:
+                rows = conn.execute(sql, (run_id,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def schedule(self, source: str | None = None) -> list[dict]:
+        """Every tracked company's refresh schedule, soonest due first."""
+        ph = _ph()
+        where, params = "", ()
+        if source:
+            where, params = f"WHERE source = {ph}", (source,)
+        with connection() as conn:
+            cur = _cursor(conn)
+            sql = (
+                f"SELECT source, key, status, fetched, error, refresh_interval, "
+                f"next_due_at, succeeded_at, changed_at FROM fetch_checkpoints {where}"
+            )
+            if USE_POSTGRES:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+            else:
+                rows = conn.execute(sql, params).fetchall()
+        # NULL (due now) sorts first on both backends
+        return sorted(
+            (dict(r) for r in rows),
+            key=lambda r: (r["next_due_at"] or "", r["source"], r["key"]),
+        )
@@ -1,13 +1,8 @@
 import logging
 
-from domain.resume import ResumeProfile
 from infrastructure.database import init_db
-from infrastructure.repositories import ApplicationRepository, ProfileRepository
-from services.collectors.greenhouse import GreenhouseCollector
-from services.collectors.lever import LeverCollector
-from services.collectors.rss import RSSCollector
-from services.collectors.remotive import RemotiveCollector
-from workers.ingestion_worker import IngestionWorker
+from infrastructure.repositories import ApplicationRepository
+from workers.ingest_runner import IngestBusy, IngestRun, resolve_targets
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,76 +10,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Fallback resume — used if no profile exists in DB yet
-DEFAULT_RESUME = ResumeProfile(
-    name="Piriyajeishree",
-    skills=[
-        "docker", "terraform", "aws", "python", "github actions",
-        "cloudwatch", "ecs", "ec2", "s3", "iam", "jenkins",
-        "bash", "git", "linux", "postgresql",
-    ],
-    experience_years=2,
-    domains=["SRE", "DevOps", "Cloud"],
-    certifications=["AWS Certified Cloud Practitioner"],
-)
-
-DEFAULT_COMPANIES = [
-    "cloudflare",
-    "datadog",
-    "elastic",
-    "mongodb",
-]
-
 
 def main():
     logger.info("=== ApplyFlow pipeline starting ===")
     init_db()
 
-    # Load profile from DB if available
-    profile_repo = ProfileRepository()
-    profiles = profile_repo.get_all_active()
-
-    if profiles:
-        profile = profiles[0]
-        logger.info(f"Using profile: {profile.name}")
-        resume = ResumeProfile(
-            name=profile.name,
-            skills=profile.skills,
-            experience_years=profile.experience_years,
-            domains=["SRE", "DevOps", "Cloud"],
-            certifications=profile.certifications,
-        )
-        companies = profile.companies if profile.companies else DEFAULT_COMPANIES
-    else:
-        logger.info("No profile found — using defaults")
-        resume = DEFAULT_RESUME
-        companies = DEFAULT_COMPANIES
-
-    logger.info(f"Tracking {len(companies)} companies: {companies}")
-
-    worker = IngestionWorker(
-        collectors=[
-            GreenhouseCollector(companies=companies),
-            RemotiveCollector(),
-            RSSCollector(),
-        ],
-        resume=resume,
-    )
-    summary = worker.run()
-
-    logger.info("=== Pipeline complete ===")
+    # Shares the ingest lease with POST /jobs/ingest, so a scheduled run
+    # never overlaps a manual one
+    run = IngestRun(trigger="schedule")
+    try:
+        run.claim()
+    except IngestBusy as e:
+        logger.warning(f"Ingestion {e.run_id} is already running — skipping this run")
+        return
+    summary = run.execute()
+    if summary is None:
+        logger.error(f"=== Pipeline failed (run {run.id}) ===")
+        raise SystemExit(1)
+
+    logger.info(f"=== Pipeline complete (run {run.id}) ===")
     logger.info(f"  Saved:         {summary['saved']}")
     logger.info(f"  Skipped (dup): {summary['skipped_dup']}")
     logger.info(f"  Failed:        {summary['failed']}")
     logger.info(f"  Total in DB:   {summary['total_in_db']}")
 
-    print("\n── Top 5 matches ──────────────────────────────")
-    for a in ApplicationRepository().get_all()[:5]:
-        print(
-            f"  [{a['match_score']:5.1f}]  {a['company']:15s}  "
-            f"{a['title'][:50]:50s}  {a['status']}"
-        )
+    app_repo = ApplicationRepository()
+    resumes, _ = resolve_targets()
+    for user_id, resume in resumes.items():
+        print(f"\n── Top 5 matches: {resume.name} ──────────────────────")
+        rows, _ = app_repo.search(limit=5, user_id=user_id)
+        for a in rows:
+            print(
+                f"  [{a['match_score']:5.1f}]  {a['company']:15s}  "
+                f"{a['title'][:50]:50s}  {a['status']}"
+            )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
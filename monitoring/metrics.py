@@ -1,68 +1,348 @@
+import atexit
 import logging
 import os
+import sys
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import Protocol, TextIO
 
 logger = logging.getLogger(__name__)
 
 NAMESPACE = "ApplyFlow"
 REGION = os.getenv("AWS_REGION", "us-east-1")
+ENVIRONMENT = os.getenv("METRICS_ENVIRONMENT", "production")
 
-# Only publish metrics when running in AWS (DATABASE_URL set to Postgres)
-_client = None
+# cloudwatch | stdout (StatsD lines) | memory | none
+METRICS_SINK = os.getenv("METRICS_SINK", "cloudwatch")
+# Seconds between background flushes; records only touch memory in between
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "60"))
+# put_metric_data accepts at most 1000 datums per call
+MAX_BATCH = 1000
+# ... and at most 150 distinct values per histogram datum
+MAX_HISTOGRAM_VALUES = 150
 
 
-def _get_client():
+@dataclass
+class Datum:
+    """One aggregated metric: a counter's sum, a gauge's last value or a timing histogram."""
+    name: str
+    kind: str                       # "counter" | "gauge" | "timing"
+    unit: str
+    dimensions: tuple[tuple[str, str], ...] = ()
+    value: float = 0.0
+    values: dict[float, int] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def add(self, value: float) -> None:
+        if self.kind == "counter":
+            self.value += value
+        elif self.kind == "gauge":
+            self.value = value
+        else:
+            value = float(f"{value:.4g}")   # close timings share a bucket
+            self.values[value] = self.values.get(value, 0) + 1
+        self.timestamp = datetime.now(timezone.utc)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) >= MAX_HISTOGRAM_VALUES
+
+
+# ── Sinks ─────────────────────────────────────────────────────────────────────
+
+class Sink(Protocol):
+    def send(self, datums: list[Datum]) -> None:
+        """Deliver one batch (at most MAX_BATCH datums). May raise."""
+        ...
+
+
+class CloudWatchSink:
+    """put_metric_data, one call per batch. Drops batches if boto3 is unavailable."""
+
+    def __init__(self, namespace: str = NAMESPACE, region: str = REGION):
+        self.namespace = namespace
+        self.region = region
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                import boto3
+                self._client = boto3.client("cloudwatch", region_name=self.region)
+            except Exception as e:
+                logger.warning(f"[metrics] CloudWatch client init failed: {e}")
+        return self._client
+
+    @staticmethod
+    def _metric_data(datum: Datum) -> dict:
+        data = {
+            "MetricName": datum.name,
+            "Unit": datum.unit,
+            "Timestamp": datum.timestamp,
+            "Dimensions": [{"Name": k, "Value": v} for k, v in datum.dimensions],
+        }
+        if datum.kind == "timing":
+            data["Values"] = list(datum.values)
+            data["Counts"] = [float(c) for c in datum.values.values()]
+        else:
+            data["Value"] = datum.value
+        return data
+
+    def send(self, datums: list[Datum]) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        client.put_metric_data(
+            Namespace=self.namespace,
+            MetricData=[self._metric_data(d) for d in datums],
+        )
+
+
+class MemorySink:
+    """Keeps every batch; for tests and local runs."""
+
+    def __init__(self):
+        self.batches: list[list[Datum]] = []
+
+    def send(self, datums: list[Datum]) -> None:
+        self.batches.append(list(datums))
+
+    @property
+    def datums(self) -> list[Datum]:
+        return [d for batch in self.batches for d in batch]
+
+    def get(self, name: str) -> Datum | None:
+        """The most recently sent datum called `name`."""
+        return next((d for d in reversed(self.datums) if d.name == name), None)
+
+
+class StdoutSink:
+    """Writes StatsD-style lines (name:value|c, |g, |h) to a stream."""
+
+    TYPES = {"counter": "c", "gauge": "g", "timing": "h"}
+
+    def __init__(self, stream: TextIO | None = None, prefix: str = NAMESPACE):
+        self.stream = stream
+        self.prefix = prefix
+
+    def lines(self, datum: Datum) -> list[str]:
+        tags = ",".join(f"{k}:{v}" for k, v in datum.dimensions)
+        suffix = f"|#{tags}" if tags else ""
+        name = f"{self.prefix}.{datum.name}"
+        kind = self.TYPES[datum.kind]
+        if datum.kind != "timing":
+            return [f"{name}:{datum.value:g}|{kind}{suffix}"]
+        return [
+            f"{name}:{value:g}|{kind}" + (f"|@{1 / count:g}" if count > 1 else "") + suffix
+            for value, count in datum.values.items()
+        ]
+
+    def send(self, datums: list[Datum]) -> None:
+        stream = self.stream or sys.stdout
+        stream.write("".join(line + "\n" for d in datums for line in self.lines(d)))
+        stream.flush()
+
+
+class NullSink:
+    def send(self, datums: list[Datum]) -> None:
+        pass
+
+
+def default_sink() -> Sink:
+    sinks = {"cloudwatch": CloudWatchSink, "stdout": StdoutSink, "memory": MemorySink}
+    return sinks.get(METRICS_SINK, NullSink)()
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+class MetricsClient:
+    """
+    Buffers metrics in memory and flushes them to a sink in batches.
+
+    Recording only updates an aggregate under a lock: counters are summed,
+    gauges keep their last value and timings build a histogram, per name
+    and dimensions, between flushes. A daemon thread flushes every
+    `flush_interval` seconds (sooner once MAX_BATCH datums are waiting);
+    close() — registered with atexit — flushes whatever is left.
+    """
+
+    def __init__(
+        self,
+        sink: Sink | None = None,
+        flush_interval: float = METRICS_FLUSH_INTERVAL,
+        max_batch: int = MAX_BATCH,
+        dimensions: dict[str, str] | None = None,
+    ):
+        self.sink = sink if sink is not None else default_sink()
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.dimensions = dimensions if dimensions is not None else {"Environment": ENVIRONMENT}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer: dict[tuple, Datum] = {}
+        self._full: list[Datum] = []    # histograms that reached MAX_HISTOGRAM_VALUES
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        self.sent = 0
+        self.dropped = 0
+
+    # ── Recording ─────────────────────────────────────────────────────────────
+
+    def increment(self, name: str, value: float = 1, unit: str = "Count", **dimensions) -> None:
+        self._record(name, "counter", unit, value, dimensions)
+
+    def gauge(self, name: str, value: float, unit: str = "None", **dimensions) -> None:
+        self._record(name, "gauge", unit, value, dimensions)
+
+    def timing(self, name: str, value: float, unit: str = "Milliseconds", **dimensions) -> None:
+        self._record(name, "timing", unit, value, dimensions)
+
+    def _record(self, name: str, kind: str, unit: str, value: float, dimensions: dict) -> None:
+        dims = tuple(sorted({**self.dimensions, **dimensions}.items()))
+        key = (name, kind, unit, dims)
+        with self._lock:
+            datum = self._buffer.get(key)
+            if datum is None:
+                datum = self._buffer[key] = Datum(name, kind, unit, dims)
+            datum.add(value)
+            if datum.full:
+                self._full.append(self._buffer.pop(key))
+            pending = len(self._buffer) + len(self._full)
+        self._ensure_started()
+        if pending >= self.max_batch:
+            self._wake.set()
+
+    # ── Flushing ──────────────────────────────────────────────────────────────
+
+    def flush(self) -> int:
+        """Send everything buffered, in batches of at most max_batch. Returns datums sent."""
+        with self._lock:
+            datums = self._full + list(self._buffer.values())
+            self._buffer, self._full = {}, []
+        sent = 0
+        with self._flush_lock:
+            for i in range(0, len(datums), self.max_batch):
+                batch = datums[i:i + self.max_batch]
+                try:
+                    self.sink.send(batch)
+                    sent += len(batch)
+                except Exception as e:
+                    logger.warning(f"[metrics] failed to publish {len(batch)} datums: {e}")
+                    self.dropped += len(batch)
+            self.sent += sent
+        if sent:
+            logger.debug(f"[metrics] published {sent} datums")
+        return sent
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flush thread and flush what is left. Safe to call twice."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+        atexit.unregister(self.close)
+
+
+_client: MetricsClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MetricsClient:
     global _client
     if _client is None:
-        try:
-            import boto3
-            _client = boto3.client("cloudwatch", region_name=REGION)
-        except Exception as e:
-            logger.warning(f"[metrics] CloudWatch client init failed: {e}")
+        with _client_lock:
+            if _client is None:
+                _client = MetricsClient()
     return _client
 
 
-def _publish(metric_name: str, value: float, unit: str = "Count"):
-    """Publish a single metric to CloudWatch. Silently skips if client unavailable."""
-    client = _get_client()
-    if client is None:
-        return
-    try:
-        client.put_metric_data(
-            Namespace=NAMESPACE,
-            MetricData=[{
-                "MetricName": metric_name,
-                "Value": value,
-                "Unit": unit,
-                "Timestamp": datetime.now(timezone.utc),
-                "Dimensions": [{"Name": "Environment", "Value": "production"}],
-            }]
-        )
-        logger.debug(f"[metrics] published {metric_name}={value}")
-    except Exception as e:
-        logger.warning(f"[metrics] failed to publish {metric_name}: {e}")
+def configure(sink: Sink | None = None, **kwargs) -> MetricsClient:
+    """Replace the default client (flushing the old one), e.g. configure(MemorySink())."""
+    global _client
+    with _client_lock:
+        old, _client = _client, MetricsClient(sink=sink, **kwargs)
+    if old is not None:
+        old.close()
+    return _client
 
 
+def flush() -> int:
+    return get_client().flush()
+
+
+def increment(name: str, value: float = 1, unit: str = "Count", **dimensions) -> None:
+    get_client().increment(name, value, unit, **dimensions)
+
+
+def gauge(name: str, value: float, unit: str = "None", **dimensions) -> None:
+    get_client().gauge(name, value, unit, **dimensions)
+
+
+def timing(name: str, value: float, unit: str = "Milliseconds", **dimensions) -> None:
+    get_client().timing(name, value, unit, **dimensions)
+
+
+# ── Pipeline metrics ──────────────────────────────────────────────────────────
+
 def record_jobs_fetched(count: int):
-    _publish("JobsFetched", count)
+    increment("JobsFetched", count)
 
 
 def record_jobs_saved(count: int):
-    _publish("JobsSaved", count)
+    increment("JobsSaved", count)
 
 
 def record_duplicates_skipped(count: int):
-    _publish("DuplicatesSkipped", count)
+    increment("DuplicatesSkipped", count)
 
 
 def record_failures(count: int):
-    _publish("IngestionFailures", count)
+    increment("IngestionFailures", count)
 
 
 def record_ingestion_duration(seconds: float):
-    _publish("IngestionDurationSeconds", seconds, unit="Seconds")
+    timing("IngestionDurationSeconds", seconds, unit="Seconds")
+
+
+def record_collector_fetch(collector: str, seconds: float):
+    timing("CollectorFetchSeconds", seconds, unit="Seconds", Collector=collector)
+
+
+def record_parse_cache_hits(count: int):
+    increment("ParseCacheHits", count)
+
+
+def record_parse_cache_misses(count: int):
+    increment("ParseCacheMisses", count)
+
+
+def record_db_pool(stats: dict):
+    """Connection-pool gauges from infrastructure.database.pool_stats()."""
+    gauge("DbPoolInUse", stats["in_use"], unit="Count")
+    gauge("DbPoolCheckouts", stats["checkouts"], unit="Count")
+    gauge("DbPoolAvgWaitMs", stats["avg_wait_ms"], unit="Milliseconds")
+    gauge("DbPoolAvgCheckoutMs", stats["avg_checkout_ms"], unit="Milliseconds")
 
 
 def record_last_successful_run():
-    """Publish a heartbeat metric — used to detect staleness."""
-    _publish("LastSuccessfulRun", 1)
\ No newline at end of file
+    """Heartbeat metric — used to detect staleness."""
+    increment("LastSuccessfulRun", 1)
@@ -1,12 +1,106 @@
+import asyncio
+import logging
+from abc import ABC
+from collections.abc import AsyncIterator, Iterator
+from typing import TYPE_CHECKING, Protocol
 
-from abc import ABC, abstractmethod
 from domain.job import Job
 
+if TYPE_CHECKING:
+    from services.collectors.http import HttpClient
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoints(Protocol):
+    """Where a collector's per-company (or per-feed) fetch progress is kept."""
+
+    def due(self, keys: list[str]) -> list[str]:
+        """The keys to fetch this run, in the order to fetch them (blocking)."""
+        ...
+
+    async def record(
+        self, key: str, job_ids: list[str], cursor: str | None = None, error: str | None = None
+    ) -> None:
+        """Called once a key's jobs (`job_ids`) have all been yielded, or it failed."""
+        ...
+
 
 class JobCollector(ABC):
-    """All collectors must implement this interface."""
+    """
+    All collectors must implement this interface.
+
+    Collectors implement aiter_jobs(http) and yield jobs as they arrive;
+    the runtime (services.collectors.runtime) runs them all concurrently
+    on one shared HttpClient. iter_jobs() and fetch() are blocking
+    wrappers for callers outside an event loop. Older collectors that only
+    override iter_jobs() or fetch() still work: aiter_jobs() then runs
+    them in a thread.
+
+    With `checkpoints` set (the ingestion worker does), collectors fetch
+    only the companies or feeds that are due, and report each one after
+    yielding its jobs, so an interrupted cycle can resume.
+    """
+
+    http: "HttpClient | None" = None
+    checkpoints: Checkpoints | None = None
+
+    async def _due(self, keys: list[str]) -> list[str]:
+        if self.checkpoints is None:
+            return keys
+        try:
+            return await asyncio.to_thread(self.checkpoints.due, keys)
+        except Exception as e:
+            logger.warning(f"[collectors] {type(self).__name__}: checkpoint lookup failed — {e}")
+            return keys
+
+    async def _checkpoint(
+        self, key: str, jobs: list[Job], cursor: str | None = None, error: str | None = None
+    ) -> None:
+        if self.checkpoints is not None:
+            await self.checkpoints.record(
+                key, [job.id for job in jobs], cursor=cursor, error=error
+            )
+
+    async def _unstored(self, jobs: list[Job]) -> list[Job]:
+        """
+        The jobs of a re-served (304) body that are not in the database.
+        Validators are cached when the body arrives, so jobs lost after
+        that (a failed detail fetch, parse or persist) must not be skipped.
+        """
+        from infrastructure.repositories import JobRepository
+        try:
+            known = await asyncio.to_thread(
+                JobRepository().source_versions, [job.id for job in jobs]
+            )
+        except Exception as e:
+            logger.warning(f"[collectors] {type(self).__name__}: known-ID check failed — {e}")
+            return jobs
+        return [job for job in jobs if job.id not in known]
+
+    async def aiter_jobs(self, http: "HttpClient") -> AsyncIterator[Job]:
+        """Yield jobs from the source as they are collected."""
+        if type(self).iter_jobs is JobCollector.iter_jobs and type(self).fetch is JobCollector.fetch:
+            raise NotImplementedError(
+                f"{type(self).__name__} must implement aiter_jobs(), iter_jobs() or fetch()"
+            )
+        it = iter(self.iter_jobs())
+        done = object()
+        while (job := await asyncio.to_thread(next, it, done)) is not done:
+            yield job
+
+    def iter_jobs(self) -> Iterator[Job]:
+        """Blocking iteration over aiter_jobs() (or fetch(), for old collectors)."""
+        if type(self).aiter_jobs is JobCollector.aiter_jobs:
+            if type(self).fetch is JobCollector.fetch:
+                raise NotImplementedError(
+                    f"{type(self).__name__} must implement aiter_jobs(), iter_jobs() or fetch()"
+                )
+            yield from self.fetch()
+            return
+        from services.collectors.runtime import iter_sync
+        yield from iter_sync(self, http=self.http)
 
-    @abstractmethod
     def fetch(self) -> list[Job]:
         """Fetch jobs from the source and return a list of Job objects."""
-        ...
\ No newline at end of file
+        return list(self.iter_jobs())
@@ -1,13 +1,16 @@
+import asyncio
 import hashlib
 import html
 import logging
+import os
 import re
-import time
-
-import requests
+from collections.abc import AsyncIterator
 
 from domain.job import Job
+from infrastructure.repositories import JobRepository
 from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, HttpResponse, default_cache
+from services.collectors.ratelimit import limiter_for
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,12 @@ DEFAULT_COMPANIES = [
 GREENHOUSE_LIST_API   = "https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
 GREENHOUSE_DETAIL_API = "https://boards-api.greenhouse.io/v1/boards/{company}/jobs/{job_id}"
 
+# Requests in flight to Greenhouse at once, across boards and detail pages.
+# CONCURRENCY=1 restores the sequential, fixed-delay behaviour; otherwise
+# requests also share a per-host token bucket.
+GREENHOUSE_CONCURRENCY = int(os.getenv("GREENHOUSE_CONCURRENCY", "8"))
+GREENHOUSE_RATE_PER_SEC = float(os.getenv("GREENHOUSE_RATE_PER_SEC", "10"))
+
 # Relevant role keywords — only fetch full description for these
 RELEVANT_KEYWORDS = [
     "sre", "devops", "cloud", "infrastructure", "platform",
@@ -40,42 +49,141 @@ def _strip_html(raw: str) -> str:
     return TAG_RE.sub(" ", unescaped).strip()
 
 
+def _job_id(company: str, title: str) -> str:
+    return hashlib.md5(f"greenhouse-{company}-{title}".encode()).hexdigest()
+
+
 class GreenhouseCollector(JobCollector):
-    def __init__(self, companies: list[str] = None, delay: float = 0.5):
+    def __init__(
+        self,
+        companies: list[str] = None,
+        delay: float = 0.5,
+        concurrency: int = GREENHOUSE_CONCURRENCY,
+        rate_per_sec: float = GREENHOUSE_RATE_PER_SEC,
+        http: HttpClient | None = None,
+        skip_unchanged: bool = True,
+        job_repo: JobRepository | None = None,
+        skip_known: bool = True,
+    ):
         self.companies = companies or DEFAULT_COMPANIES
         self.delay = delay
-
-    def fetch(self) -> list[Job]:
-        jobs = []
-        for company in self.companies:
-            try:
-                fetched = self._fetch_company(company)
-                logger.info(f"[greenhouse] {company}: fetched {len(fetched)} relevant jobs")
-                jobs.extend(fetched)
-            except Exception as e:
-                logger.error(f"[greenhouse] {company}: failed — {e}")
-            time.sleep(self.delay)
-        return jobs
-
-    def _fetch_company(self, company: str) -> list[Job]:
+        self.concurrency = max(1, concurrency)
+        self.limiter = (
+            limiter_for(GREENHOUSE_LIST_API, rate_per_sec)
+            if self.concurrency > 1 else None
+        )
+        self.http = http or HttpClient(cache=default_cache())
+        # A board whose listing answers 304 only re-fetches postings never stored
+        self.skip_unchanged = skip_unchanged
+        # Listings already stored with the same updated_at need no detail fetch
+        self.job_repo = job_repo or JobRepository()
+        self.skip_known = skip_known
+        self.skipped_known = 0
+
+    async def _get(self, http: HttpClient, url: str) -> HttpResponse:
+        if self.limiter:
+            await self.limiter.acquire_async()
+        return await http.get(url)
+
+    async def aiter_jobs(self, http: HttpClient) -> AsyncIterator[Job]:
+        companies = await self._due(self.companies)
+        if self.concurrency == 1:
+            for company in companies:
+                _, jobs, cursor, error = await self._fetch_company(http, company)
+                for job in jobs:
+                    yield job
+                await self._checkpoint(company, jobs, cursor=cursor, error=error)
+                await asyncio.sleep(self.delay)
+            return
+
+        # Boards are fetched concurrently; the shared client keeps at most
+        # `concurrency` requests in flight to the Greenhouse host
+        http.limit_host(GREENHOUSE_LIST_API, self.concurrency)
+        tasks = [
+            asyncio.create_task(self._fetch_company(http, company))
+            for company in companies
+        ]
+        try:
+            for done in asyncio.as_completed(tasks):
+                company, jobs, cursor, error = await done
+                for job in jobs:
+                    yield job
+                await self._checkpoint(company, jobs, cursor=cursor, error=error)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_company(
+        self, http: HttpClient, company: str
+    ) -> tuple[str, list[Job], str | None, str | None]:
+        """
+        (company, jobs, cursor, error); the cursor is the newest listing
+        updated_at. Failed detail fetches are reported as the company's
+        error, keeping it due so the lost postings are fetched again.
+        """
+        try:
+            jobs, cursor, lost = await self._company_jobs(http, company)
+        except Exception as e:
+            logger.error(f"[greenhouse] {company}: failed — {e}")
+            return company, [], None, str(e)
+        logger.info(f"[greenhouse] {company}: fetched {len(jobs)} relevant jobs")
+        if lost:
+            return company, jobs, cursor, f"{lost} of {len(jobs) + lost} job details not fetched"
+        return company, jobs, cursor, None
+
+    async def _company_jobs(
+        self, http: HttpClient, company: str
+    ) -> tuple[list[Job], str | None, int]:
+        """(jobs, cursor, number of detail fetches that failed)."""
         url = GREENHOUSE_LIST_API.format(company=company)
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
+        resp = await self._get(http, url)
         items = resp.json().get("jobs", [])
+        cursor = max((i.get("updated_at") or "" for i in items), default="") or None
 
         # Pre-filter by title relevance before fetching descriptions
         relevant = [i for i in items if _is_relevant(i.get("title", ""))]
-        logger.info(f"[greenhouse] {company}: {len(items)} total → {len(relevant)} relevant")
+        # A 304 re-serves the cached listing: only postings that never got
+        # stored (failed detail fetch or persist) are fetched again
+        if self.skip_known or (resp.unchanged and self.skip_unchanged):
+            fresh = await asyncio.to_thread(self._new_or_updated, company, relevant)
+            self.skipped_known += len(relevant) - len(fresh)
+            logger.info(
+                f"[greenhouse] {company}: {len(items)} total → {len(relevant)} relevant "
+                f"→ {len(fresh)} new or updated"
+            )
+            relevant = fresh
+        else:
+            logger.info(f"[greenhouse] {company}: {len(items)} total → {len(relevant)} relevant")
+
+        if self.concurrency > 1:
+            details = await asyncio.gather(
+                *(self._fetch_detail(http, item, company) for item in relevant)
+            )
+            jobs = [job for job in details if job]
+            return jobs, cursor, len(relevant) - len(jobs)
 
         jobs = []
         for item in relevant:
-            job = self._fetch_detail(item, company)
+            job = await self._fetch_detail(http, item, company)
             if job:
                 jobs.append(job)
-            time.sleep(self.delay)
-        return jobs
+            await asyncio.sleep(self.delay)
+        return jobs, cursor, len(relevant) - len(jobs)
 
-    def _fetch_detail(self, item: dict, company: str) -> Job | None:
+    def _new_or_updated(self, company: str, items: list[dict]) -> list[dict]:
+        """Listings not yet stored, or stored with a different updated_at."""
+        ids = [_job_id(company, item.get("title", "")) for item in items]
+        try:
+            known = self.job_repo.source_versions(ids)
+        except Exception as e:
+            logger.warning(f"[greenhouse] {company}: known-ID check failed — {e}")
+            return items
+        return [
+            item for item, job_id in zip(items, ids)
+            if job_id not in known or known[job_id] != item.get("updated_at")
+        ]
+
+    async def _fetch_detail(self, http: HttpClient, item: dict, company: str) -> Job | None:
         try:
             gh_id   = item["id"]
             title   = item.get("title", "")
@@ -84,17 +192,12 @@ class GreenhouseCollector(JobCollector):
 
             # Fetch full description
             detail_url = GREENHOUSE_DETAIL_API.format(company=company, job_id=gh_id)
-            resp = requests.get(detail_url, timeout=10)
-            resp.raise_for_status()
-            detail = resp.json()
+            detail = (await self._get(http, detail_url)).json()
             raw_html = detail.get("content", "")
             description = _strip_html(raw_html)
 
-            raw = f"greenhouse-{company}-{title}"
-            job_id = hashlib.md5(raw.encode()).hexdigest()
-
             return Job(
-                id=job_id,
+                id=_job_id(company, title),
                 title=title,
                 company=company,
                 location=location,
@@ -104,6 +207,7 @@ class GreenhouseCollector(JobCollector):
                 source="greenhouse",
                 source_url=list_url,
                 remote="remote" in location.lower(),
+                source_updated_at=item.get("updated_at"),
             )
         except Exception as e:
             logger.warning(f"[greenhouse] detail fetch failed for {item.get('id')}: {e}")
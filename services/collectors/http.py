@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from services.collectors.ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# On-disk response cache shared by the collectors. Set HTTP_CACHE_DIR to
+# an empty string to turn it off.
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", str(7 * 24 * 3600)))   # seconds
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Shared client sizing: total keep-alive connections, and how many
+# requests may be in flight to any one host by default
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "64"))
+HTTP_PER_HOST = int(os.getenv("HTTP_PER_HOST", "8"))
+
+# Statuses worth retrying: rate limited, or a server-side hiccup
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    body: bytes = field(repr=False, default=b"")
+
+
+class ResponseCache:
+    """
+    Bodies and validators (ETag / Last-Modified) of past responses, one
+    pair of files per URL. Entries older than `ttl` are dropped; when the
+    bodies exceed `max_bytes` the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        ttl: float = HTTP_CACHE_TTL,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ):
+        self.directory = Path(directory if directory is not None else HTTP_CACHE_DIR)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: int | None = None   # bytes of bodies on disk, once scanned
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, url: str) -> CacheEntry | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        if time.time() - meta["stored_at"] > self.ttl:
+            self._remove(meta_path, body_path)
+            return None
+        os.utime(body_path)  # mark as recently used for eviction
+        return CacheEntry(url, meta.get("etag"), meta.get("last_modified"), meta["stored_at"], body)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        # Write-then-rename so readers never see a half-written file
+        tmp = path.with_suffix(path.suffix + f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        meta_path, _ = self._paths(entry.url)
+        self._write(meta_path, json.dumps({
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "stored_at": entry.stored_at,
+        }).encode())
+
+    def put(self, entry: CacheEntry) -> None:
+        _, body_path = self._paths(entry.url)
+        with self._lock:
+            if self._total is None:
+                self._total = self.size()
+            try:
+                self._total -= body_path.stat().st_size
+            except FileNotFoundError:
+                pass
+            self._total += len(entry.body)
+            self._write(body_path, entry.body)
+            self._write_meta(entry)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Restart the TTL of an entry the server just confirmed (304)."""
+        entry.stored_at = time.time()
+        self._write_meta(entry)
+
+    def _remove(self, *paths: Path) -> None:
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        bodies = []
+        for body_path in self.directory.glob("*.body"):
+            try:
+                stat = body_path.stat()
+            except FileNotFoundError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, body_path))
+        total = sum(size for _, size, _ in bodies)
+        for _, size, body_path in sorted(bodies):
+            if total <= self.max_bytes:
+                break
+            self._remove(body_path, body_path.with_suffix(".json"))
+            total -= size
+        self._total = total
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.body"))
+
+
+def default_cache() -> ResponseCache | None:
+    return ResponseCache() if HTTP_CACHE_DIR else None
+
+
+class HttpStatusError(Exception):
+    """Raised for a 4xx/5xx response (after retries, for retryable ones)."""
+
+    def __init__(self, url: str, status_code: int):
+        super().__init__(f"HTTP {status_code} for {url}")
+        self.url = url
+        self.status_code = status_code
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status_code: int
+    content: bytes = field(repr=False)
+    unchanged: bool = False     # server answered 304; content is the cached body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpClient:
+    """
+    One pooled HTTP/1.1 keep-alive client shared by the collectors, used as
+    `async with client:` inside an event loop.
+
+    - Requests to one host are capped by a per-host semaphore (HTTP_PER_HOST
+      unless set with limit_host()) and optionally a token bucket (rate_host()).
+    - 429 / 5xx responses and transport errors are retried up to `retries`
+      times with full-jitter exponential backoff; Retry-After is honoured.
+    - A cached URL is requested with If-None-Match / If-Modified-Since; a
+      304 returns the cached body with `unchanged=True`.
+    - Other 4xx/5xx raise HttpStatusError.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        timeout: float = 10,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        per_host: int = HTTP_PER_HOST,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        transport=None,          # httpx transport override, for tests
+    ):
+        self.cache = cache
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.transport = transport
+        self._host_limits: dict[str, int] = {}
+        self._host_rates: dict[str, TokenBucket] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._client = None
+        self._depth = 0
+        self.not_modified = 0
+        self.retried = 0
+
+    def limit_host(self, url: str, limit: int) -> None:
+        """Cap concurrent requests to the URL's host."""
+        self._host_limits[urlsplit(url).netloc] = max(1, limit)
+
+    def rate_host(self, url: str, bucket: TokenBucket) -> None:
+        """Pace requests to the URL's host through a token bucket."""
+        self._host_rates[urlsplit(url).netloc] = bucket
+
+    async def __aenter__(self) -> "HttpClient":
+        # Re-entrant: collectors may open a client the runtime already opened
+        if self._depth == 0:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+                follow_redirects=True,
+            )
+            self._semaphores = {}
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            await self._client.aclose()
+            self._client = None
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(
+                self._host_limits.get(host, self.per_host)
+            )
+        return sem
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def get(self, url: str, timeout: float | None = None) -> HttpResponse:
+        import httpx
+        if self._client is None:
+            raise RuntimeError("HttpClient used outside `async with`")
+        host = urlsplit(url).netloc
+        entry = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        attempt = 0
+        while True:
+            retry_after = None
+            async with self._semaphore(host):
+                if host in self._host_rates:
+                    await self._host_rates[host].acquire_async()
+                try:
+                    resp = await self._client.get(
+                        url, headers=headers, timeout=timeout or self.timeout
+                    )
+                except httpx.TransportError as e:
+                    if attempt >= self.retries:
+                        raise
+                    error = e
+                else:
+                    if resp.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                        break
+                    error = HttpStatusError(url, resp.status_code)
+                    retry_after = resp.headers.get("Retry-After")
+            delay = self._delay(attempt, retry_after)
+            logger.info(f"[http] {url}: {error}, retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            self.retried += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if resp.status_code == 304 and entry:
+            self.not_modified += 1
+            await asyncio.to_thread(self.cache.touch, entry)
+            return HttpResponse(url, 304, entry.body, unchanged=True)
+        if resp.status_code >= 400:
+            raise HttpStatusError(url, resp.status_code)
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.cache and (etag or last_modified):
+            try:
+                await asyncio.to_thread(
+                    self.cache.put,
+                    CacheEntry(url, etag, last_modified, time.time(), resp.content),
+                )
+            except OSError as e:
+                logger.warning(f"[http] caching {url} failed — {e}")
+        return HttpResponse(url, resp.status_code, resp.content)
@@ -1,13 +1,13 @@
+import asyncio
 import hashlib
 import html
 import logging
 import re
-import time
-
-import requests
+from collections.abc import AsyncIterator
 
 from domain.job import Job
 from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, HttpStatusError, default_cache
 
 logger = logging.getLogger(__name__)
 
@@ -47,44 +47,64 @@ def _strip_html(raw: str) -> str:
 
 
 class LeverCollector(JobCollector):
-    def __init__(self, companies: list[str] = None, delay: float = 0.5):
+    def __init__(
+        self,
+        companies: list[str] = None,
+        timeout: float = 30,
+        http: HttpClient | None = None,
+        skip_unchanged: bool = True,
+    ):
         self.companies = companies or DEFAULT_COMPANIES
-        self.delay = delay
-
-    def fetch(self) -> list[Job]:
-        jobs = []
-        for company in self.companies:
-            try:
-                fetched = self._fetch_company(company)
+        self.timeout = timeout
+        self.http = http or HttpClient(cache=default_cache())
+        self.skip_unchanged = skip_unchanged
+
+    async def aiter_jobs(self, http: HttpClient) -> AsyncIterator[Job]:
+        tasks = [
+            asyncio.create_task(self._fetch_company(http, company))
+            for company in await self._due(self.companies)
+        ]
+        try:
+            for done in asyncio.as_completed(tasks):
+                company, fetched, cursor, error = await done
                 if fetched:
                     logger.info(f"[lever] {company}: fetched {len(fetched)} relevant jobs")
-                    jobs.extend(fetched)
-            except Exception as e:
-                logger.error(f"[lever] {company}: failed — {e}")
-            time.sleep(self.delay)
-        return jobs
-
-    def _fetch_company(self, company: str) -> list[Job]:
+                    for job in fetched:
+                        yield job
+                await self._checkpoint(company, fetched, cursor=cursor, error=error)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_company(
+        self, http: HttpClient, company: str
+    ) -> tuple[str, list[Job], str | None, str | None]:
+        """(company, jobs, cursor, error). Timeouts and 429/5xx are retried by the shared client."""
         url = LEVER_API.format(company=company)
-        for attempt in range(3):
-            try:
-                resp = requests.get(url, timeout=30)
-                if resp.status_code == 404:
-                    return []
-                resp.raise_for_status()
-                items = resp.json()
-                jobs = []
-                for item in items:
-                    if not _is_relevant(item.get("text", "")):
-                        continue
-                    job = self._parse(item, company)
-                    if job:
-                        jobs.append(job)
-                return jobs
-            except requests.exceptions.Timeout:
-                logger.warning(f"[lever] {company}: timeout attempt {attempt+1}/3")
-                time.sleep(2 ** attempt)
-        return []
+        try:
+            resp = await http.get(url, timeout=self.timeout)
+        except HttpStatusError as e:
+            if e.status_code == 404:
+                return company, [], None, None   # no Lever board
+            logger.error(f"[lever] {company}: failed — {e}")
+            return company, [], None, str(e)
+        except Exception as e:
+            logger.error(f"[lever] {company}: failed — {e}")
+            return company, [], None, str(e)
+        items = resp.json()
+        # Newest posting change (epoch ms) on the board
+        newest = max((i.get("updatedAt") or i.get("createdAt") or 0 for i in items), default=0)
+        jobs = []
+        for item in items:
+            if not _is_relevant(item.get("text", "")):
+                continue
+            job = self._parse(item, company)
+            if job:
+                jobs.append(job)
+        if resp.unchanged and self.skip_unchanged:
+            jobs = await self._unstored(jobs)
+            logger.info(f"[lever] {company}: unchanged since last fetch, {len(jobs)} not stored yet")
+        return company, jobs, str(newest) if newest else None, None
 
     def _parse(self, item: dict, company: str) -> Job | None:
         try:
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill continuously at `rate` per
+    second up to `capacity`; acquire() blocks until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """acquire() for event-loop code: waits without blocking the loop."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+_buckets: dict[tuple[str, float, float | None], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def limiter_for(url: str, rate: float, capacity: float | None = None) -> TokenBucket:
+    """
+    Return the process-wide bucket for the URL's host at this rate, creating
+    it on first use. Callers asking for a different rate get their own bucket
+    rather than silently sharing the first caller's.
+    """
+    key = (urlsplit(url).netloc or url, rate, capacity)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, capacity)
+        return bucket
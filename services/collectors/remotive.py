@@ -2,15 +2,16 @@ import hashlib
 import html
 import logging
 import re
-
-import requests
+from collections.abc import AsyncIterator
 
 from domain.job import Job
 from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, default_cache
 
 logger = logging.getLogger(__name__)
 
 REMOTIVE_API = "https://remotive.com/api/remote-jobs"
+REMOTIVE_KEY = "remote-jobs"   # the one checkpoint key: the whole board is one request
 TAG_RE = re.compile(r"<[^>]+>")
 
 # Categories that map to SRE/DevOps/Cloud roles
@@ -38,28 +39,38 @@ def _strip_html(raw: str) -> str:
 
 
 class RemotiveCollector(JobCollector):
-    def fetch(self) -> list[Job]:
+    def __init__(self, http: HttpClient | None = None, skip_unchanged: bool = True):
+        self.http = http or HttpClient(cache=default_cache())
+        self.skip_unchanged = skip_unchanged
+
+    async def aiter_jobs(self, http: HttpClient) -> AsyncIterator[Job]:
+        if not await self._due([REMOTIVE_KEY]):
+            return
         try:
-            resp = requests.get(REMOTIVE_API, timeout=10)
-            resp.raise_for_status()
+            resp = await http.get(REMOTIVE_API)
             jobs_raw = resp.json().get("jobs", [])
-
-            jobs = []
-            for item in jobs_raw:
-                title = item.get("title", "")
-                category = item.get("category", "")
-                if not _is_relevant(title, category):
-                    continue
-                job = self._parse(item)
-                if job:
-                    jobs.append(job)
-
-            logger.info(f"[remotive] fetched {len(jobs)} relevant jobs")
-            return jobs
-
         except Exception as e:
             logger.error(f"[remotive] failed — {e}")
-            return []
+            await self._checkpoint(REMOTIVE_KEY, [], error=str(e))
+            return
+
+        jobs = []
+        for item in jobs_raw:
+            title = item.get("title", "")
+            category = item.get("category", "")
+            if not _is_relevant(title, category):
+                continue
+            job = self._parse(item)
+            if job:
+                jobs.append(job)
+        if resp.unchanged and self.skip_unchanged:
+            jobs = await self._unstored(jobs)
+            logger.info(f"[remotive] unchanged since last fetch, {len(jobs)} not stored yet")
+
+        for job in jobs:
+            yield job
+        logger.info(f"[remotive] fetched {len(jobs)} relevant jobs")
+        await self._checkpoint(REMOTIVE_KEY, jobs)
 
     def _parse(self, item: dict) -> Job | None:
         try:
@@ -1,13 +1,14 @@
+import asyncio
 import hashlib
 import html
 import logging
 import re
 import xml.etree.ElementTree as ET
-
-import requests
+from collections.abc import AsyncIterator
 
 from domain.job import Job
 from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, default_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,23 +46,38 @@ def _strip_html(raw: str) -> str:
 
 
 class RSSCollector(JobCollector):
-    def __init__(self, feeds: list[dict] = None):
+    def __init__(
+        self,
+        feeds: list[dict] = None,
+        http: HttpClient | None = None,
+        skip_unchanged: bool = True,
+    ):
         self.feeds = feeds or RSS_FEEDS
+        self.http = http or HttpClient(cache=default_cache())
+        self.skip_unchanged = skip_unchanged
 
-    def fetch(self) -> list[Job]:
-        jobs = []
-        for feed in self.feeds:
-            try:
-                fetched = self._fetch_feed(feed)
-                logger.info(f"[rss] {feed['name']}: fetched {len(fetched)} jobs")
-                jobs.extend(fetched)
-            except Exception as e:
-                logger.error(f"[rss] {feed['name']}: failed — {e}")
-        return jobs
-
-    def _fetch_feed(self, feed: dict) -> list[Job]:
-        resp = requests.get(feed["url"], timeout=10)
-        resp.raise_for_status()
+    async def aiter_jobs(self, http: HttpClient) -> AsyncIterator[Job]:
+        by_name = {feed["name"]: feed for feed in self.feeds}
+        feeds = [by_name[name] for name in await self._due(list(by_name))]
+        tasks = [asyncio.create_task(self._fetch_feed(http, feed)) for feed in feeds]
+        try:
+            for feed, task in zip(feeds, tasks):
+                try:
+                    fetched = await task
+                    logger.info(f"[rss] {feed['name']}: fetched {len(fetched)} jobs")
+                except Exception as e:
+                    logger.error(f"[rss] {feed['name']}: failed — {e}")
+                    await self._checkpoint(feed["name"], [], error=str(e))
+                    continue
+                for job in fetched:
+                    yield job
+                await self._checkpoint(feed["name"], fetched)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_feed(self, http: HttpClient, feed: dict) -> list[Job]:
+        resp = await http.get(feed["url"])
         root = ET.fromstring(resp.content)
 
         jobs = []
@@ -72,6 +88,9 @@ class RSSCollector(JobCollector):
             job = self._parse(item, feed["name"])
             if job:
                 jobs.append(job)
+        if resp.unchanged and self.skip_unchanged:
+            jobs = await self._unstored(jobs)
+            logger.info(f"[rss] {feed['name']}: unchanged since last fetch, {len(jobs)} not stored yet")
         return jobs
 
     def _parse(self, item, source_name: str) -> Job | None:
@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import inspect
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+from domain.job import Job
+from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, default_cache
+
+logger = logging.getLogger(__name__)
+
+# Overall wall-clock budget for one collection run, in seconds (0 = none).
+# Whatever was collected when it runs out is kept; the rest is cancelled.
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "0"))
+
+
+def default_client() -> HttpClient:
+    return HttpClient(cache=default_cache())
+
+
+async def _with_deadline(coro, deadline: float | None):
+    if not deadline:
+        return await coro
+    async with asyncio.timeout(deadline):
+        return await coro
+
+
+async def _maybe_await(result) -> None:
+    if inspect.isawaitable(result):
+        await result
+
+
+async def run_collectors(
+    collectors: list[JobCollector],
+    on_job: Callable[[JobCollector, Job], object],
+    on_done: Callable[[JobCollector, int, float, BaseException | None], object],
+    http: HttpClient | None = None,
+    deadline: float | None = FETCH_DEADLINE,
+) -> None:
+    """
+    Run every collector concurrently on one shared HttpClient.
+
+    on_job(collector, job) is called for each job and on_done(collector,
+    fetched, elapsed, error) exactly once per collector; either may return
+    an awaitable, which is awaited (so a full queue applies backpressure).
+    After `deadline` seconds the collectors still running are cancelled and
+    finish with a TimeoutError; jobs they already emitted are kept.
+    """
+    http = http or default_client()
+    start = time.monotonic()
+    fetched = dict.fromkeys(map(id, collectors), 0)
+    reported: set[int] = set()
+
+    async def done(collector: JobCollector, error: BaseException | None) -> None:
+        reported.add(id(collector))
+        await _maybe_await(
+            on_done(collector, fetched[id(collector)], time.monotonic() - start, error)
+        )
+
+    async def one(collector: JobCollector) -> None:
+        try:
+            async for job in collector.aiter_jobs(http):
+                fetched[id(collector)] += 1
+                await _maybe_await(on_job(collector, job))
+        except asyncio.CancelledError:
+            await done(collector, TimeoutError("fetch deadline exceeded"))
+            raise
+        except Exception as e:
+            await done(collector, e)
+        else:
+            await done(collector, None)
+
+    async def all_collectors():
+        async with http:
+            await asyncio.gather(*(one(c) for c in collectors))
+
+    error: BaseException | None = None
+    try:
+        await _with_deadline(all_collectors(), deadline)
+    except TimeoutError as e:
+        logger.warning(f"[collectors] fetch deadline of {deadline:.0f}s reached")
+        error = e
+    except Exception as e:
+        logger.error(f"[collectors] run failed — {e}")
+        error = e
+    # Collectors cancelled before they started still get their on_done
+    for collector in collectors:
+        if id(collector) not in reported:
+            await done(collector, error or TimeoutError("fetch deadline exceeded"))
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+def iter_sync(
+    collector: JobCollector,
+    http: HttpClient | None = None,
+    deadline: float | None = FETCH_DEADLINE,
+    maxsize: int = 256,
+) -> Iterator[Job]:
+    """
+    Blocking adapter over collector.aiter_jobs(): runs it on a private event
+    loop in a background thread and yields jobs as they arrive. Closing the
+    iterator early cancels the collection.
+    """
+    out: queue.Queue = queue.Queue(maxsize=maxsize)
+    http = http or default_client()
+    state: dict = {}
+
+    async def pump():
+        state["task"] = asyncio.current_task()
+        state["loop"] = asyncio.get_running_loop()
+
+        async def collect():
+            async with http:
+                async for job in collector.aiter_jobs(http):
+                    while True:
+                        try:
+                            out.put_nowait(job)
+                            break
+                        except queue.Full:
+                            await asyncio.sleep(0.01)
+
+        try:
+            await _with_deadline(collect(), deadline)
+        except TimeoutError:
+            logger.warning(
+                f"[collectors] {type(collector).__name__}: fetch deadline of {deadline:.0f}s reached"
+            )
+
+    def run():
+        try:
+            asyncio.run(pump())
+            out.put(_DONE)
+        except asyncio.CancelledError:
+            out.put(_DONE)
+        except BaseException as e:
+            out.put(_Failed(e))
+
+    thread = threading.Thread(
+        target=run, name=f"collect-{type(collector).__name__}", daemon=True
+    )
+    thread.start()
+    finished = False
+    try:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                finished = True
+                return
+            if isinstance(item, _Failed):
+                finished = True
+                raise item.error
+            yield item
+    finally:
+        if not finished:
+            # Closed early: cancel the collection, and drain so the thread's
+            # final put on a full queue can't block it
+            if "loop" in state:
+                with contextlib.suppress(RuntimeError):   # loop already closed
+                    state["loop"].call_soon_threadsafe(state["task"].cancel)
+            while thread.is_alive():
+                try:
+                    out.get(timeout=0.05)
+                except queue.Empty:
+                    pass
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import os
+import re
+from typing import TYPE_CHECKING
+
+from domain.job import Job
+from infrastructure.repositories import DedupRepository, JobRepository
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Jobs from different sources whose estimated Jaccard similarity (over
+# word shingles of title + description) reaches this are one role
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+# 128 hash functions split into 16 bands of 8 rows: pairs at 0.8
+# similarity share a bucket ~95% of the time, pairs at 0.5 ~6%
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_WORDS = 5
+
+# Too little text to tell postings apart; indexed but never clustered
+MIN_WORDS = 20
+
+_PRIME = 4294967291  # largest prime below 2**32; keeps a*x+b inside uint64
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercased words, punctuation and markup leftovers dropped."""
+    return _WORD_RE.findall((text or "").lower())
+
+
+def shingles(words: list[str], k: int = SHINGLE_WORDS) -> set[str]:
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def job_text(job: Job) -> str:
+    return f"{job.title}\n{job.description}"
+
+
+class MinHasher:
+    """MinHash signatures (NUM_PERM uint32 values) under fixed-seed hash functions."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        import numpy as np
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, words: list[str]) -> "np.ndarray":
+        import numpy as np
+        grams = shingles(words)
+        if not grams:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint32)
+        x = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little")
+             for g in grams),
+            dtype=np.uint64, count=len(grams),
+        ) % _PRIME
+        hashed = (np.outer(self._a, x) + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def buckets(self, signature: "np.ndarray") -> list[str]:
+        """One "band:hash" LSH bucket key per band."""
+        return [
+            f"{i}:{hashlib.blake2b(band.tobytes(), digest_size=8).hexdigest()}"
+            for i, band in enumerate(signature.reshape(self.bands, self.rows))
+        ]
+
+
+def similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float((a == b).mean())
+
+
+class DedupIndex:
+    """
+    Persistent MinHash/LSH index of stored jobs. assign() hashes only the
+    jobs it is given, finds candidates through the lsh_buckets table and
+    puts each job in the cluster of its most similar match from another
+    source, or in a new cluster of its own. A job that already leads a
+    cluster keeps leading it, so cluster IDs stay stable.
+    """
+
+    def __init__(
+        self,
+        repo: DedupRepository | None = None,
+        threshold: float = DEDUP_THRESHOLD,
+        hasher: MinHasher | None = None,
+    ):
+        self.repo = repo or DedupRepository()
+        self.threshold = threshold
+        self._hasher = hasher
+        self.hashed = 0
+        self.duplicates = 0
+
+    @property
+    def hasher(self) -> MinHasher:
+        if self._hasher is None:
+            self._hasher = MinHasher()
+        return self._hasher
+
+    def assign(self, jobs: list[Job]) -> dict[str, str]:
+        """Index `jobs`; returns job_id → cluster_id (the canonical job's id)."""
+        import numpy as np
+        jobs = list({job.id: job for job in jobs}.values())
+        if not jobs:
+            return {}
+        signatures, buckets = {}, {}
+        for job in jobs:
+            words = normalize(job_text(job))
+            signatures[job.id] = self.hasher.signature(words)
+            buckets[job.id] = (
+                self.hasher.buckets(signatures[job.id]) if len(words) >= MIN_WORDS else []
+            )
+        self.hashed += len(jobs)
+
+        stored = self.repo.candidates([b for keys in buckets.values() for b in keys])
+        candidate_ids = {i for ids in stored.values() for i in ids} - signatures.keys()
+        known = {
+            job_id: (source, np.frombuffer(raw, dtype=np.uint32))
+            for job_id, (source, raw) in self.repo.signatures(list(candidate_ids)).items()
+        }
+        clusters = self.repo.clusters([*candidate_ids, *signatures])
+        leaders = self.repo.leading([i for i in signatures if clusters.get(i) == i])
+        members = self.repo.cluster_sources([clusters.get(i, i) for i in candidate_ids])
+        for cluster in members.values():
+            for job_id in signatures.keys() & cluster.keys():
+                del cluster[job_id]   # re-indexed now; placed again below
+
+        local: dict[str, list[str]] = {}   # buckets of jobs assigned in this call
+        assigned, entries = {}, []
+        for job in jobs:
+            cluster, best = job.id, 0.0
+            if job.id not in leaders:   # a cluster's canonical job stays put
+                ids = set()
+                for b in buckets[job.id]:
+                    ids |= stored.get(b, set())
+                    ids.update(local.get(b, []))
+                for other in sorted(ids - {job.id}):
+                    if other in assigned:
+                        sig, other_cluster = signatures[other], assigned[other]
+                    elif other in known:
+                        sig, other_cluster = known[other][1], clusters.get(other, other)
+                    else:
+                        continue
+                    # A cluster holds one posting per source: one source
+                    # never lists the same role twice
+                    if job.source in members.get(other_cluster, {}).values():
+                        continue
+                    score = similarity(signatures[job.id], sig)
+                    if score >= self.threshold and score > best:
+                        cluster, best = other_cluster, score
+            if cluster != job.id:
+                self.duplicates += 1
+            assigned[job.id] = cluster
+            members.setdefault(cluster, {})[job.id] = job.source
+            for b in buckets[job.id]:
+                local.setdefault(b, []).append(job.id)
+            entries.append((
+                job.id, job.source, signatures[job.id].tobytes(), buckets[job.id],
+                cluster, best if cluster != job.id else 1.0,
+            ))
+        self.repo.save_many(entries)
+        return assigned
+
+    def backfill(self, job_repo: JobRepository, batch_size: int = 500) -> int:
+        """Index stored jobs that have no signature yet. Returns how many."""
+        indexed = 0
+        while ids := self.repo.unindexed_job_ids(limit=batch_size):
+            jobs = job_repo.get_many(ids)
+            if not jobs:
+                break
+            self.assign(jobs)
+            indexed += len(jobs)
+        return indexed
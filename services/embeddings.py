@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING, Protocol
+
+from domain.resume import ResumeProfile
+from infrastructure.repositories import EmbeddingRepository
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Small CPU model; 384-dim, ~80 MB
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Share of final_score taken by semantic similarity. 0 turns semantic
+# scoring off, so the model is never loaded.
+SEMANTIC_WEIGHT = float(os.getenv("SEMANTIC_WEIGHT", "0"))
+
+
+class Embedder(Protocol):
+    name: str
+
+    def encode(self, texts: list[str]) -> "np.ndarray":
+        """Unit-length float32 vectors, one row per text."""
+        ...
+
+
+class SentenceEmbedder:
+    """sentence-transformers model, loaded on first use."""
+
+    def __init__(self, name: str = EMBEDDING_MODEL, batch_size: int = 64):
+        self.name = name
+        self.batch_size = batch_size
+        self._model = None
+
+    def encode(self, texts: list[str]) -> "np.ndarray":
+        import numpy as np
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            logger.info(f"[embeddings] loading {self.name}")
+            self._model = SentenceTransformer(self.name, device="cpu")
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def resume_text(resume: ResumeProfile) -> str:
+    """What a resume is embedded as."""
+    return "; ".join([
+        ", ".join(resume.domains),
+        ", ".join(resume.skills),
+        ", ".join(resume.certifications),
+    ])
+
+
+class EmbeddingIndex:
+    """
+    Job description vectors cached by hash(model, description) in the
+    job_embeddings table, so each description is embedded once. Resume
+    vectors are cheap to recompute and only cached in process.
+    """
+
+    def __init__(self, embedder: Embedder | None = None, repo: EmbeddingRepository | None = None):
+        self.embedder = embedder or SentenceEmbedder()
+        self.repo = repo or EmbeddingRepository()
+        self._resumes: dict[str, "np.ndarray"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.embedder.name}\0{text or ''}".encode()).hexdigest()
+
+    def job_vectors(self, descriptions: list[str]) -> "np.ndarray":
+        """One vector per description (rows in input order); embeds only unseen ones."""
+        import numpy as np
+        keys = [self.key(d) for d in descriptions]
+        vectors: dict[str, np.ndarray] = {
+            k: np.frombuffer(raw, dtype=np.float32)
+            for k, raw in self.repo.get_many(list(dict.fromkeys(keys))).items()
+        }
+        todo = {k: d or "" for k, d in zip(keys, descriptions) if k not in vectors}
+        if todo:
+            fresh = self.embedder.encode(list(todo.values()))
+            vectors.update(zip(todo, fresh))
+            try:
+                self.repo.save_many(
+                    self.embedder.name, fresh.shape[1],
+                    {k: vectors[k].tobytes() for k in todo},
+                )
+            except Exception as e:
+                logger.warning(f"[embeddings] store failed — {e}")
+        self.misses += len(todo)
+        self.hits += len(keys) - len(todo)
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[k] for k in keys])
+
+    def resume_vectors(self, resumes: list[ResumeProfile]) -> "np.ndarray":
+        import numpy as np
+        texts = [resume_text(r) for r in resumes]
+        todo = [t for t in dict.fromkeys(texts) if t not in self._resumes]
+        if todo:
+            self._resumes.update(zip(todo, self.embedder.encode(todo)))
+        return np.stack([self._resumes[t] for t in texts])
+
+
+def default_index() -> EmbeddingIndex | None:
+    """The index to score with, or None when semantic scoring is off."""
+    return EmbeddingIndex() if SEMANTIC_WEIGHT > 0 else None
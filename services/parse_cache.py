@@ -0,0 +1,81 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+from infrastructure.repositories import ParseCacheRepository
+from services.parser import KNOWN_SKILLS, YOE_PATTERN, ParsedJD, extract_batch
+
+logger = logging.getLogger(__name__)
+
+# Folded into every key so a vocabulary or regex change invalidates old entries
+PARSER_VERSION = hashlib.sha256(
+    ("\n".join(KNOWN_SKILLS) + "\n" + YOE_PATTERN.pattern).encode()
+).hexdigest()[:12]
+
+
+def content_hash(text: str) -> str:
+    """Stable cache key for a job description."""
+    return hashlib.sha256(f"{PARSER_VERSION}\0{text or ''}".encode()).hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache in front of extract_batch.
+
+    An in-process LRU serves repeats within a worker's lifetime; the
+    parse_cache table serves repeats across cycles. Only descriptions
+    missing from both tiers are actually parsed.
+    """
+
+    def __init__(
+        self,
+        repo: ParseCacheRepository | None = None,
+        max_entries: int = 10_000,
+    ):
+        self.repo = repo or ParseCacheRepository()
+        self.max_entries = max_entries
+        self._lru: OrderedDict[str, ParsedJD] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, parsed: ParsedJD) -> None:
+        self._lru[key] = parsed
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def parse_batch(self, descriptions: list[str], workers: int = 0) -> list[ParsedJD]:
+        """Return one ParsedJD per description, in input order."""
+        keys = [content_hash(d) for d in descriptions]
+        results: dict[str, ParsedJD] = {}
+
+        for key in keys:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                results[key] = self._lru[key]
+
+        wanted = [k for k in dict.fromkeys(keys) if k not in results]
+        try:
+            stored = self.repo.get_many(wanted)
+        except Exception as e:
+            logger.warning(f"[parse-cache] lookup failed — {e}")
+            stored = {}
+        for key, (skills, years) in stored.items():
+            results[key] = ParsedJD(skills=skills, years=years)
+            self._remember(key, results[key])
+
+        todo = {k: d for k, d in zip(keys, descriptions) if k not in results}
+        if todo:
+            parsed = extract_batch(list(todo.values()), workers=workers)
+            fresh = dict(zip(todo, parsed))
+            for key, jd in fresh.items():
+                results[key] = jd
+                self._remember(key, jd)
+            try:
+                self.repo.save_many({k: (jd.skills, jd.years) for k, jd in fresh.items()})
+            except Exception as e:
+                logger.warning(f"[parse-cache] store failed — {e}")
+
+        self.misses += len(todo)
+        self.hits += len(keys) - len(todo)
+        return [results[k] for k in keys]
@@ -1,4 +1,5 @@
 import re
+from dataclasses import dataclass
 
 # Master skill list — covers SRE / DevOps / Cloud / Backend
 KNOWN_SKILLS = [
@@ -30,20 +31,103 @@ KNOWN_SKILLS = [
 
 # Regex to extract years of experience — matches patterns like:
 # "3+ years", "2-4 years", "5 years of experience"
+# The leading (?=\d) lets the regex engine skip straight to digits.
 YOE_PATTERN = re.compile(
-    r"(\d+)\+?\s*(?:to|-)\s*\d*\s*years?|(\d+)\+?\s*years?(?:\s+(?:of\s+)?experience)?",
+    r"(?=\d)(?:(\d+)\+?\s*(?:to|-)\s*\d*\s*years?|(\d+)\+?\s*years?(?:\s+(?:of\s+)?experience)?)",
     re.IGNORECASE,
 )
 
 
+# A skill only counts when it is not glued to other letters/digits, so "go"
+# no longer fires inside "google" and "git" no longer fires inside "github".
+_BOUNDARY_BEFORE = r"(?<![a-z0-9])"
+_BOUNDARY_AFTER = r"(?![a-z0-9])"
+
+
+def _trie_regex(node: dict) -> str:
+    """Render a character trie as a regex; longer continuations are tried first."""
+    end = node.get("") is not None
+    branches = [
+        re.escape(ch) + _trie_regex(child)
+        for ch, child in sorted(node.items())
+        if ch != ""
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if end:
+        body = f"(?:{body})?"
+    return body
+
+
+class SkillMatcher:
+    """
+    Compiled single-pass skill finder.
+
+    The vocabulary is folded into one trie-shaped regex at construction
+    time, so matching costs one scan of the text regardless of how many
+    skills are known. The longest skill wins at each word start; shorter
+    skills that sit on word boundaries inside it ("github" in
+    "github actions") are reported alongside it.
+    """
+
+    def __init__(self, skills: list[str]):
+        self.skills: list[str] = []
+        self.rank: dict[str, int] = {}
+        for skill in skills:
+            s = skill.lower()
+            if s and s not in self.rank:
+                self.rank[s] = len(self.skills)
+                self.skills.append(s)
+
+        self._trie: dict = {}
+        for s in self.skills:
+            node = self._trie
+            for ch in s:
+                node = node.setdefault(ch, {})
+            node[""] = s
+
+        # Every skill found inside each skill, itself included, in text order
+        self._contained = {s: self._walk(s) for s in self.skills}
+        self._pattern = re.compile(
+            _BOUNDARY_BEFORE + _trie_regex(self._trie) + _BOUNDARY_AFTER
+        )
+
+    def _walk(self, text: str) -> list[str]:
+        """Brute-force trie walk from every word start; only used at build time."""
+        hits = []
+        for i in range(len(text)):
+            if i and text[i - 1].isalnum():
+                continue
+            node = self._trie
+            for j in range(i, len(text)):
+                node = node.get(text[j])
+                if node is None:
+                    break
+                skill = node.get("")
+                if skill and (j + 1 == len(text) or not text[j + 1].isalnum()):
+                    hits.append(skill)
+        return hits
+
+    def find(self, text_lower: str) -> list[str]:
+        """Return matched skills in order of first appearance. Expects lowercased text."""
+        found: dict[str, None] = {}
+        for skill in self._pattern.findall(text_lower):
+            for s in self._contained[skill]:
+                found[s] = None
+        return list(found)
+
+    def find_ordered(self, text_lower: str) -> list[str]:
+        """Return matched skills in vocabulary order (the historical ordering)."""
+        return sorted(self.find(text_lower), key=self.rank.__getitem__)
+
+
+_MATCHER = SkillMatcher(KNOWN_SKILLS)
+
+
 def extract_skills(text: str) -> list[str]:
     """Return a deduplicated list of known skills found in the text."""
-    text_lower = text.lower()
-    found = []
-    for skill in KNOWN_SKILLS:
-        if skill in text_lower and skill not in found:
-            found.append(skill)
-    return found
+    return _MATCHER.find_ordered(text.lower())
 
 
 def extract_years(text: str) -> int:
@@ -54,4 +138,46 @@ def extract_years(text: str) -> int:
         val = m[0] or m[1]
         if val:
             years.append(int(val))
-    return min(years) if years else 0
\ No newline at end of file
+    return min(years) if years else 0
+
+@dataclass
+class ParsedJD:
+    skills: list[str]                # known skills, vocabulary order
+    years: int                       # minimum YOE required, 0 if not found
+
+
+# Below this many descriptions a process pool costs more than it saves
+POOL_MIN_BATCH = 2000
+
+
+def _parse_one(text: str) -> ParsedJD:
+    text_lower = (text or "").lower()
+    return ParsedJD(
+        skills=_MATCHER.find_ordered(text_lower),
+        years=extract_years(text_lower),
+    )
+
+
+def _parse_chunk(texts: list[str]) -> list[ParsedJD]:
+    return [_parse_one(t) for t in texts]
+
+
+def extract_batch(descriptions: list[str], workers: int = 0) -> list[ParsedJD]:
+    """
+    Parse many job descriptions in one call, preserving input order.
+
+    Each text is lowercased once and both skills and YOE are read from
+    it. With workers > 1 and a batch of at least POOL_MIN_BATCH texts,
+    the work is split into chunks across a process pool.
+    """
+    descriptions = list(descriptions)
+    if workers <= 1 or len(descriptions) < POOL_MIN_BATCH:
+        return _parse_chunk(descriptions)
+
+    # Pulls in multiprocessing; only pay for it when a pool is used
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(descriptions) // (workers * 4))
+    chunks = [descriptions[i:i + size] for i in range(0, len(descriptions), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [p for chunk in pool.map(_parse_chunk, chunks) for p in chunk]
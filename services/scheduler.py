@@ -0,0 +1,97 @@
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from infrastructure.repositories import CheckpointRepository
+
+logger = logging.getLogger(__name__)
+
+# Each company (or feed) is polled on its own interval: halved every time
+# a fetch stored new or updated jobs, doubled every time it did not,
+# and kept within [REFRESH_MIN_INTERVAL, REFRESH_MAX_INTERVAL]. New
+# companies start at COMPANY_REFRESH_INTERVAL.
+COMPANY_REFRESH_INTERVAL = float(os.getenv("COMPANY_REFRESH_INTERVAL", str(5 * 3600)))
+REFRESH_MIN_INTERVAL = float(os.getenv("REFRESH_MIN_INTERVAL", str(3600)))
+REFRESH_MAX_INTERVAL = float(os.getenv("REFRESH_MAX_INTERVAL", str(7 * 24 * 3600)))
+REFRESH_BACKOFF = float(os.getenv("REFRESH_BACKOFF", "2"))
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    initial: float = COMPANY_REFRESH_INTERVAL
+    minimum: float = REFRESH_MIN_INTERVAL
+    maximum: float = REFRESH_MAX_INTERVAL
+    factor: float = REFRESH_BACKOFF
+
+    def next_interval(self, interval: float | None, changed: bool) -> float:
+        """Seconds until the next fetch, given the current interval and whether the board changed."""
+        if interval is None:
+            interval = self.initial
+        elif changed:
+            interval /= self.factor
+        else:
+            interval *= self.factor
+        return min(self.maximum, max(self.minimum, interval))
+
+
+class RefreshScheduler:
+    """
+    Decides which companies are due and when each is next polled, from
+    the churn seen in past cycles. Backed by fetch_checkpoints.
+    """
+
+    def __init__(
+        self,
+        repo: CheckpointRepository | None = None,
+        policy: RefreshPolicy | None = None,
+    ):
+        self.repo = repo or CheckpointRepository()
+        self.policy = policy or RefreshPolicy()
+
+    def due(self, source: str, keys: list[str]) -> list[str]:
+        return self.repo.due(source, keys)
+
+    def record(
+        self,
+        source: str,
+        key: str,
+        run_id: str | None,
+        fetched: int = 0,
+        cursor: str | None = None,
+        error: str | None = None,
+        saved: int = 0,
+    ) -> float | None:
+        """
+        Record a fetch and schedule the next one. `saved` is how many of
+        its jobs were new or updated: the board's churn, as opposed to
+        `fetched`, which counts re-yielded postings too. Returns the new
+        interval (None on failure).
+        """
+        if error is not None:
+            # Left due: retried on the next cycle
+            self.repo.record(source, key, run_id, fetched, error=error)
+            return None
+        previous = self.repo.get(source, key)
+        changed = saved > 0
+        interval = self.policy.next_interval(
+            previous.get("refresh_interval") if previous else None, changed
+        )
+        next_due = datetime.utcnow() + timedelta(seconds=interval)
+        self.repo.record(
+            source, key, run_id, fetched, cursor=cursor,
+            refresh_interval=interval, next_due_at=next_due.isoformat(), changed=changed,
+        )
+        logger.debug(
+            f"[scheduler] {source}/{key}: {'changed' if changed else 'unchanged'}, "
+            f"next fetch in {interval / 3600:.1f}h"
+        )
+        return interval
+
+    def schedule(self, source: str | None = None) -> list[dict]:
+        """Every tracked company with its interval, next due time and whether it is due now."""
+        now = datetime.utcnow().isoformat()
+        rows = self.repo.schedule(source)
+        for row in rows:
+            row["due"] = (row["next_due_at"] or "") <= now
+        return rows
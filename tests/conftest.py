@@ -0,0 +1,80 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from infrastructure import database
+from monitoring import metrics
+
+
+@pytest.fixture(autouse=True)
+def no_working_tree_db(tmp_path, monkeypatch):
+    """Code that reaches for the database without sqlite_db gets a scratch file."""
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "unused.db")
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the SQLite backend at a fresh, initialised temp database."""
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "applyflow.db")
+    database.init_db()
+    return database.SQLITE_PATH
+
+
+@pytest.fixture(autouse=True)
+def metrics_sink():
+    """Metrics recorded by a test go to memory; flush with metrics.flush()."""
+    sink = metrics.MemorySink()
+    client = metrics.configure(sink, flush_interval=3600)
+    yield sink
+    client.close()
+
+
+@pytest.fixture(autouse=True)
+def http_cache_dir(tmp_path, monkeypatch):
+    """Keep collectors' on-disk response cache out of the working tree."""
+    from services.collectors import http
+    monkeypatch.setattr(http, "HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+    return tmp_path / "http_cache"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves `server.routes` (path → (body, headers)), honouring validators."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path not in self.server.routes:
+            self.send_error(404)
+            return
+        body, headers = self.server.routes[self.path]
+        etag = headers.get("ETag")
+        modified = headers.get("Last-Modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            modified and self.headers.get("If-Modified-Since") == modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """A local stand-in for job board APIs. Set routes, read back requests."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.routes = {}
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,55 @@
+"""Builders shared by test modules."""
+from domain.application import Application
+from domain.job import Job
+from domain.scoring import ScoreResult
+from infrastructure.repositories import ApplicationRepository, JobRepository
+
+# Long enough to shingle; mirrored across sources in near-duplicate tests
+POSTING = (
+    "We are hiring a Site Reliability Engineer to run our Kubernetes platform on AWS. "
+    "You will own Terraform modules, build CI/CD pipelines in GitHub Actions, tune "
+    "Postgres, and lead incident response with a small on-call rotation. You have three "
+    "or more years of production experience with Linux, containers and observability "
+    "tooling such as Prometheus and Grafana, and you enjoy automating toil away."
+)
+
+
+def make_job(**kwargs) -> Job:
+    """A scoring-test job; any field can be overridden."""
+    defaults = dict(
+        id="test-1",
+        title="SRE Engineer",
+        company="testco",
+        location="Remote",
+        description="",
+        required_skills=["docker", "terraform", "aws"],
+        required_years=2,
+        source="greenhouse",
+        source_url="https://example.com",
+    )
+    defaults.update(kwargs)
+    return Job(**defaults)
+
+
+def make_stored_job(job_id: str, company: str = "acme") -> Job:
+    """A job titled after its ID that requires aws and 1 year."""
+    return Job(
+        id=job_id, title=f"SRE {job_id}", company=company, location="Remote",
+        description="", required_skills=["aws"], required_years=1,
+        source="test", source_url="",
+    )
+
+
+def make_result(score: float) -> ScoreResult:
+    return ScoreResult(
+        final_score=score, keyword_coverage=score, missing_skills=["go"],
+        matched_skills=["aws"], experience_gap=0, hard_mismatch=False,
+    )
+
+
+def seed_scored(scores: dict[str, float], company: str = "acme"):
+    """Store one job per ID and score it for the default user."""
+    JobRepository().save_many([make_stored_job(job_id, company) for job_id in scores])
+    ApplicationRepository().upsert_many([
+        (Application(job_id=job_id), make_result(score)) for job_id, score in scores.items()
+    ])
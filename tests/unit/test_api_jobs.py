@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from api.main import app
+from tests.factories import seed_scored
+
+
+def test_list_jobs_paginates_with_cursor_and_total_header(sqlite_db):
+    seed_scored({"a": 70.0, "b": 60.0, "c": 50.0})
+    client = TestClient(app)
+
+    first = client.get("/jobs", params={"limit": 2, "view": "summary"})
+    assert first.headers["X-Total-Count"] == "3"
+    body = first.json()
+    assert [j["job_id"] for j in body["jobs"]] == ["a", "b"]
+
+    second = client.get("/jobs", params={"limit": 2, "cursor": body["next_cursor"]}).json()
+    assert [j["job_id"] for j in second["jobs"]] == ["c"]
+    assert second["next_cursor"] is None
+
+
+def test_list_jobs_rejects_bad_cursor(sqlite_db):
+    assert TestClient(app).get("/jobs", params={"cursor": "nope"}).status_code == 400
+
+
+def test_keyword_search_filters_every_page_server_side(sqlite_db):
+    seed_scored({"a": 70.0, "b": 60.0, "c": 50.0})
+    seed_scored({"d": 80.0, "e": 40.0}, company="globex")
+    client = TestClient(app)
+
+    first = client.get("/jobs", params={"q": "GLOBEX, sre c", "limit": 2}).json()
+    assert first["total"] == 3
+    assert [j["job_id"] for j in first["jobs"]] == ["d", "c"]
+    rest = client.get("/jobs", params={"q": "globex,sre c", "cursor": first["next_cursor"]}).json()
+    assert [j["job_id"] for j in rest["jobs"]] == ["e"]
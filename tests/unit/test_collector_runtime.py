@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+import threading
+
+import httpx
+import pytest
+
+from domain.job import Job
+from services.collectors.base import JobCollector
+from services.collectors.http import HttpClient, HttpStatusError
+from services.collectors.runtime import iter_sync, run_collectors
+
+
+def _job(job_id: str) -> Job:
+    return Job(
+        id=job_id, title="SRE", company="acme", location="Remote", description="",
+        required_skills=[], required_years=0, source="test", source_url="",
+    )
+
+
+def fetch(client: HttpClient, *urls: str):
+    async def run():
+        async with client:
+            return await asyncio.gather(*(client.get(url) for url in urls))
+    return asyncio.run(run())
+
+
+class Flaky:
+    """Answers each URL with `statuses` in turn, then 200."""
+
+    def __init__(self, *statuses: int, latency: float = 0.0):
+        self.statuses = list(statuses)
+        self.latency = latency
+        self.calls = 0
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.calls += 1
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        await asyncio.sleep(self.latency)
+        self.active[host] -= 1
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+
+def test_rate_limited_and_server_errors_are_retried():
+    server = Flaky(429, 503)
+    client = HttpClient(transport=httpx.MockTransport(server.handle), backoff=0.01)
+    [resp] = fetch(client, "http://a.test/jobs")
+    assert resp.json() == {"ok": True}
+    assert (server.calls, client.retried) == (3, 2)
+
+
+def test_retries_give_up_with_status_error():
+    server = Flaky(500, 500, 500)
+    client = HttpClient(transport=httpx.MockTransport(server.handle), retries=2, backoff=0.01)
+    with pytest.raises(HttpStatusError) as err:
+        fetch(client, "http://a.test/jobs")
+    assert err.value.status_code == 500
+    assert server.calls == 3
+
+
+def test_requests_are_capped_per_host():
+    server = Flaky(latency=0.02)
+    client = HttpClient(transport=httpx.MockTransport(server.handle), per_host=2)
+    client.limit_host("http://b.test/", 5)
+    fetch(client, *[f"http://a.test/{i}" for i in range(8)], *[f"http://b.test/{i}" for i in range(8)])
+    assert server.peak == {"a.test": 2, "b.test": 5}
+
+
+class ListCollector(JobCollector):
+    def __init__(self, ids, pause: float = 0.0, then_hang: bool = False):
+        self.ids = ids
+        self.pause = pause
+        self.then_hang = then_hang
+        self.closed = threading.Event()
+
+    async def aiter_jobs(self, http):
+        try:
+            for job_id in self.ids:
+                await asyncio.sleep(self.pause)
+                yield _job(job_id)
+            if self.then_hang:
+                await asyncio.sleep(3600)
+        finally:
+            self.closed.set()
+
+
+class LegacyCollector(JobCollector):
+    def fetch(self):
+        return [_job("legacy")]
+
+
+def test_deadline_keeps_collected_jobs_and_reports_every_collector():
+    jobs, done = [], {}
+    collectors = [
+        ListCollector(["a1", "a2"]),
+        ListCollector(["b1"], then_hang=True),
+        LegacyCollector(),
+    ]
+    asyncio.run(run_collectors(
+        collectors,
+        on_job=lambda c, job: jobs.append(job.id),
+        on_done=lambda c, fetched, elapsed, error: done.__setitem__(id(c), (fetched, error)),
+        http=HttpClient(),
+        deadline=0.2,
+    ))
+    assert sorted(jobs) == ["a1", "a2", "b1", "legacy"]
+    assert done[id(collectors[0])] == (2, None)
+    assert done[id(collectors[1])][0] == 1
+    assert isinstance(done[id(collectors[1])][1], TimeoutError)
+    assert done[id(collectors[2])] == (1, None)
+
+
+def test_sync_adapter_cancels_collection_when_closed_early():
+    collector = ListCollector([str(i) for i in range(1000)], pause=0.001)
+    jobs = iter_sync(collector, http=HttpClient(), maxsize=2)
+    assert [j.id for j in itertools.islice(jobs, 3)] == ["0", "1", "2"]
+    jobs.close()
+    assert collector.closed.wait(1)
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from infrastructure import database
+from infrastructure.database import connection, pool_stats
+
+
+def test_sqlite_connection_is_reused_per_thread(sqlite_db):
+    with connection() as first:
+        pass
+    with connection() as second:
+        pass
+    assert first is second
+
+    other = []
+
+    def borrow():
+        with connection() as conn:
+            other.append(conn)
+
+    t = threading.Thread(target=borrow)
+    t.start()
+    t.join()
+    assert other[0] is not first
+
+
+def test_sqlite_uses_wal(sqlite_db):
+    with connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_connection_rolls_back_on_error(sqlite_db):
+    with pytest.raises(RuntimeError):
+        with connection() as conn:
+            conn.execute("INSERT INTO jobs (id, title, company) VALUES ('x', 't', 'c')")
+            raise RuntimeError("abort")
+    with connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+
+
+def test_pool_stats_count_checkouts(sqlite_db):
+    before = pool_stats()["checkouts"]
+    with connection():
+        assert pool_stats()["in_use"] >= 1
+    stats = pool_stats()
+    assert stats["checkouts"] == before + 1
+    assert stats["backend"] == "sqlite"
+
+
+def test_new_path_gets_new_connection(sqlite_db, tmp_path, monkeypatch):
+    with connection() as first:
+        pass
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "other.db")
+    with connection() as second:
+        pass
+    assert first is not second
+
+
+def test_init_db_applies_migrations_once(sqlite_db):
+    assert database.applied_migrations() == {v for v, _, _ in database.MIGRATIONS}
+    assert database.migrate() == []
+    with connection() as conn:
+        indexes = {
+            r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    assert {"ux_applications_user_job", "ix_jobs_created_at"} <= indexes
+
+
+def test_unique_index_migration_drops_duplicate_applications(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "legacy.db")
+    monkeypatch.setattr(database, "MIGRATIONS", [])
+    database.init_db()
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO applications (job_id, match_score) VALUES (?, ?)",
+            [("a", 10.0), ("a", 20.0), ("b", 30.0)],
+        )
+
+    monkeypatch.undo()
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "legacy.db")
+    assert 1 in database.migrate()
+    with connection() as conn:
+        rows = conn.execute("SELECT job_id, match_score FROM applications ORDER BY job_id")
+        assert [tuple(r) for r in rows] == [("a", 20.0), ("b", 30.0)]
+
+
+def test_user_migration_hands_rows_to_the_only_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "legacy.db")
+    monkeypatch.setattr(database, "MIGRATIONS", database.MIGRATIONS[:3])
+    database.init_db()
+    with connection() as conn:
+        conn.execute("INSERT INTO search_profiles (user_id, name) VALUES ('jo', 'Jo')")
+        conn.execute("INSERT INTO applications (job_id, match_score) VALUES ('a', 10.0)")
+
+    monkeypatch.undo()
+    monkeypatch.setattr(database, "SQLITE_PATH", tmp_path / "legacy.db")
+    assert 4 in database.migrate()
+    with connection() as conn:
+        rows = conn.execute("SELECT user_id, job_id FROM applications")
+        assert [tuple(r) for r in rows] == [("jo", "a")]
+        conn.execute("INSERT INTO applications (user_id, job_id) VALUES ('other', 'a')")
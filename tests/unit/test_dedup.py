@@ -0,0 +1,78 @@
+from fastapi.testclient import TestClient
+
+from api.main import app
+from domain.application import Application
+from domain.job import Job
+from infrastructure.repositories import ApplicationRepository, JobRepository
+from services.dedup import DedupIndex, MinHasher, normalize, similarity
+from tests.factories import POSTING, make_result
+
+
+def make_job(job_id: str, source: str, description: str = POSTING) -> Job:
+    return Job(
+        id=job_id, title="Site Reliability Engineer", company="acme", location="Remote",
+        description=description, required_skills=[], required_years=0,
+        source=source, source_url=f"https://{source}/{job_id}",
+    )
+
+
+def test_signatures_estimate_jaccard_similarity():
+    hasher = MinHasher()
+    a = hasher.signature(normalize(POSTING))
+    b = hasher.signature(normalize(POSTING + " Apply on Remotive."))
+    c = hasher.signature(normalize("Senior frontend engineer, React and TypeScript, Berlin office."))
+    assert similarity(a, b) > 0.8
+    assert similarity(a, c) < 0.2
+
+
+def test_cross_source_copies_share_a_cluster(sqlite_db):
+    index = DedupIndex()
+    clusters = index.assign([
+        make_job("gh", "greenhouse"),
+        make_job("rm", "remotive", POSTING + " Apply on Remotive."),
+        make_job("gh2", "greenhouse"),  # same source: a separate posting
+        make_job("other", "remotive", "Senior frontend engineer, React and TypeScript."),
+    ])
+    assert clusters == {"gh": "gh", "rm": "gh", "gh2": "gh2", "other": "other"}
+    assert index.duplicates == 1
+
+
+def test_index_is_persistent_and_incremental(sqlite_db):
+    DedupIndex().assign([make_job("gh", "greenhouse")])
+
+    later = DedupIndex()
+    assert later.assign([make_job("wwr", "weworkremotely-devops")]) == {"wwr": "gh"}
+    assert later.hashed == 1
+
+    # The canonical job keeps its cluster when its listing is re-indexed
+    assert later.assign([make_job("gh", "greenhouse", POSTING + " Updated.")]) == {"gh": "gh"}
+
+
+def test_backfill_indexes_jobs_stored_before_dedup(sqlite_db):
+    repo = JobRepository()
+    repo.save_many([make_job("gh", "greenhouse"), make_job("rm", "remotive")])
+    index = DedupIndex()
+    assert index.backfill(repo, batch_size=1) == 2
+    assert index.backfill(repo) == 0
+    assert index.repo.clusters(["gh", "rm"]) == {"gh": "gh", "rm": "gh"}
+
+
+def test_api_lists_one_job_per_cluster(sqlite_db):
+    JobRepository().save_many([make_job("gh", "greenhouse"), make_job("rm", "remotive")])
+    ApplicationRepository().upsert_many([
+        (Application(job_id="gh"), make_result(70.0)),
+        (Application(job_id="rm"), make_result(70.0)),
+    ])
+    DedupIndex().assign([make_job("gh", "greenhouse"), make_job("rm", "remotive")])
+    client = TestClient(app)
+
+    assert [j["job_id"] for j in client.get("/jobs").json()["jobs"]] == ["gh"]
+    everything = client.get("/jobs", params={"duplicates": "true"}).json()
+    assert [j["job_id"] for j in everything["jobs"]] == ["gh", "rm"]
+
+    cluster = client.get("/jobs/rm/duplicates").json()
+    assert cluster["cluster_id"] == "gh"
+    assert [(j["job_id"], j["source"]) for j in cluster["jobs"]] == [
+        ("gh", "greenhouse"), ("rm", "remotive"),
+    ]
+    assert client.get("/jobs/missing/duplicates").status_code == 404
@@ -0,0 +1,67 @@
+import re
+
+import numpy as np
+import pytest
+
+from domain.resume import ResumeProfile
+from domain.scoring import ScoringEngine
+from services.embeddings import EmbeddingIndex
+from tests.factories import make_job
+
+
+class BagOfWordsEmbedder:
+    """Deterministic stand-in for a sentence model: k8s and kubernetes share a slot."""
+    name = "bow-test"
+    vocab = ["kubernetes", "postgres", "cooking"]
+    aliases = {"k8s": "kubernetes", "postgresql": "postgres"}
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"[a-z0-9]+", text.lower()):
+                word = self.aliases.get(word, word)
+                if word in self.vocab:
+                    out[i, self.vocab.index(word)] = 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1, norms)
+
+
+def test_descriptions_are_embedded_once(sqlite_db):
+    embedder = BagOfWordsEmbedder()
+    index = EmbeddingIndex(embedder)
+
+    first = index.job_vectors(["Run k8s", "Run k8s", "Tune postgres"])
+    assert first.shape == (3, 3) and first.dtype == np.float32
+    assert embedder.calls == [["Run k8s", "Tune postgres"]]
+
+    # A fresh index (next cycle) reads the stored vectors back
+    again = EmbeddingIndex(embedder).job_vectors(["Tune postgres", "cooking"])
+    assert embedder.calls[-1] == ["cooking"]
+    np.testing.assert_array_equal(again[0], first[2])
+
+
+def test_semantic_similarity_is_blended_into_final_score(sqlite_db):
+    index = EmbeddingIndex(BagOfWordsEmbedder())
+    resume = ResumeProfile(name="r", skills=["kubernetes"], experience_years=2,
+                           domains=[], certifications=[])
+    jobs = [
+        make_job(id="a", description="Operate k8s", required_skills=["k8s"]),
+        make_job(id="b", description="cooking", required_skills=["k8s"]),
+    ]
+    engine = ScoringEngine(semantic_weight=0.5)
+
+    batch = engine.score_matrix(
+        jobs, [resume],
+        job_vectors=index.job_vectors([j.description for j in jobs]),
+        resume_vectors=index.resume_vectors([resume]),
+    )[0]
+    keyword_only = engine.score(jobs[0], resume).final_score   # k8s != kubernetes
+    assert batch.result(0).semantic_score == 100.0
+    assert batch.result(0).final_score == pytest.approx(keyword_only * 0.5 + 50.0)
+    assert batch.result(1).semantic_score == 0.0
+    # Without vectors the semantic weight has no effect
+    assert engine.score_many(jobs, resume).result(0) == engine.score(jobs[0], resume)
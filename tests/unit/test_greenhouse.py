@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import httpx
+
+from infrastructure.repositories import JobRepository
+from services.collectors import ratelimit
+from services.collectors.greenhouse import GreenhouseCollector
+from services.collectors.http import HttpClient
+from services.collectors.ratelimit import TokenBucket, limiter_for
+
+
+class FakeBoard:
+    """Serves a board of `n` SRE jobs with a fixed per-request latency."""
+
+    def __init__(self, n: int, latency: float = 0.0):
+        self.n = n
+        self.latency = latency
+        self.active = self.peak = 0
+        self.urls = []
+        self.versions = {}
+        self.broken = set()     # job ids whose detail page errors
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.urls.append(str(request.url))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+        if request.url.path.endswith("/jobs"):
+            return httpx.Response(200, json={"jobs": [
+                {"id": i, "title": f"SRE {i}", "location": {"name": "Remote"},
+                 "updated_at": self.versions.get(i, "2025-01-01T00:00:00Z")}
+                for i in range(self.n)
+            ]})
+        if int(request.url.path.rsplit("/", 1)[-1]) in self.broken:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"content": "&lt;p&gt;Terraform&lt;/p&gt;"})
+
+    def client(self) -> HttpClient:
+        return HttpClient(transport=httpx.MockTransport(self.handle))
+
+
+def test_concurrent_fetch_keeps_listing_order(sqlite_db, monkeypatch):
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    board = FakeBoard(n=12, latency=0.02)
+    collector = GreenhouseCollector(
+        companies=["acme"], concurrency=4, rate_per_sec=1000, http=board.client(),
+    )
+    jobs = collector.fetch()
+    assert [j.title for j in jobs] == [f"SRE {i}" for i in range(12)]
+    assert jobs[0].description == "Terraform"
+    assert 1 < board.peak <= 4
+
+
+def test_sequential_mode_still_supported(sqlite_db):
+    board = FakeBoard(n=2)
+    collector = GreenhouseCollector(
+        companies=["acme"], delay=0, concurrency=1, http=board.client(),
+    )
+    assert len(collector.fetch()) == 2
+    assert board.peak == 1
+
+
+def test_known_listings_skip_detail_fetch(sqlite_db):
+    board = FakeBoard(n=10)
+    collector = GreenhouseCollector(
+        companies=["acme"], delay=0, concurrency=1, http=board.client(),
+    )
+    JobRepository().save_many(collector.fetch())
+
+    board.versions[3] = "2025-02-01T00:00:00Z"
+    board.urls.clear()
+    again = collector.fetch()
+    assert [j.title for j in again] == ["SRE 3"]
+    assert len(board.urls) == 2   # the listing and one detail page
+    assert collector.skipped_known == 9
+
+    # The edited posting replaces the stored one
+    assert JobRepository().save_many(again) == [again[0].id]
+    assert JobRepository().source_versions([again[0].id]) == {
+        again[0].id: "2025-02-01T00:00:00Z"
+    }
+    assert JobRepository().save_many(again) == []
+
+
+class RecordedCheckpoints:
+    def __init__(self, due):
+        self.due_keys = due
+        self.records = []
+
+    def due(self, keys):
+        return [k for k in keys if k in self.due_keys]
+
+    async def record(self, key, job_ids, cursor=None, error=None):
+        self.records.append((key, len(job_ids), cursor, error))
+
+
+def test_only_due_companies_are_fetched_and_checkpointed(sqlite_db):
+    board = FakeBoard(n=2)
+    board.versions[1] = "2025-03-01T00:00:00Z"
+    collector = GreenhouseCollector(
+        companies=["acme", "globex"], delay=0, concurrency=1, http=board.client(),
+    )
+    collector.checkpoints = RecordedCheckpoints(due=["globex"])
+    assert {j.company for j in collector.fetch()} == {"globex"}
+    assert collector.checkpoints.records == [("globex", 2, "2025-03-01T00:00:00Z", None)]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # First token is free; the other five each wait ~1/50s
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_limiter_is_shared_per_host_and_rate(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    bucket = limiter_for("https://boards-api.greenhouse.io/v1/boards", 5)
+    assert limiter_for("https://boards-api.greenhouse.io/v1/other", 5) is bucket
+    faster = limiter_for("https://boards-api.greenhouse.io/v1/boards", 20)
+    assert faster is not bucket
+    assert faster.rate == 20
+
+
+def test_failed_detail_fetch_keeps_the_company_due(sqlite_db):
+    board = FakeBoard(n=3)
+    board.broken = {1}
+    collector = GreenhouseCollector(
+        companies=["acme"], delay=0, concurrency=1, http=board.client(),
+    )
+    collector.checkpoints = RecordedCheckpoints(due=["acme"])
+    assert [j.title for j in collector.fetch()] == ["SRE 0", "SRE 2"]
+    key, fetched, _, error = collector.checkpoints.records[0]
+    assert (key, fetched, error) == ("acme", 2, "1 of 3 job details not fetched")
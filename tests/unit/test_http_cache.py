@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from infrastructure.repositories import JobRepository
+from services.collectors import greenhouse, remotive
+from services.collectors.http import CacheEntry, HttpClient, HttpStatusError, ResponseCache
+from services.collectors.greenhouse import GreenhouseCollector
+from services.collectors.remotive import RemotiveCollector
+
+
+def get_all(client: HttpClient, *urls: str):
+    """GET each URL in turn on one open client."""
+    async def run():
+        async with client:
+            return [await client.get(url) for url in urls]
+    return asyncio.run(run())
+
+
+def test_etag_revalidation_returns_cached_body(http_server, tmp_path):
+    http_server.routes["/board"] = (b'{"jobs": [1]}', {"ETag": '"v1"'})
+    client = HttpClient(cache=ResponseCache(tmp_path))
+
+    first, second = get_all(client, http_server.url + "/board", http_server.url + "/board")
+
+    assert (first.status_code, first.unchanged) == (200, False)
+    assert (second.status_code, second.unchanged) == (304, True)
+    assert second.json() == {"jobs": [1]}
+    assert http_server.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_last_modified_revalidation_and_change(http_server, tmp_path):
+    stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+    http_server.routes["/feed"] = (b"old", {"Last-Modified": stamp})
+    client = HttpClient(cache=ResponseCache(tmp_path))
+    _, again = get_all(client, http_server.url + "/feed", http_server.url + "/feed")
+    assert again.unchanged
+    assert http_server.requests[1][1]["If-Modified-Since"] == stamp
+
+    http_server.routes["/feed"] = (b"new", {"Last-Modified": "Thu, 02 Jan 2025 00:00:00 GMT"})
+    [resp] = get_all(client, http_server.url + "/feed")
+    assert (resp.unchanged, resp.text) == (False, "new")
+
+
+def test_errors_raise_and_are_not_cached(http_server, tmp_path):
+    client = HttpClient(cache=ResponseCache(tmp_path))
+    with pytest.raises(HttpStatusError) as err:
+        get_all(client, http_server.url + "/missing")
+    assert err.value.status_code == 404
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60)
+    cache.put(CacheEntry("http://x/a", '"1"', None, stored_at=0, body=b"a"))
+    assert cache.get("http://x/a") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_least_recently_used_bodies_are_evicted_past_max_bytes(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=250)
+    for i, url in enumerate(["http://x/a", "http://x/b"]):
+        cache.put(CacheEntry(url, '"1"', None, stored_at=1e12, body=b"x" * 100))
+        os.utime(cache._paths(url)[1], (i, i))
+    assert cache.get("http://x/a")          # a is now the most recently used
+    cache.put(CacheEntry("http://x/c", '"1"', None, stored_at=1e12, body=b"x" * 100))
+
+    assert cache.get("http://x/b") is None
+    assert cache.get("http://x/a") and cache.get("http://x/c")
+    assert cache.size() == 200
+
+
+def test_unchanged_remotive_feed_yields_only_unstored_jobs(sqlite_db, http_server, monkeypatch, tmp_path):
+    payload = {"jobs": [{"title": "SRE", "company_name": "Acme", "category": "DevOps"}]}
+    http_server.routes["/api/remote-jobs"] = (json.dumps(payload).encode(), {"ETag": '"r1"'})
+    monkeypatch.setattr(remotive, "REMOTIVE_API", http_server.url + "/api/remote-jobs")
+    collector = RemotiveCollector(http=HttpClient(cache=ResponseCache(tmp_path)))
+
+    first = collector.fetch()
+    assert [j.title for j in first] == ["SRE"]
+    # Never stored (say the persist failed): the cached body still yields it
+    assert [j.title for j in collector.fetch()] == ["SRE"]
+    JobRepository().save_many(first)
+    assert collector.fetch() == []
+    assert collector.http.not_modified == 2
+
+
+def test_unchanged_greenhouse_board_fetches_only_unstored_details(
+    sqlite_db, http_server, monkeypatch, tmp_path
+):
+    board = {"jobs": [{"id": 1, "title": "SRE", "location": {"name": "Remote"}}]}
+    http_server.routes["/boards/acme/jobs"] = (json.dumps(board).encode(), {"ETag": '"b1"'})
+    http_server.routes["/boards/acme/jobs/1"] = (b'{"content": "Terraform"}', {})
+    monkeypatch.setattr(greenhouse, "GREENHOUSE_LIST_API", http_server.url + "/boards/{company}/jobs")
+    monkeypatch.setattr(
+        greenhouse, "GREENHOUSE_DETAIL_API", http_server.url + "/boards/{company}/jobs/{job_id}"
+    )
+    collector = GreenhouseCollector(
+        companies=["acme"], delay=0, concurrency=1, skip_known=False,
+        http=HttpClient(cache=ResponseCache(tmp_path)),
+    )
+
+    first = collector.fetch()
+    assert len(first) == 1
+    assert len(collector.fetch()) == 1   # 304, but the posting was never stored
+    JobRepository().save_many(first)
+    assert collector.fetch() == []
+    assert [path for path, _ in http_server.requests] == [
+        "/boards/acme/jobs", "/boards/acme/jobs/1",
+        "/boards/acme/jobs", "/boards/acme/jobs/1",
+        "/boards/acme/jobs",
+    ]
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.bench_imports import BUDGETS_MS, LAZY_PACKAGES, measure
+
+
+# Wall-clock budgets vary by machine: python -m benchmarks.bench_imports --check
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_entry_point_defers_heavy_packages(module):
+    eager = measure(module).packages & set(LAZY_PACKAGES)
+    assert not eager, f"{module} imports {sorted(eager)} at startup"
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from infrastructure.repositories import IngestRunRepository, LeaseRepository
+from workers import ingest_runner
+from workers.ingest_runner import INGEST_LEASE, IngestBusy, IngestRun
+
+
+class GatedWorker:
+    """Stands in for IngestionWorker: reports progress, finishes when released."""
+
+    def __init__(self, gate: threading.Event, fail: bool = False):
+        self.gate = gate
+        self.fail = fail
+        self.cancelled = False
+        self.progress = {"persist": {"saved": 0}}
+
+    def cancel(self):
+        self.cancelled = True
+        self.gate.set()
+
+    def run(self, run_id=None):
+        self.progress["persist"]["saved"] = 3
+        assert self.gate.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("boom")
+        if self.cancelled:
+            raise RuntimeError("cancelled")
+        return {"saved": 3}
+
+
+def wait_for(run_id: str, state: str) -> dict:
+    for _ in range(100):
+        run = IngestRunRepository().get(run_id)
+        if run["state"] == state:
+            return run
+        time.sleep(0.02)
+    raise AssertionError(f"run {run_id} never reached {state}: {run}")
+
+
+def test_lease_has_one_holder_until_it_expires(sqlite_db):
+    leases = LeaseRepository()
+    assert leases.acquire("x", "a", ttl=60)
+    assert not leases.acquire("x", "b", ttl=60)
+    assert leases.renew("x", "a", ttl=-1)       # now expired
+    assert leases.holder("x") is None
+    assert leases.acquire("x", "b", ttl=60)
+    assert not leases.renew("x", "a", ttl=60)
+    leases.release("x", "b")
+    assert leases.acquire("x", "a", ttl=60)
+
+
+def test_ingest_runs_in_background_and_blocks_overlaps(sqlite_db, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(ingest_runner, "build_worker", lambda: GatedWorker(gate))
+    client = TestClient(app)
+
+    started = client.post("/jobs/ingest")
+    assert started.status_code == 202
+    run_id = started.json()["id"]
+
+    busy = client.post("/jobs/ingest")
+    assert busy.status_code == 409
+    assert busy.json()["detail"]["id"] == run_id
+    assert client.get(f"/jobs/ingest/{run_id}").json()["state"] == "running"
+
+    gate.set()
+    run = wait_for(run_id, "done")
+    assert run["summary"] == {"saved": 3}
+    assert run["progress"] == {"persist": {"saved": 3}}
+    assert run["trigger"] == "api"
+    assert LeaseRepository().holder(INGEST_LEASE) is None
+    assert client.get("/jobs/ingest/nope").status_code == 404
+
+
+def test_failed_run_is_recorded_and_releases_the_lease(sqlite_db):
+    gate = threading.Event()
+    gate.set()
+    run = IngestRun(worker_factory=lambda: GatedWorker(gate, fail=True))
+    run.claim()
+    assert run.execute() is None
+    record = IngestRunRepository().get(run.id)
+    assert (record["state"], record["error"]) == ("failed", "boom")
+    IngestRun(worker_factory=lambda: GatedWorker(gate)).claim()
+
+
+def test_lost_lease_cancels_the_worker(sqlite_db):
+    gate = threading.Event()
+    worker = GatedWorker(gate)
+    run = IngestRun(worker_factory=lambda: worker, lease_ttl=0.06)
+    run.claim()
+    # Another process takes over once the lease lapses
+    leases = LeaseRepository()
+    leases.release(INGEST_LEASE, run.id)
+    assert leases.acquire(INGEST_LEASE, "other", ttl=60)
+
+    assert run.execute() is None
+    assert worker.cancelled
+    assert IngestRunRepository().get(run.id)["state"] == "failed"
+    assert leases.holder(INGEST_LEASE) == "other"
+
+
+def test_run_of_a_dead_process_is_abandoned_once_its_lease_lapses(sqlite_db):
+    crashed = IngestRun(lease_ttl=0.05)
+    crashed.claim()              # never executed: its process "died"
+    with pytest.raises(IngestBusy):
+        IngestRun().claim()
+
+    time.sleep(0.1)
+    IngestRun(lease_ttl=0.05).claim()
+    assert IngestRunRepository().get(crashed.id)["state"] == "abandoned"
@@ -0,0 +1,297 @@
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+from domain.job import Job
+from domain.resume import ResumeProfile
+from infrastructure.repositories import ApplicationRepository, JobRepository
+from monitoring import metrics
+from services.collectors.base import JobCollector
+from services.scheduler import RefreshPolicy, RefreshScheduler
+from tests.factories import POSTING
+from workers.ingestion_worker import IngestCancelled, IngestionWorker
+
+
+def make_job(job_id: str, description: str = "Docker and AWS, 2+ years") -> Job:
+    return Job(
+        id=job_id, title="SRE", company="acme", location="Remote",
+        description=description, required_skills=[], required_years=0,
+        source="test", source_url="",
+    )
+
+
+class StaticCollector(JobCollector):
+    def __init__(self, jobs, delay=0.0):
+        self.jobs = jobs
+        self.delay = delay
+
+    def fetch(self):
+        time.sleep(self.delay)
+        return self.jobs
+
+
+class BrokenCollector(JobCollector):
+    def fetch(self):
+        raise RuntimeError("boom")
+
+
+class GatedCollector(JobCollector):
+    """Yields one job, then waits until that job has been persisted."""
+
+    def __init__(self, gate: threading.Event):
+        self.gate = gate
+
+    def iter_jobs(self):
+        yield make_job("first")
+        assert self.gate.wait(timeout=2), "first job was not persisted while streaming"
+        yield make_job("second")
+
+
+class CompanyCollector(JobCollector):
+    """One job per due company; dies when it reaches `fail_at`."""
+
+    def __init__(self, companies, fail_at=None):
+        self.companies = companies
+        self.fail_at = fail_at
+        self.fetched = []
+
+    async def aiter_jobs(self, http):
+        for company in await self._due(self.companies):
+            if company == self.fail_at:
+                raise RuntimeError("task killed")
+            self.fetched.append(company)
+            job = make_job(f"{company}-1")
+            yield job
+            await self._checkpoint(company, [job], cursor=f"{company}@1")
+
+
+class InterleavedCollector(JobCollector):
+    """Yields every company's job before checkpointing any of them."""
+
+    async def aiter_jobs(self, http):
+        jobs = {company: make_job(f"{company}-1") for company in ("a", "b")}
+        for job in jobs.values():
+            yield job
+        for company, job in jobs.items():
+            await self._checkpoint(company, [job])
+
+
+class FakeJobRepo:
+    def __init__(self, on_save=None, reject=()):
+        self.saved = []
+        self.on_save = on_save
+        self.reject = set(reject)
+
+    def changed(self, jobs):
+        return [job for job in jobs if job.id not in self.saved]
+
+    def save_many(self, jobs, conn=None):
+        if self.reject & {job.id for job in jobs}:
+            raise ValueError("constraint violated")
+        new = [job.id for job in jobs if job.id not in self.saved]
+        self.saved.extend(new)
+        if self.on_save:
+            for job in jobs:
+                self.on_save(job)
+        return new
+
+    def count(self):
+        return len(self.saved)
+
+
+class FakeAppRepo:
+    def __init__(self):
+        self.saved = []
+
+    def upsert_scores(self, items, conn=None):
+        self.saved.extend(
+            (app.user_id, app.job_id, result.final_score) for app, result in items
+        )
+
+
+@pytest.fixture
+def worker_factory(sqlite_db):
+    def build(collectors, resumes=None):
+        worker = IngestionWorker(
+            collectors=collectors,
+            resume=ResumeProfile(
+                name="t", skills=["docker", "aws"], experience_years=2,
+                domains=[], certifications=[],
+            ),
+            resumes=resumes,
+        )
+        worker.job_repo = FakeJobRepo()
+        worker.app_repo = FakeAppRepo()
+        return worker
+
+    return build
+
+
+def test_collectors_run_in_parallel_and_fast_results_land_first(worker_factory):
+    slow = StaticCollector([make_job("slow")], delay=0.3)
+    fast = StaticCollector([make_job("fast")], delay=0.0)
+    worker = worker_factory([slow, fast, StaticCollector([], delay=0.3)])
+
+    start = time.time()
+    summary = worker.run()
+    assert time.time() - start < 0.55
+    assert worker.job_repo.saved == ["fast", "slow"]
+    assert summary["saved"] == 2
+    assert summary["total_fetched"] == 2
+
+
+def test_failed_collector_is_isolated(worker_factory, metrics_sink):
+    worker = worker_factory([BrokenCollector(), StaticCollector([make_job("a"), make_job("a")])])
+    summary = worker.run()
+    assert summary["failed"] == 1
+    assert summary["saved"] == 1
+    assert summary["skipped_dup"] == 1
+
+    metrics.flush()
+    assert metrics_sink.get("IngestionFailures").value == 1
+    assert metrics_sink.get("LastSuccessfulRun") is None
+    assert len(metrics_sink.batches) == 1
+
+
+def test_one_bad_job_does_not_fail_its_batch(worker_factory):
+    jobs = [make_job("a"), make_job("bad"), make_job("unparseable", "boom"), make_job("c")]
+    worker = worker_factory([StaticCollector(jobs)])
+    worker.job_repo = FakeJobRepo(reject={"bad"})
+    parse_batch = worker.parse_cache.parse_batch
+
+    def picky_parse(descriptions, workers=0):
+        if "boom" in descriptions:
+            raise ValueError("unparseable")
+        return parse_batch(descriptions, workers=workers)
+
+    worker.parse_cache.parse_batch = picky_parse
+    summary = worker.run()
+    assert worker.job_repo.saved == ["a", "c"]
+    assert (summary["saved"], summary["failed"], summary["skipped_dup"]) == (2, 2, 0)
+
+
+def test_failed_score_write_does_not_leave_jobs_unscored(worker_factory):
+    worker = worker_factory([StaticCollector([make_job("a"), make_job("b")])])
+    worker.job_repo, worker.app_repo = JobRepository(), ApplicationRepository()
+    upsert_scores = worker.app_repo.upsert_scores
+    calls = []
+
+    def flaky_upsert(items, conn=None):
+        calls.append(len(items))
+        if len(calls) == 1:
+            raise TimeoutError("no database connection free")
+        upsert_scores(items, conn=conn)
+
+    worker.app_repo.upsert_scores = flaky_upsert
+    summary = worker.run()
+    # The failed batch rolled back its jobs too; retried singly, both are scored
+    assert (summary["saved"], summary["failed"]) == (2, 0)
+    assert ApplicationRepository().count() == 2
+
+
+def test_jobs_are_persisted_while_collector_is_still_fetching(worker_factory):
+    gate = threading.Event()
+    worker = worker_factory([GatedCollector(gate)])
+    worker.job_repo = FakeJobRepo(on_save=lambda job: gate.set())
+
+    summary = worker.run()
+    assert worker.job_repo.saved == ["first", "second"]
+    assert summary["failed"] == 0
+
+
+def test_cancelled_cycle_stops_persisting(worker_factory):
+    gate = threading.Event()
+    worker = worker_factory([GatedCollector(gate)])
+
+    def cancel_after_first(job):
+        worker.cancel()
+        gate.set()
+
+    worker.job_repo = FakeJobRepo(on_save=cancel_after_first)
+    with pytest.raises(IngestCancelled):
+        worker.run()
+    assert worker.job_repo.saved == ["first"]
+
+
+def test_new_jobs_are_scored_for_every_profile(worker_factory):
+    resumes = {
+        user: ResumeProfile(name=user, skills=skills, experience_years=2,
+                            domains=[], certifications=[])
+        for user, skills in [("jo", ["docker", "aws"]), ("sam", ["docker"])]
+    }
+    worker = worker_factory([StaticCollector([make_job("a")])], resumes=resumes)
+
+    summary = worker.run()
+    assert summary["saved"] == 1
+    assert summary["profiles"] == 2
+    assert sorted(worker.app_repo.saved) == [("jo", "a", 100.0), ("sam", "a", 62.5)]
+
+
+def test_cross_source_near_duplicates_are_not_scored(worker_factory):
+    original = make_job("gh", POSTING)
+    mirror = replace(original, id="rss", source="weworkremotely-devops")
+    worker = worker_factory([StaticCollector([original]), StaticCollector([mirror], delay=0.1)])
+
+    summary = worker.run()
+    assert summary["saved"] == 2
+    assert summary["near_duplicates"] == 1
+    assert [job_id for _, job_id, _ in worker.app_repo.saved] == ["gh"]
+
+
+def test_interrupted_cycle_resumes_with_unfinished_companies(worker_factory):
+    scheduler = RefreshScheduler()
+    first = CompanyCollector(["a", "b", "c"], fail_at="b")
+    worker = worker_factory([first])
+    worker.scheduler = scheduler
+    worker.run(run_id="run-1")
+    assert first.fetched == ["a"]
+    assert scheduler.repo.get("company", "a")["cursor"] == "a@1"
+    assert [c["key"] for c in scheduler.repo.for_run("run-1")] == ["a"]
+
+    # The next run skips the company that is not due again yet
+    second = CompanyCollector(["a", "b", "c"])
+    worker = worker_factory([second])
+    worker.scheduler = scheduler
+    summary = worker.run(run_id="run-2")
+    assert second.fetched == ["b", "c"]
+    assert summary["saved"] == 2
+    assert worker.progress["persist"]["checkpoints"] == 2
+    assert [r["due"] for r in scheduler.schedule("company")] == [False] * 3
+
+
+def test_failed_job_fails_only_its_own_company(worker_factory):
+    scheduler = RefreshScheduler()
+    worker = worker_factory([BrokenCollector(), InterleavedCollector()])
+    worker.job_repo = FakeJobRepo(reject={"b-1"})
+    worker.scheduler = scheduler
+    worker.run()
+    stored = scheduler.repo.get("interleaved", "a")
+    assert stored["status"] == "done"
+    assert stored["changed_at"] is not None   # a-1 was new: the board changed
+    failed = scheduler.repo.get("interleaved", "b")
+    assert (failed["status"], failed["error"]) == ("failed", "1 of 1 jobs not stored")
+    assert scheduler.due("interleaved", ["a", "b"]) == ["b"]
+
+
+def test_refetched_board_without_new_jobs_backs_off(worker_factory):
+    scheduler = RefreshScheduler(policy=RefreshPolicy(initial=0.001, minimum=0))
+    worker = worker_factory([CompanyCollector(["a"])])
+    worker.scheduler = scheduler
+    worker.run()
+    time.sleep(0.01)
+    worker.run()   # same posting again: nothing new stored
+    assert scheduler.repo.get("company", "a")["refresh_interval"] == 0.002
+
+
+def test_fetch_wraps_iter_jobs():
+    gate = threading.Event()
+    gate.set()
+    assert [j.id for j in GatedCollector(gate).fetch()] == ["first", "second"]
+
+    class ListOnly(JobCollector):
+        def fetch(self):
+            return [make_job("x")]
+
+    assert [j.id for j in ListOnly().iter_jobs()] == ["x"]
@@ -0,0 +1,100 @@
+import io
+import time
+
+from monitoring import metrics
+from monitoring.metrics import CloudWatchSink, MemorySink, MetricsClient, StdoutSink
+
+
+def test_records_are_aggregated_until_flushed():
+    sink = MemorySink()
+    client = MetricsClient(sink, flush_interval=3600, dimensions={"Environment": "test"})
+    for _ in range(3):
+        client.increment("JobsSaved", 2)
+    client.gauge("DbPoolInUse", 4)
+    client.gauge("DbPoolInUse", 1)
+    for ms in (10, 10, 25):
+        client.timing("PersistMs", ms)
+    client.timing("FetchSeconds", 1.5, unit="Seconds", Collector="lever")
+    assert sink.batches == []
+
+    assert client.flush() == 4
+    assert sink.get("JobsSaved").value == 6
+    assert sink.get("DbPoolInUse").value == 1
+    assert sink.get("PersistMs").values == {10.0: 2, 25.0: 1}
+    assert sink.get("FetchSeconds").dimensions == (("Collector", "lever"), ("Environment", "test"))
+    assert client.flush() == 0
+    client.close()
+
+
+def test_flushes_in_batches_from_the_background_thread():
+    sink = MemorySink()
+    client = MetricsClient(sink, flush_interval=3600, max_batch=3)
+    for i in range(7):
+        client.increment(f"Metric{i}")
+    # A full batch wakes the flusher without waiting for the interval
+    deadline = time.time() + 2
+    while not sink.batches and time.time() < deadline:
+        time.sleep(0.01)
+    assert sink.batches and len(sink.batches[0]) <= 3
+
+    client.close()   # what atexit calls
+    assert sorted(d.name for d in sink.datums) == [f"Metric{i}" for i in range(7)]
+    assert all(len(batch) <= 3 for batch in sink.batches)
+    assert not client._thread.is_alive()
+
+
+def test_sink_failures_drop_the_batch_without_raising():
+    class Broken:
+        def send(self, datums):
+            raise ConnectionError("no route")
+
+    client = MetricsClient(Broken(), flush_interval=3600)
+    client.increment("JobsSaved")
+    assert client.flush() == 0
+    assert client.dropped == 1
+    client.close()
+
+
+def test_stdout_sink_writes_statsd_lines():
+    out = io.StringIO()
+    client = MetricsClient(StdoutSink(out), flush_interval=3600, dimensions={})
+    client.increment("JobsSaved", 3)
+    client.gauge("DbPoolInUse", 2, Pool="main")
+    client.timing("PersistMs", 12)
+    client.timing("PersistMs", 12)
+    client.close()
+    assert out.getvalue().splitlines() == [
+        "ApplyFlow.JobsSaved:3|c",
+        "ApplyFlow.DbPoolInUse:2|g|#Pool:main",
+        "ApplyFlow.PersistMs:12|h|@0.5",
+    ]
+
+
+def test_cloudwatch_sink_sends_one_call_per_batch():
+    class FakeCloudWatch:
+        def __init__(self):
+            self.calls = []
+
+        def put_metric_data(self, Namespace, MetricData):
+            self.calls.append((Namespace, MetricData))
+
+    sink = CloudWatchSink()
+    sink._client = FakeCloudWatch()
+    client = MetricsClient(sink, flush_interval=3600)
+    client.increment("JobsSaved", 5)
+    client.timing("IngestionDurationSeconds", 42.0, unit="Seconds")
+    client.close()
+
+    [(namespace, data)] = sink._client.calls
+    assert namespace == "ApplyFlow"
+    assert data[0]["Value"] == 5
+    assert (data[1]["Values"], data[1]["Counts"]) == ([42.0], [1.0])
+    assert data[1]["Dimensions"] == [{"Name": "Environment", "Value": "production"}]
+
+
+def test_module_helpers_use_the_configured_client(metrics_sink):
+    metrics.record_db_pool({"in_use": 1, "checkouts": 9, "avg_wait_ms": 0.5, "avg_checkout_ms": 3})
+    metrics.record_jobs_saved(2)
+    metrics.flush()
+    assert metrics_sink.get("DbPoolCheckouts").value == 9
+    assert metrics_sink.get("JobsSaved").value == 2
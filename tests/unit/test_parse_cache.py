@@ -0,0 +1,60 @@
+from infrastructure.repositories import ParseCacheRepository
+from services.parse_cache import ParseCache, content_hash
+from services.parser import extract_skills
+
+
+class FakeRepo:
+    def __init__(self):
+        self.rows = {}
+        self.lookups = 0
+
+    def get_many(self, hashes):
+        self.lookups += 1
+        return {h: self.rows[h] for h in hashes if h in self.rows}
+
+    def save_many(self, entries):
+        self.rows.update(entries)
+
+
+def test_content_hash_is_stable_and_distinct():
+    assert content_hash("docker") == content_hash("docker")
+    assert content_hash("docker") != content_hash("terraform")
+
+
+def test_parse_batch_counts_hits_and_misses():
+    cache = ParseCache(repo=FakeRepo())
+    texts = ["Docker and AWS, 3+ years", "Terraform"]
+
+    first = cache.parse_batch(texts)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert first[0].skills == extract_skills(texts[0])
+    assert first[0].years == 3
+
+    second = cache.parse_batch(texts)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert second == first
+
+
+def test_persistent_tier_survives_new_process():
+    repo = FakeRepo()
+    ParseCache(repo=repo).parse_batch(["Kubernetes, 5 years of experience"])
+
+    fresh = ParseCache(repo=repo)
+    [parsed] = fresh.parse_batch(["Kubernetes, 5 years of experience"])
+    assert parsed.skills == ["kubernetes"]
+    assert parsed.years == 5
+    assert (fresh.hits, fresh.misses) == (1, 0)
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ParseCache(repo=FakeRepo(), max_entries=1)
+    cache.parse_batch(["aws"])
+    cache.parse_batch(["gcp"])
+    assert list(cache._lru) == [content_hash("gcp")]
+
+
+def test_repository_round_trip(sqlite_db):
+    repo = ParseCacheRepository()
+    repo.save_many({"abc": (["aws", "docker"], 2)})
+    repo.save_many({"abc": (["ignored"], 9)})
+    assert repo.get_many(["abc", "missing"]) == {"abc": (["aws", "docker"], 2)}
@@ -1,4 +1,4 @@
-from services.parser import extract_skills, extract_years
+from services.parser import SkillMatcher, extract_batch, extract_skills, extract_years
 
 
 def test_extract_known_skills():
@@ -40,4 +40,38 @@ def test_extract_years_not_found():
 
 def test_extract_years_multiple_takes_minimum():
     text = "2+ years required, ideally 5 years of experience"
-    assert extract_years(text) == 2
\ No newline at end of file
+    assert extract_years(text) == 2
+
+def test_extract_skills_respects_word_boundaries():
+    text = "Join Google and publish to GitHub."
+    skills = extract_skills(text)
+    assert "go" not in skills
+    assert "git" not in skills
+    assert "github" in skills
+
+
+def test_extract_skills_reports_nested_skills():
+    skills = extract_skills("Pipelines run on GitHub Actions.")
+    assert "github actions" in skills
+    assert "github" in skills
+
+
+def test_extract_skills_keeps_vocabulary_order():
+    skills = extract_skills("Python first, then Docker, then AWS.")
+    assert skills == ["aws", "docker", "python"]
+
+
+def test_skill_matcher_orders_by_appearance():
+    matcher = SkillMatcher(["aws", "docker", "python"])
+    assert matcher.find("python, docker and aws") == ["python", "docker", "aws"]
+
+
+def test_extract_batch_matches_per_job_results():
+    texts = [
+        "Terraform and AWS, 3+ years of experience",
+        "No requirements listed",
+        "Kubernetes, Go and Python; 5-7 years",
+    ]
+    parsed = extract_batch(texts)
+    assert [p.skills for p in parsed] == [extract_skills(t) for t in texts]
+    assert [p.years for p in parsed] == [extract_years(t) for t in texts]
@@ -0,0 +1,158 @@
+from domain.application import Application, ApplicationStatus
+from infrastructure.repositories import (
+    ApplicationRepository,
+    CheckpointRepository,
+    JobRepository,
+)
+from tests.factories import make_result, make_stored_job, seed_scored
+
+
+def test_save_many_returns_only_new_ids(sqlite_db):
+    repo = JobRepository()
+    assert repo.save_many([make_stored_job("a"), make_stored_job("b")]) == ["a", "b"]
+    assert repo.save_many([make_stored_job("b"), make_stored_job("c")]) == ["c"]
+    assert repo.count() == 3
+
+
+def test_upsert_many_inserts_then_updates(sqlite_db):
+    JobRepository().save_many([make_stored_job("a"), make_stored_job("b")])
+    repo = ApplicationRepository()
+    repo.upsert_many([
+        (Application(job_id="a"), make_result(40.0)),
+        (Application(job_id="b"), make_result(60.0)),
+    ])
+    repo.upsert_many([(Application(job_id="a"), make_result(90.0))])
+
+    rows = repo.get_all()
+    assert [(r["job_id"], r["match_score"]) for r in rows] == [("a", 90.0), ("b", 60.0)]
+
+
+def test_scores_are_kept_per_user(sqlite_db):
+    JobRepository().save_many([make_stored_job("a"), make_stored_job("b")])
+    repo = ApplicationRepository()
+    repo.upsert_many([
+        (Application(job_id="a", user_id="jo"), make_result(40.0)),
+        (Application(job_id="a", user_id="sam"), make_result(70.0)),
+        (Application(job_id="b", user_id="sam"), make_result(20.0)),
+    ])
+    repo.update_status("a", ApplicationStatus.APPLIED, user_id="sam")
+
+    assert repo.count() == 3
+    assert repo.status_counts(user_id="jo") == {"new": 1}
+    repo.update_status("a", ApplicationStatus.REJECTED)   # default profile has no row
+    assert repo.status_counts(user_id="jo") == {"new": 1}
+    rows, total = repo.search(user_id="sam")
+    assert [(r["job_id"], r["status"]) for r in rows] == [("a", "applied"), ("b", "new")]
+    assert total == 2
+
+    # Without a user filter the cursor breaks (score, job_id) ties on user_id
+    first, _ = repo.search(limit=1, min_score=30)
+    last = first[-1]
+    rest, _ = repo.search(after=(last["match_score"], last["job_id"], last["user_id"]))
+    assert [(r["user_id"], r["job_id"]) for r in first + rest] == [
+        ("sam", "a"), ("jo", "a"), ("sam", "b"),
+    ]
+
+
+def test_search_pages_with_keyset_cursor(sqlite_db):
+    seed_scored({"a": 50.0, "b": 90.0, "c": 50.0, "d": 10.0})
+    repo = ApplicationRepository()
+
+    first, total = repo.search(limit=2)
+    assert [r["job_id"] for r in first] == ["b", "a"]
+    assert total == 4
+
+    last = first[-1]
+    second, _ = repo.search(limit=2, after=(last["match_score"], last["job_id"]))
+    assert [r["job_id"] for r in second] == ["c", "d"]
+
+
+def test_search_cursor_keeps_ties_on_an_inexact_score(sqlite_db):
+    seed_scored({"a": 73.3, "b": 73.3, "c": 73.3})
+    repo = ApplicationRepository()
+    pages, after = [], None
+    while rows := repo.search(limit=1, after=after)[0]:
+        pages += [r["job_id"] for r in rows]
+        after = (rows[-1]["match_score"], rows[-1]["job_id"])
+    assert pages == ["a", "b", "c"]
+
+
+def test_search_filters_in_sql_and_projects(sqlite_db):
+    seed_scored({"a": 80.0, "b": 20.0})
+    seed_scored({"z": 95.0}, company="other")
+
+    rows, total = ApplicationRepository().search(company="acme", min_score=50, summary=True)
+    assert [r["job_id"] for r in rows] == ["a"]
+    assert total == 1
+    assert "missing_skills" not in rows[0]
+
+
+def test_aggregates_run_in_sql(sqlite_db):
+    seed_scored({"a": 80.0, "b": 20.0})
+    repo = ApplicationRepository()
+    repo.update_status("a", ApplicationStatus.APPLIED)
+
+    assert repo.status_counts() == {"applied": 1, "new": 1}
+    assert repo.missing_skill_counts() == [("go", 2)]
+
+
+def test_job_skills_dual_write_and_queries(sqlite_db):
+    repo = JobRepository()
+    a, b = make_stored_job("a"), make_stored_job("b")
+    a.required_skills = ["terraform", "aws"]
+    b.required_skills = ["aws", "kubernetes"]
+    repo.save_many([a, b])
+
+    assert repo.jobs_requiring(["aws"]) == ["a", "b"]
+    assert repo.jobs_requiring(["AWS", "terraform"]) == ["a"]
+    assert repo.jobs_requiring(["terraform", "kubernetes"], match_all=False) == ["a", "b"]
+    assert repo.skill_frequency()[0] == ("aws", 2)
+    assert repo.skill_frequency(exclude=["aws"]) == [("kubernetes", 1), ("terraform", 1)]
+
+
+def test_backfill_skills_fills_legacy_rows(sqlite_db):
+    from infrastructure.database import connection
+    with connection() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, title, company, required_skills) VALUES (?, ?, ?, ?)",
+            ("legacy", "SRE", "acme", '["docker", "aws"]'),
+        )
+    repo = JobRepository()
+    assert repo.backfill_skills(batch_size=1) == 1
+    assert repo.backfill_skills() == 0
+    assert repo.jobs_requiring(["docker"]) == ["legacy"]
+
+
+def test_search_filters_on_required_skills(sqlite_db):
+    seed_scored({"a": 80.0, "b": 70.0})
+    rows, total = ApplicationRepository().search(skills=["aws"])
+    assert total == 2
+    rows, total = ApplicationRepository().search(skills=["aws", "kubernetes"])
+    assert total == 0
+
+
+def test_save_many_replaces_jobs_with_a_new_source_version(sqlite_db):
+    repo = JobRepository()
+    job = make_stored_job("a")
+    job.source_updated_at = "v1"
+    repo.save_many([job])
+
+    job.required_skills, job.source_updated_at = ["go"], "v2"
+    assert repo.save_many([job]) == ["a"]
+    assert repo.jobs_requiring(["aws"]) == []
+    assert repo.jobs_requiring(["go"]) == ["a"]
+    assert repo.save_many([job]) == []
+
+
+def test_failed_fetch_keeps_the_last_checkpoint(sqlite_db):
+    repo = CheckpointRepository()
+    repo.record("greenhouse", "acme", "r1", fetched=4, cursor="2026-01-01")
+    repo.record("greenhouse", "acme", "r2", error="timeout")
+    row = repo.get("greenhouse", "acme")
+    assert (row["status"], row["cursor"], row["error"]) == ("failed", "2026-01-01", "timeout")
+    assert row["succeeded_at"] is not None
+    # Never scheduled (no next_due_at), so both are due; unfetched first
+    assert repo.due("greenhouse", ["acme", "new"]) == ["new", "acme"]
+
+    repo.record("greenhouse", "acme", "r3", fetched=0)   # unchanged board
+    assert repo.get("greenhouse", "acme")["cursor"] == "2026-01-01"
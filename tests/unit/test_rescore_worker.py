@@ -0,0 +1,93 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from domain.application import Application, ApplicationStatus
+from domain.profile import ExperienceLevel, SearchProfile
+from domain.scoring import ScoringEngine
+from infrastructure.repositories import ApplicationRepository, JobRepository
+from tests.factories import make_stored_job
+from workers.rescore_worker import ProfileChange, RescoreProgress, RescoreWorker
+
+
+def make_profile(skills: list[str], years: int = 2) -> SearchProfile:
+    return SearchProfile(
+        user_id="jo", name="Jo", role_keywords=[], required_stack=[], preferred_stack=[],
+        experience_level=ExperienceLevel.ENTRY, skills=skills, experience_years=years,
+    )
+
+
+def seed_jobs():
+    jobs = [make_stored_job("aws"), make_stored_job("go"), make_stored_job("senior")]
+    jobs[1].required_skills = ["go"]
+    jobs[2].required_skills = ["aws"]
+    jobs[2].required_years = 6
+    JobRepository().save_many(jobs)
+    return jobs
+
+
+def test_profile_change_tracks_only_score_inputs():
+    old = make_profile(["AWS", "docker"], years=2)
+    assert not ProfileChange.between(old, make_profile(["docker", "aws"], years=2))
+
+    change = ProfileChange.between(old, make_profile(["aws", "go"], years=4))
+    assert change.skills == {"docker", "go"}
+    assert change.more_years_than == 2
+    assert ProfileChange.between(None, old).all_jobs
+
+    certified = make_profile(["AWS", "docker"], years=2)
+    certified.certifications = ["CKA"]
+    assert not ProfileChange.between(old, certified)
+    assert ProfileChange.between(old, certified, semantic=True).all_jobs
+
+    # Semantic scores compare the embedded resume text with every job
+    edited = make_profile(["aws", "docker", "go"], years=2)
+    assert ProfileChange.between(old, edited).skills == {"go"}
+    assert ProfileChange.between(old, edited, semantic=True).all_jobs
+    older = make_profile(["AWS", "docker"], years=3)
+    assert not ProfileChange.between(old, older, semantic=True).all_jobs
+
+
+def test_rescore_touches_only_affected_jobs_and_keeps_status(sqlite_db):
+    jobs = seed_jobs()
+    old = make_profile(["aws"])
+    engine = ScoringEngine()
+    repo = ApplicationRepository()
+    repo.upsert_many([
+        (Application(job_id=job.id, user_id="jo"), engine.score(job, old.to_resume()))
+        for job in jobs
+    ])
+    repo.update_status("go", ApplicationStatus.APPLIED, user_id="jo")
+
+    new = make_profile(["aws", "go"])
+    worker = RescoreWorker(new, batch_size=1)
+    progress = worker.run(
+        RescoreProgress(id="r", user_id="jo", change=ProfileChange.between(old, new))
+    )
+    assert (progress.state, progress.done, progress.total) == ("done", 1, 1)
+
+    rows = {r["job_id"]: r for r in repo.get_all(user_id="jo")}
+    assert rows["go"]["match_score"] == 100.0
+    assert rows["go"]["status"] == "applied"
+    assert rows["senior"]["match_score"] == engine.score(jobs[2], old.to_resume()).final_score
+
+
+def test_saving_a_profile_rescores_in_background(sqlite_db):
+    seed_jobs()
+    client = TestClient(app)
+    body = {"user_id": "jo", "name": "Jo", "role_keywords": [], "required_stack": [],
+            "skills": ["aws"], "experience_years": 2}
+
+    created = client.post("/profiles", json=body).json()
+    assert created["rescore_id"]
+    deadline = time.time() + 5
+    while (progress := client.get("/profiles/jo/rescore").json())["state"] != "done":
+        assert time.time() < deadline, progress
+        time.sleep(0.02)
+    assert progress["id"] == created["rescore_id"]
+    assert progress["total"] == 3
+    assert ApplicationRepository().count(user_id="jo") == 3
+
+    # Same score inputs: nothing to rescore
+    assert client.post("/profiles", json=body).json()["rescore_id"] is None
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+
+from api.main import app
+from services.scheduler import RefreshPolicy, RefreshScheduler
+
+
+def test_static_boards_back_off_and_busy_boards_speed_up(sqlite_db):
+    scheduler = RefreshScheduler(policy=RefreshPolicy(initial=100, minimum=50, maximum=400))
+    static = [scheduler.record("greenhouse", "static", "r", 3, saved=0) for _ in range(4)]
+    busy = [scheduler.record("greenhouse", "busy", "r", 3, saved=2) for _ in range(3)]
+    assert static == [100, 200, 400, 400]
+    assert busy == [100, 50, 50]
+
+    # A failure leaves the schedule alone
+    assert scheduler.record("greenhouse", "busy", "r", error="timeout") is None
+    assert scheduler.repo.get("greenhouse", "busy")["refresh_interval"] == 50
+
+    # A feed that re-yields the same entries stores nothing new: unchanged
+    assert scheduler.record("rss", "quiet", "r", 40) == 100
+    assert scheduler.record("rss", "quiet", "r", 40) == 200
+
+    assert scheduler.due("greenhouse", ["new", "static", "busy"]) == ["new"]
+    later = "9999-01-01T00:00:00"
+    assert scheduler.repo.due("greenhouse", ["static", "busy"], now=later) == ["busy", "static"]
+
+
+def test_schedule_is_exposed_through_the_api(sqlite_db):
+    scheduler = RefreshScheduler(policy=RefreshPolicy(initial=100, minimum=50))
+    scheduler.record("greenhouse", "acme", "r", 2, cursor="v1", saved=2)
+    scheduler.record("lever", "globex", "r", error="boom")
+
+    rows = TestClient(app).get("/jobs/schedule").json()["schedule"]
+    assert [(r["source"], r["key"], r["due"]) for r in rows] == [
+        ("lever", "globex", True), ("greenhouse", "acme", False),
+    ]
+    assert rows[1]["refresh_interval"] == 100
+    only = TestClient(app).get("/jobs/schedule", params={"source": "greenhouse"}).json()
+    assert [r["key"] for r in only["schedule"]] == ["acme"]
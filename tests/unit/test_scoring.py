@@ -1,7 +1,10 @@
+import random
+
 import pytest
-from domain.job import Job
+
 from domain.resume import ResumeProfile
 from domain.scoring import ScoringEngine
+from tests.factories import make_job
 
 
 @pytest.fixture
@@ -20,22 +23,6 @@ def resume():
     )
 
 
-def make_job(**kwargs):
-    defaults = dict(
-        id="test-1",
-        title="SRE Engineer",
-        company="testco",
-        location="Remote",
-        description="",
-        required_skills=["docker", "terraform", "aws"],
-        required_years=2,
-        source="greenhouse",
-        source_url="https://example.com",
-    )
-    defaults.update(kwargs)
-    return Job(**defaults)
-
-
 def test_perfect_match(engine, resume):
     job = make_job(required_skills=["docker", "terraform", "aws"], required_years=2)
     result = engine.score(job, resume)
@@ -77,4 +64,61 @@ def test_no_required_skills(engine, resume):
 def test_score_range(engine, resume):
     job = make_job(required_skills=["docker", "kubernetes", "helm"], required_years=5)
     result = engine.score(job, resume)
-    assert 0.0 <= result.final_score <= 100.0
\ No newline at end of file
+    assert 0.0 <= result.final_score <= 100.0
+
+def test_score_many_matches_score(engine, resume):
+    rng = random.Random(5)
+    pool = ["docker", "terraform", "aws", "python", "kubernetes", "helm", "go", "GitHub Actions"]
+    jobs = [
+        make_job(
+            id=f"job-{i}",
+            required_skills=rng.sample(pool, rng.randint(0, len(pool))),
+            required_years=rng.randint(0, 8),
+        )
+        for i in range(200)
+    ]
+    batch = engine.score_many(jobs, resume)
+    assert batch.job_ids == [j.id for j in jobs]
+    for i, job in enumerate(jobs):
+        expected = engine.score(job, resume)
+        assert batch.result(i) == expected
+        assert batch.final_score[i] == pytest.approx(expected.final_score)
+
+
+def test_score_many_reuses_encoded_jobs(engine, resume):
+    jobs = [make_job(required_skills=["docker", "kubernetes"], required_years=0)]
+    matrix = engine.encode_jobs(jobs)
+    other = ResumeProfile(name="o", skills=["kubernetes"], experience_years=0,
+                          domains=[], certifications=[])
+
+    assert engine.score_many(matrix, resume).result(0).matched_skills == ["docker"]
+    assert engine.score_many(matrix, other).result(0).matched_skills == ["kubernetes"]
+
+
+def test_matrix_survives_a_growing_shared_vocabulary(engine, resume):
+    matrix = engine.encode_jobs([make_job(required_skills=["docker"], required_years=0)])
+    # Later encodes add skills past the first matrix's bit width
+    engine.encode_jobs(
+        [make_job(required_skills=[f"skill-{i}" for i in range(16)] + ["aws"])], matrix.vocab
+    )
+    result = engine.score_many(matrix, resume).result(0)
+    assert result.matched_skills == ["docker"]
+    assert result.keyword_coverage == 100.0
+
+
+def test_score_many_empty(engine, resume):
+    assert len(engine.score_many([], resume)) == 0
+
+
+def test_score_matrix_matches_score_per_resume(engine, resume):
+    jobs = [
+        make_job(id="a", required_skills=["docker", "go"], required_years=5),
+        make_job(id="b", required_skills=[], required_years=0),
+    ]
+    other = ResumeProfile(name="o", skills=["go", "rust"], experience_years=6,
+                          domains=[], certifications=[])
+
+    batches = engine.score_matrix(jobs, [resume, other])
+    assert len(batches) == 2
+    for batch, r in zip(batches, [resume, other]):
+        assert list(batch.results()) == [engine.score(job, r) for job in jobs]
@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from domain.application import DEFAULT_USER_ID
+from domain.resume import ResumeProfile
+from infrastructure.repositories import (
+    CheckpointRepository,
+    IngestRunRepository,
+    LeaseRepository,
+    ProfileRepository,
+)
+
+if TYPE_CHECKING:
+    from workers.ingestion_worker import IngestionWorker
+
+logger = logging.getLogger(__name__)
+
+# One ingestion at a time across API processes and scheduled tasks. The
+# running cycle renews the lease every TTL/3 seconds; if its process dies
+# the lease lapses after INGEST_LEASE_TTL and the next trigger takes over.
+INGEST_LEASE = "ingest"
+INGEST_LEASE_TTL = float(os.getenv("INGEST_LEASE_TTL", "300"))
+
+# Fallback resume — used if no profile exists in DB yet
+DEFAULT_RESUME = ResumeProfile(
+    name="Piriyajeishree",
+    skills=[
+        "docker", "terraform", "aws", "python", "github actions",
+        "cloudwatch", "ecs", "ec2", "s3", "iam", "jenkins",
+        "bash", "git", "linux", "postgresql",
+    ],
+    experience_years=2,
+    domains=["SRE", "DevOps", "Cloud"],
+    certifications=["AWS Certified Cloud Practitioner"],
+)
+
+DEFAULT_COMPANIES = [
+    "cloudflare",
+    "datadog",
+    "elastic",
+    "mongodb",
+]
+
+
+def resolve_targets() -> tuple[dict[str, ResumeProfile], list[str]]:
+    """Resumes to score for (user_id → resume) and companies to fetch."""
+    profiles = ProfileRepository().get_all_active()
+    if not profiles:
+        logger.info("No profile found — using defaults")
+        return {DEFAULT_USER_ID: DEFAULT_RESUME}, DEFAULT_COMPANIES
+    logger.info(f"Scoring for {len(profiles)} profiles: {[p.name for p in profiles]}")
+    resumes = {profile.user_id: profile.to_resume() for profile in profiles}
+    # One fetch covers every profile's companies
+    companies = sorted({c for p in profiles for c in p.companies}) or DEFAULT_COMPANIES
+    return resumes, companies
+
+
+def build_worker() -> "IngestionWorker":
+    """The production pipeline: every collector, every active profile."""
+    from services.collectors.greenhouse import GreenhouseCollector
+    from services.collectors.remotive import RemotiveCollector
+    from services.collectors.rss import RSSCollector
+    from services.embeddings import default_index
+    from services.scheduler import RefreshScheduler
+    from workers.ingestion_worker import IngestionWorker
+
+    resumes, companies = resolve_targets()
+    logger.info(f"Tracking {len(companies)} companies: {companies}")
+    return IngestionWorker(
+        collectors=[
+            GreenhouseCollector(companies=companies),
+            RemotiveCollector(),
+            RSSCollector(),
+        ],
+        resumes=resumes,
+        embeddings=default_index(),
+        scheduler=RefreshScheduler(),
+    )
+
+
+class IngestBusy(Exception):
+    """Another ingestion holds the lease."""
+
+    def __init__(self, run_id: str | None):
+        super().__init__(f"ingestion {run_id} is already running")
+        self.run_id = run_id
+
+
+class IngestRun:
+    """
+    One ingestion cycle, recorded in ingest_runs. claim() takes the ingest
+    lease (or raises IngestBusy); execute() runs the worker, saving its
+    per-stage progress with every lease renewal and the summary at the end.
+    If a renewal finds the lease taken, the worker is cancelled and the
+    run is recorded as failed.
+    """
+
+    def __init__(
+        self,
+        trigger: str = "manual",
+        worker_factory: Callable[[], "IngestionWorker"] | None = None,
+        lease_ttl: float = INGEST_LEASE_TTL,
+    ):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.worker_factory = worker_factory or build_worker
+        self.lease_ttl = lease_ttl
+        self.runs = IngestRunRepository()
+        self.leases = LeaseRepository()
+
+    def claim(self) -> None:
+        if not self.leases.acquire(INGEST_LEASE, self.id, self.lease_ttl):
+            raise IngestBusy(self.leases.holder(INGEST_LEASE))
+        # Runs whose process died without finishing
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lease_ttl)
+        self.runs.abandon_stale(cutoff.isoformat())
+        self.runs.create(self.id, self.trigger)
+
+    def _heartbeat(self, worker_ref: list, stop: threading.Event, lost: threading.Event) -> None:
+        while not stop.wait(self.lease_ttl / 3):
+            try:
+                if not self.leases.renew(INGEST_LEASE, self.id, self.lease_ttl):
+                    # Another run may hold it now: stop rather than ingest alongside it
+                    logger.warning(f"[ingest] {self.id}: lease lost, cancelling")
+                    lost.set()
+                    if worker_ref:
+                        worker_ref[0].cancel()
+                    return
+                self.runs.update(
+                    self.id,
+                    heartbeat_at=datetime.utcnow().isoformat(),
+                    progress=worker_ref[0].progress if worker_ref else None,
+                )
+            except Exception as e:
+                logger.warning(f"[ingest] {self.id}: heartbeat failed — {e}")
+
+    def execute(self) -> dict | None:
+        """Run the claimed cycle to completion. Returns the worker's summary."""
+        worker_ref: list = []
+        stop, lost = threading.Event(), threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(worker_ref, stop, lost),
+            name=f"ingest-heartbeat-{self.id[:8]}", daemon=True,
+        )
+        beat.start()
+        summary, state, error = None, "done", None
+        try:
+            worker_ref.append(self.worker_factory())
+            if lost.is_set():   # lost while the worker was being built
+                worker_ref[0].cancel()
+            summary = worker_ref[0].run(run_id=self.id)
+        except Exception as e:
+            logger.error(f"[ingest] {self.id}: failed — {e}")
+            state, error = "failed", str(e)
+        finally:
+            stop.set()
+            beat.join()
+            try:
+                self.runs.update(
+                    self.id,
+                    state=state,
+                    error=error,
+                    summary=summary,
+                    progress=worker_ref[0].progress if worker_ref else None,
+                    finished_at=datetime.utcnow().isoformat(),
+                )
+            finally:
+                self.leases.release(INGEST_LEASE, self.id)
+        return summary
+
+
+def start_ingest(trigger: str = "api", **kwargs) -> IngestRun:
+    """Claim the lease and run one cycle in a background thread."""
+    run = IngestRun(trigger=trigger, **kwargs)
+    run.claim()
+    threading.Thread(target=run.execute, name=f"ingest-{run.id[:8]}", daemon=True).start()
+    return run
+
+
+def get_run(run_id: str) -> dict | None:
+    """The run's ingest_runs row plus the companies (and feeds) it fetched."""
+    run = IngestRunRepository().get(run_id)
+    if run:
+        run["companies"] = CheckpointRepository().for_run(run_id)
+    return run
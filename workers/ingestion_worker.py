@@ -1,83 +1,474 @@
+import asyncio
 import logging
+import queue
+import threading
 import time
+import uuid
+from dataclasses import dataclass
 
-from domain.application import Application
+from domain.application import DEFAULT_USER_ID, Application
+from domain.job import Job
 from domain.resume import ResumeProfile
-from domain.scoring import ScoringEngine
-from infrastructure.database import init_db
+from domain.scoring import ScoreResult, ScoringEngine
+from infrastructure.database import connection, init_db, pool_stats
 from infrastructure.repositories import ApplicationRepository, JobRepository
 from services.collectors.base import JobCollector
-from services.parser import extract_skills, extract_years
+from services.collectors.http import HttpClient
+from services.collectors.runtime import FETCH_DEADLINE, run_collectors
+from services.dedup import DedupIndex
+from services.embeddings import SEMANTIC_WEIGHT, EmbeddingIndex
+from services.parse_cache import ParseCache
+from services.scheduler import RefreshScheduler
 from monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
 
+class IngestCancelled(Exception):
+    """The cycle was cancelled part-way; jobs already persisted are kept."""
+
+
+@dataclass
+class _CollectorDone:
+    name: str
+    fetched: int
+    elapsed: float
+    error: Exception | None = None
+
+
+@dataclass
+class _ParseFailed:
+    job_id: str
+    error: Exception
+
+
+@dataclass
+class _CheckpointReached:
+    """A collector yielded every job for `key`; recorded once they are persisted."""
+    source: str
+    key: str
+    job_ids: list[str]
+    cursor: str | None = None
+
+
+_END = None  # parse stage → persist stage: no more messages
+
+
+def source_name(collector: JobCollector) -> str:
+    """Checkpoint namespace of a collector: GreenhouseCollector → "greenhouse"."""
+    return type(collector).__name__.removesuffix("Collector").lower()
+
+
+class _SourceCheckpoints:
+    """
+    A collector's view of the refresh schedule. Failures are recorded
+    straight away; successes travel down the pipeline behind the
+    company's jobs and are recorded once those jobs are persisted.
+    """
+
+    def __init__(self, scheduler: RefreshScheduler, source: str, run_id: str, put):
+        self.scheduler = scheduler
+        self.source = source
+        self.run_id = run_id
+        self.put = put
+
+    def due(self, keys: list[str]) -> list[str]:
+        return self.scheduler.due(self.source, keys)
+
+    async def record(
+        self, key: str, job_ids: list[str], cursor: str | None = None, error: str | None = None
+    ) -> None:
+        if error is None:
+            await self.put(_CheckpointReached(self.source, key, job_ids, cursor))
+            return
+        try:
+            await asyncio.to_thread(
+                self.scheduler.record, self.source, key, self.run_id, len(job_ids), error=error
+            )
+        except Exception as e:
+            logger.warning(f"[worker] {self.source}/{key}: checkpoint failed — {e}")
+
+
 class IngestionWorker:
     """
     Orchestrates the full ingest → parse → score → persist pipeline.
-    Publishes CloudWatch metrics on every run.
+    Records metrics (monitoring.metrics) on every run.
+
+    The cycle is a streaming pipeline joined by bounded queues:
+
+        fetch (all collectors on one event loop) → parse (micro-batches)
+            → dedupe → persist → cluster near-duplicates → score (calling thread)
+
+    Jobs reach the database while collectors are still fetching, and
+    the queues cap how many jobs are held in memory at once. Collectors
+    share one pooled HttpClient; `fetch_deadline` (FETCH_DEADLINE) bounds
+    the fetch stage, keeping whatever was collected in time.
+
+    Each new job is scored for every profile in `resumes` (user_id →
+    resume) in a single jobs × profiles pass; `resume` alone scores for
+    DEFAULT_USER_ID. With an EmbeddingIndex, new descriptions are embedded
+    once and semantic similarity is blended into the scores.
+
+    New jobs are MinHash-indexed (DedupIndex); a near-duplicate of a job
+    from another source joins that job's cluster and is not scored.
+
+    With a RefreshScheduler, each company (or feed) is checkpointed in
+    fetch_checkpoints once its jobs are persisted and given its next
+    refresh time from how often its board changes. Collectors fetch only
+    the companies that are due, so a cycle that was killed part-way
+    resumes with the companies it had not finished.
+
+    cancel() stops a running cycle from another thread: collectors stop at
+    their next job, nothing more is persisted or checkpointed, and run()
+    raises IngestCancelled once the stages have drained.
     """
 
     def __init__(
         self,
         collectors: list[JobCollector],
-        resume: ResumeProfile,
+        resume: ResumeProfile | None = None,
         scoring_engine: ScoringEngine | None = None,
+        parse_cache: ParseCache | None = None,
+        queue_size: int = 500,
+        parse_batch_size: int = 100,
+        persist_batch_size: int = 200,
+        resumes: dict[str, ResumeProfile] | None = None,
+        embeddings: EmbeddingIndex | None = None,
+        http: HttpClient | None = None,
+        fetch_deadline: float | None = FETCH_DEADLINE,
+        dedup: DedupIndex | None = None,
+        scheduler: RefreshScheduler | None = None,
     ):
+        if resumes is None:
+            if resume is None:
+                raise ValueError("IngestionWorker needs a resume or resumes")
+            resumes = {DEFAULT_USER_ID: resume}
         self.collectors = collectors
-        self.resume = resume
-        self.engine = scoring_engine or ScoringEngine()
+        self.http = http
+        self.fetch_deadline = fetch_deadline
+        self.resumes = resumes
+        self.embeddings = embeddings
+        self.engine = scoring_engine or ScoringEngine(
+            semantic_weight=SEMANTIC_WEIGHT if embeddings else 0.0
+        )
+        self.parse_cache = parse_cache or ParseCache()
+        self.dedup = dedup or DedupIndex()
+        self.scheduler = scheduler
+        self.run_id: str | None = None
+        self.queue_size = queue_size
+        self.parse_batch_size = parse_batch_size
+        self.persist_batch_size = persist_batch_size
         self.job_repo = JobRepository()
         self.app_repo = ApplicationRepository()
+        self.progress = self._new_progress()
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop the running cycle between batches (e.g. its lease was lost)."""
+        self._cancelled.set()
+
+    def _new_progress(self) -> dict[str, dict[str, int]]:
+        """Per-stage counters of the current run, readable from other threads."""
+        return {
+            "fetch": {"collectors": len(self.collectors), "collectors_done": 0, "jobs": 0},
+            "parse": {"jobs": 0},
+            "persist": {"saved": 0, "skipped_dup": 0, "failed": 0, "checkpoints": 0},
+        }
+
+    # ── Stages ────────────────────────────────────────────────────────────────
+
+    def _fetch_stage(self, out: queue.Queue) -> None:
+        """Run every collector on one event loop with a shared HTTP client."""
+
+        async def put(item) -> None:
+            try:
+                out.put_nowait(item)
+            except queue.Full:
+                # Downstream is behind: wait in a thread, not on the loop
+                await asyncio.to_thread(out.put, item)
+
+        def on_job(collector, job):
+            if self._cancelled.is_set():
+                raise IngestCancelled("cycle cancelled")
+            self.progress["fetch"]["jobs"] += 1
+            return put(job)
 
-    def run(self) -> dict:
+        def on_done(collector, fetched, elapsed, error):
+            self.progress["fetch"]["collectors_done"] += 1
+            return put(_CollectorDone(collector.__class__.__name__, fetched, elapsed, error))
+
+        if self.scheduler is not None:
+            for collector in self.collectors:
+                collector.checkpoints = _SourceCheckpoints(
+                    self.scheduler, source_name(collector), self.run_id, put,
+                )
+        try:
+            asyncio.run(run_collectors(
+                self.collectors,
+                on_job=on_job,
+                on_done=on_done,
+                http=self.http,
+                deadline=self.fetch_deadline,
+            ))
+        finally:
+            if self.scheduler is not None:
+                for collector in self.collectors:
+                    collector.checkpoints = None
+
+    def _parse_stage(self, inbox: queue.Queue, out: queue.Queue) -> None:
+        pending = len(self.collectors)
+        batch: list[Job] = []
+
+        def parse(jobs: list[Job]) -> None:
+            # Micro-batches stay far below POOL_MIN_BATCH: parsed in-process
+            parsed = self.parse_cache.parse_batch([job.description for job in jobs])
+            for job, jd in zip(jobs, parsed):
+                job.required_skills = jd.skills
+                job.required_years = jd.years
+                out.put(job)
+            self.progress["parse"]["jobs"] += len(jobs)
+
+        def flush():
+            if not batch:
+                return
+            try:
+                parse(batch)
+            except Exception:
+                # One bad description must not sink the rest of the batch
+                for job in batch:
+                    try:
+                        parse([job])
+                    except Exception as e:
+                        out.put(_ParseFailed(job.id, e))
+            batch.clear()
+
+        try:
+            while pending:
+                try:
+                    msg = inbox.get_nowait()
+                except queue.Empty:
+                    # Nothing waiting: don't hold parsed-ready jobs back
+                    flush()
+                    msg = inbox.get()
+
+                if isinstance(msg, _CollectorDone | _CheckpointReached):
+                    # Everything before the marker goes downstream first
+                    flush()
+                    out.put(msg)
+                    if isinstance(msg, _CollectorDone):
+                        pending -= 1
+                    continue
+
+                batch.append(msg)
+                if len(batch) >= self.parse_batch_size:
+                    flush()
+            flush()
+        finally:
+            out.put(_END)
+
+    def _persist_batch(self, jobs: list[Job]) -> set[str]:
+        """
+        Score the new or updated jobs, then save the batch and those scores
+        in one transaction, so a failed write never leaves a stored job
+        unscored. Returns the IDs that were new or updated.
+        """
+        scored = self._score(self.job_repo.changed(jobs))
+        with connection() as conn:
+            new_ids = set(self.job_repo.save_many(jobs, conn=conn))
+            # Updated listings keep their application status
+            self.app_repo.upsert_scores(
+                [(app, result) for app, result in scored if app.job_id in new_ids], conn=conn,
+            )
+        return new_ids
+
+    def _score(self, jobs: list[Job]) -> list[tuple[Application, ScoreResult]]:
+        """Applications for every profile × the jobs leading their near-duplicate cluster."""
+        if not jobs:
+            return []
+        canonical = self._canonical(jobs)
+        if not canonical:
+            return []
+        resumes = list(self.resumes.values())
+        batches = self.engine.score_matrix(
+            canonical, resumes, **self._vectors(canonical, resumes)
+        )
+        scored = []
+        for user_id, batch in zip(self.resumes, batches):
+            for i, job_id in enumerate(batch.job_ids):
+                result = batch.result(i)
+                app = Application(
+                    job_id=job_id,
+                    match_score=result.final_score,
+                    user_id=user_id,
+                )
+                scored.append((app, result))
+        return scored
+
+    def _canonical(self, jobs: list[Job]) -> list[Job]:
+        """Index jobs for near-duplicate detection; keep those leading their cluster."""
+        try:
+            clusters = self.dedup.assign(jobs)
+        except Exception as e:
+            logger.warning(f"[worker] near-duplicate check for {len(jobs)} jobs failed — {e}")
+            return jobs
+        return [job for job in jobs if clusters.get(job.id, job.id) == job.id]
+
+    def _vectors(self, jobs: list[Job], resumes: list[ResumeProfile]) -> dict:
+        """Embeddings for score_matrix; empty (keyword-only scoring) if unavailable."""
+        if self.embeddings is None:
+            return {}
+        try:
+            return {
+                "job_vectors": self.embeddings.job_vectors([j.description for j in jobs]),
+                "resume_vectors": self.embeddings.resume_vectors(resumes),
+            }
+        except Exception as e:
+            logger.warning(f"[worker] embedding {len(jobs)} jobs failed, keyword score only — {e}")
+            return {}
+
+    # ── Cycle ─────────────────────────────────────────────────────────────────
+
+    def _record_checkpoint(self, msg: _CheckpointReached, saved: int, error: str | None) -> None:
+        try:
+            self.scheduler.record(
+                msg.source, msg.key, self.run_id, len(msg.job_ids), cursor=msg.cursor,
+                error=error, saved=saved,
+            )
+        except Exception as e:
+            logger.warning(f"[worker] {msg.source}/{msg.key}: checkpoint failed — {e}")
+            return
+        self.progress["persist"]["checkpoints"] += 1
+
+    def run(self, run_id: str | None = None) -> dict:
         """Run one full ingestion cycle. Returns a summary dict."""
         init_db()
         start = time.time()
+        self.run_id = run_id or uuid.uuid4().hex
 
         saved = skipped_dup = failed = total_fetched = 0
+        self.progress = self._new_progress()
+        cache_hits, cache_misses = self.parse_cache.hits, self.parse_cache.misses
+        near_dups = self.dedup.duplicates
+        try:
+            # Jobs stored before the index existed; a no-op once caught up
+            backfilled = self.dedup.backfill(self.job_repo)
+            if backfilled:
+                logger.info(f"[worker] indexed {backfilled} stored jobs for near-duplicates")
+        except Exception as e:
+            logger.warning(f"[worker] near-duplicate backfill failed — {e}")
 
-        for collector in self.collectors:
-            name = collector.__class__.__name__
-            try:
-                jobs = collector.fetch()
-                total_fetched += len(jobs)
-                logger.info(f"[worker] {name}: fetched {len(jobs)} jobs")
-            except Exception as e:
-                logger.error(f"[worker] {name}: fetch failed — {e}")
-                failed += 1
-                continue
+        fetched_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        parsed_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        threads = [threading.Thread(
+            target=self._fetch_stage, args=(fetched_q,), name="fetch", daemon=True,
+        )]
+        threads.append(threading.Thread(
+            target=self._parse_stage, args=(fetched_q, parsed_q),
+            name="parse", daemon=True,
+        ))
+        for t in threads:
+            t.start()
+
+        seen: set[str] = set()
+        batch: list[Job] = []
+        # Jobs that failed to parse or persist; a checkpoint covering any of
+        # them is recorded as failed so its company is fetched again
+        failed_ids: set[str] = set()
+        # New or updated jobs, the churn the refresh schedule adapts to
+        stored_ids: set[str] = set()
 
-            for job in jobs:
+        def flush():
+            nonlocal saved, skipped_dup, failed
+            if self._cancelled.is_set():
+                batch.clear()
+            if batch:
+                lost = 0
                 try:
-                    job.required_skills = extract_skills(job.description)
-                    job.required_years = extract_years(job.description)
+                    new_ids = self._persist_batch(batch)
+                except Exception as e:
+                    # Retry one by one so only the bad jobs are lost
+                    logger.warning(f"[worker] persisting {len(batch)} jobs failed, retrying singly: {e}")
+                    new_ids = set()
+                    for job in batch:
+                        try:
+                            new_ids |= self._persist_batch([job])
+                        except Exception as e:
+                            logger.warning(f"[worker] persisting {job.id} failed: {e}")
+                            failed_ids.add(job.id)
+                            lost += 1
+                stored_ids.update(new_ids)
+                saved += len(new_ids)
+                failed += lost
+                skipped_dup += len(batch) - len(new_ids) - lost
+                batch.clear()
+            self.progress["persist"].update(saved=saved, skipped_dup=skipped_dup, failed=failed)
 
-                    if not self.job_repo.save(job):
-                        skipped_dup += 1
-                        continue
+        while True:
+            try:
+                msg = parsed_q.get_nowait()
+            except queue.Empty:
+                flush()
+                msg = parsed_q.get()
+            if msg is _END:
+                break
+            if self._cancelled.is_set():
+                # Drain so the fetch and parse stages can finish
+                batch.clear()
+                continue
 
-                    result = self.engine.score(job, self.resume)
-                    app = Application(
-                        job_id=job.id,
-                        match_score=result.final_score,
+            if isinstance(msg, _CollectorDone):
+                if msg.error:
+                    logger.error(f"[worker] {msg.name}: fetch failed — {msg.error}")
+                    failed += 1
+                else:
+                    logger.info(
+                        f"[worker] {msg.name}: fetched {msg.fetched} jobs in {msg.elapsed:.1f}s"
                     )
-                    self.app_repo.save(app, result)
-                    saved += 1
+                    metrics.record_collector_fetch(msg.name, msg.elapsed)
+                total_fetched += msg.fetched
+                continue
 
-                except Exception as e:
-                    logger.warning(f"[worker] job processing failed: {e}")
-                    failed += 1
+            if isinstance(msg, _CheckpointReached):
+                flush()
+                lost = sum(job_id in failed_ids for job_id in msg.job_ids)
+                error = f"{lost} of {len(msg.job_ids)} jobs not stored" if lost else None
+                stored = sum(job_id in stored_ids for job_id in msg.job_ids)
+                self._record_checkpoint(msg, stored, error)
+                continue
+
+            if isinstance(msg, _ParseFailed):
+                logger.error(f"[worker] parse failed for {msg.job_id} — {msg.error}")
+                failed_ids.add(msg.job_id)
+                failed += 1
+                continue
+
+            if msg.id in seen:
+                skipped_dup += 1
+                continue
+            seen.add(msg.id)
+            batch.append(msg)
+            if len(batch) >= self.persist_batch_size:
+                flush()
+        flush()
+
+        for t in threads:
+            t.join()
+        if self._cancelled.is_set():
+            raise IngestCancelled(f"cycle cancelled after saving {saved} jobs")
 
         duration = time.time() - start
+        cache_hits = self.parse_cache.hits - cache_hits
+        cache_misses = self.parse_cache.misses - cache_misses
 
-        # Publish CloudWatch metrics
+        # Buffered; the metrics client flushes them in the background
         metrics.record_jobs_fetched(total_fetched)
         metrics.record_jobs_saved(saved)
         metrics.record_duplicates_skipped(skipped_dup)
         metrics.record_failures(failed)
         metrics.record_ingestion_duration(duration)
+        metrics.record_parse_cache_hits(cache_hits)
+        metrics.record_parse_cache_misses(cache_misses)
+        metrics.record_db_pool(pool_stats())
 
         if failed == 0:
             metrics.record_last_successful_run()
@@ -87,8 +478,12 @@ class IngestionWorker:
             "skipped_dup": skipped_dup,
             "failed": failed,
             "total_fetched": total_fetched,
+            "profiles": len(self.resumes),
+            "near_duplicates": self.dedup.duplicates - near_dups,
+            "parse_cache_hits": cache_hits,
+            "parse_cache_misses": cache_misses,
             "duration_seconds": round(duration, 1),
             "total_in_db": self.job_repo.count(),
         }
         logger.info(f"[worker] cycle complete: {summary}")
-        return summary
\ No newline at end of file
+        return summary
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from domain.application import Application
+from domain.profile import SearchProfile
+from domain.scoring import ScoringEngine
+from infrastructure.repositories import ApplicationRepository, JobRepository
+from services.embeddings import SEMANTIC_WEIGHT, EmbeddingIndex, default_index, resume_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileChange:
+    """
+    The part of a profile edit that can move scores. A skill edit only
+    moves the keyword score of jobs requiring that skill, and a change in
+    experience only that of jobs requiring more than `more_years_than`
+    years. Keyword scores do not read certifications, so editing them
+    rescores nothing. With semantic scoring on, any edit to the embedded
+    resume text (skills, domains, certifications) rescores every job: its
+    similarity to every job moves.
+    """
+    skills: set[str] = field(default_factory=set)   # added or removed, lowercased
+    more_years_than: int | None = None               # min(old, new) experience_years
+    all_jobs: bool = False                           # new profile etc.: score everything
+
+    @classmethod
+    def between(
+        cls, old: SearchProfile | None, new: SearchProfile, semantic: bool = False
+    ) -> "ProfileChange":
+        if old is None:
+            return cls(all_jobs=True)
+        if semantic and resume_text(old.to_resume()) != resume_text(new.to_resume()):
+            return cls(all_jobs=True)
+        old_skills = {s.lower() for s in old.skills}
+        new_skills = {s.lower() for s in new.skills}
+        years = None
+        if old.experience_years != new.experience_years:
+            years = min(old.experience_years, new.experience_years)
+        return cls(skills=old_skills ^ new_skills, more_years_than=years)
+
+    def __bool__(self) -> bool:
+        return self.all_jobs or bool(self.skills) or self.more_years_than is not None
+
+    def merge(self, other: "ProfileChange") -> "ProfileChange":
+        years = [y for y in (self.more_years_than, other.more_years_than) if y is not None]
+        return ProfileChange(
+            skills=self.skills | other.skills,
+            more_years_than=min(years) if years else None,
+            all_jobs=self.all_jobs or other.all_jobs,
+        )
+
+
+@dataclass
+class RescoreProgress:
+    id: str
+    user_id: str
+    change: ProfileChange
+    state: str = "pending"      # pending | running | done | failed | superseded
+    total: int = 0              # jobs to rescore
+    done: int = 0
+    error: str | None = None
+    started_at: str | None = None
+    finished_at: str | None = None
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "percent": round(self.done / self.total * 100, 1) if self.total else 100.0,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RescoreWorker:
+    """
+    Recomputes one profile's scores for the jobs a profile change affects,
+    in batches. Status and notes of existing applications are kept.
+    """
+
+    def __init__(
+        self,
+        profile: SearchProfile,
+        scoring_engine: ScoringEngine | None = None,
+        batch_size: int = 500,
+        embeddings: EmbeddingIndex | None = None,
+    ):
+        self.profile = profile
+        self.embeddings = embeddings
+        self.engine = scoring_engine or ScoringEngine(
+            semantic_weight=SEMANTIC_WEIGHT if embeddings else 0.0
+        )
+        self.batch_size = batch_size
+        self.job_repo = JobRepository()
+        self.app_repo = ApplicationRepository()
+
+    def affected_jobs(self, change: ProfileChange) -> list[str]:
+        """IDs of the jobs whose score can differ after `change`."""
+        if change.all_jobs:
+            return self.job_repo.job_ids()
+        ids = set()
+        if change.skills:
+            ids.update(self.job_repo.jobs_requiring(sorted(change.skills), match_all=False))
+        if change.more_years_than is not None:
+            ids.update(self.job_repo.job_ids(more_years_than=change.more_years_than))
+        return sorted(ids)
+
+    def run(self, progress: RescoreProgress) -> RescoreProgress:
+        progress.state = "running"
+        progress.started_at = datetime.utcnow().isoformat()
+        start = time.time()
+        try:
+            if progress.cancelled.is_set():
+                progress.state = "superseded"
+                return progress
+            ids = self.affected_jobs(progress.change)
+            progress.total = len(ids)
+            resume = self.profile.to_resume()
+            for i in range(0, len(ids), self.batch_size):
+                if progress.cancelled.is_set():
+                    progress.state = "superseded"
+                    break
+                jobs = self.job_repo.get_many(ids[i:i + self.batch_size])
+                vectors = {}
+                if self.embeddings is not None:
+                    vectors = {
+                        "job_vectors": self.embeddings.job_vectors(
+                            [job.description for job in jobs]
+                        ),
+                        "resume_vectors": self.embeddings.resume_vectors([resume]),
+                    }
+                batch = self.engine.score_matrix(jobs, [resume], **vectors)[0]
+                self.app_repo.upsert_scores([
+                    (Application(job_id=job_id, user_id=self.profile.user_id), batch.result(j))
+                    for j, job_id in enumerate(batch.job_ids)
+                ])
+                progress.done += len(ids[i:i + self.batch_size])
+            else:
+                progress.state = "done"
+        except Exception as e:
+            logger.error(f"[rescore] {self.profile.user_id}: failed — {e}")
+            progress.state = "failed"
+            progress.error = str(e)
+        progress.finished_at = datetime.utcnow().isoformat()
+        logger.info(
+            f"[rescore] {self.profile.user_id}: {progress.state}, "
+            f"{progress.done}/{progress.total} jobs in {time.time() - start:.1f}s"
+        )
+        return progress
+
+
+# ── Background runs ───────────────────────────────────────────────────────────
+
+_latest: dict[str, RescoreProgress] = {}      # user_id → most recent run
+_user_locks: dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def start_rescore(
+    profile: SearchProfile, previous: SearchProfile | None
+) -> RescoreProgress | None:
+    """
+    Rescore `profile` in a background thread for what changed since
+    `previous`. Returns None when nothing that affects scores changed.
+
+    A run still in flight for the same user is superseded: it stops after
+    its current batch and its change is folded into the new run.
+    """
+    embeddings = default_index()
+    change = ProfileChange.between(previous, profile, semantic=embeddings is not None)
+    with _lock:
+        current = _latest.get(profile.user_id)
+        # Unfinished work of an earlier run is folded into this one
+        if current is not None and current.state in ("pending", "running", "failed"):
+            current.cancelled.set()
+            change = change.merge(current.change)
+        if not change:
+            return None
+        progress = RescoreProgress(
+            id=uuid.uuid4().hex, user_id=profile.user_id, change=change
+        )
+        _latest[profile.user_id] = progress
+        user_lock = _user_locks.setdefault(profile.user_id, threading.Lock())
+
+    def work():
+        # One run per user at a time, so a superseded run can't overwrite newer scores
+        with user_lock:
+            RescoreWorker(profile, embeddings=embeddings).run(progress)
+
+    threading.Thread(target=work, name=f"rescore-{profile.user_id}", daemon=True).start()
+    return progress
+
+
+def latest_progress(user_id: str) -> RescoreProgress | None:
+    return _latest.get(user_id)